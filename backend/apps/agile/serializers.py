@@ -1,15 +1,16 @@
 """Agile serializers."""
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import Epic, UserStory, AcceptanceCriteria, Task, Sprint, SprintStory
 
 
-class AcceptanceCriteriaSerializer(serializers.ModelSerializer):
+class AcceptanceCriteriaSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = AcceptanceCriteria
         fields = '__all__'
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
     user_story_id = serializers.CharField(source='user_story.story_id', read_only=True)
 
@@ -19,7 +20,7 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class UserStorySerializer(serializers.ModelSerializer):
+class UserStorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     epic_title = serializers.CharField(source='epic.title', read_only=True)
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
     acceptance_criteria = AcceptanceCriteriaSerializer(many=True, read_only=True)
@@ -31,7 +32,7 @@ class UserStorySerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class EpicSerializer(serializers.ModelSerializer):
+class EpicSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     project_code = serializers.CharField(source='project.code', read_only=True)
     owner_name = serializers.CharField(source='owner.get_full_name', read_only=True)
     user_stories = UserStorySerializer(many=True, read_only=True)
@@ -42,7 +43,7 @@ class EpicSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class SprintSerializer(serializers.ModelSerializer):
+class SprintSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     project_code = serializers.CharField(source='project.code', read_only=True)
 
     class Meta:
@@ -51,7 +52,7 @@ class SprintSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class SprintStorySerializer(serializers.ModelSerializer):
+class SprintStorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     sprint_name = serializers.CharField(source='sprint.name', read_only=True)
     story_title = serializers.CharField(source='user_story.title', read_only=True)
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ragconfiguration',
+            name='response_cache_ttl_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
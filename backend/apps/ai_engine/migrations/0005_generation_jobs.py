@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0004_rag_response_cache_ttl'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aigenerationlog',
+            name='job_type',
+            field=models.CharField(blank=True, choices=[('DOCUMENTATION', 'Documentación'), ('PROJECT', 'Documentación de proyecto')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='aigenerationlog',
+            name='result',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -48,7 +48,7 @@ class EmbeddedDocument(models.Model):
 
 
 class AIGenerationLog(models.Model):
-    """Logs all AI generation requests and responses."""
+    """Logs all AI generation requests and responses (also the job record of queued generations)."""
 
     STATUS_CHOICES = [
         ('PENDING', 'Pendiente'),
@@ -57,6 +57,11 @@ class AIGenerationLog(models.Model):
         ('FAILED', 'Fallido'),
     ]
 
+    JOB_TYPES = [
+        ('DOCUMENTATION', 'Documentación'),
+        ('PROJECT', 'Documentación de proyecto'),
+    ]
+
     document = models.ForeignKey(
         Document,
         on_delete=models.SET_NULL,
@@ -78,6 +83,9 @@ class AIGenerationLog(models.Model):
     prompt = models.TextField()
     context = models.JSONField(default=dict)
     generated_content = models.TextField(blank=True)
+    # Trabajos encolados (apps.standards.tasks): tipo y resultado completo para el polling
+    job_type = models.CharField(max_length=20, choices=JOB_TYPES, blank=True)
+    result = models.JSONField(default=dict, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     error_message = models.TextField(blank=True)
     tokens_used = models.IntegerField(default=0)
@@ -182,6 +190,8 @@ class RAGConfiguration(models.Model):
     chunk_size = models.IntegerField(default=1000)
     chunk_overlap = models.IntegerField(default=200)
     top_k_results = models.IntegerField(default=5)
+    # Caché de respuestas del LLM: vacío = LLM_CACHE_TTL_SECONDS, 0 = sin caché
+    response_cache_ttl_seconds = models.PositiveIntegerField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,21 @@
+"""
+Management command to insert pending event log spools.
+
+Usage:
+    python manage.py flush_event_log
+
+Inserts the DocumentHistory / AuditLog events left in EVENT_LOG_SPOOL_DIR by
+processes that stopped before flushing them. Spools of running processes are
+skipped. Each process also does this when its writer starts; run it after a
+crash or before shutting a server down for good.
+"""
+from django.core.management.base import BaseCommand
+from apps.core.eventlog import recover_orphan_spools
+
+
+class Command(BaseCommand):
+    help = 'Inserta los eventos de historial y auditoría pendientes en spools huérfanos'
+
+    def handle(self, *args, **options):
+        inserted = recover_orphan_spools()
+        self.stdout.write(self.style.SUCCESS(f'✓ {inserted} evento(s) recuperado(s).'))
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_initial'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_logs_organiz_9c8c67_idx',
+        ),
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['accessed_at', 'id'], name='access_logs_accesse_110782_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['organization', 'timestamp', 'id'], name='audit_logs_organiz_7885f3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['timestamp', 'id'], name='audit_logs_timesta_b1eb6c_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 """Audit and compliance models."""
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.users.models import User, Organization
 from apps.projects.models import Project
@@ -42,15 +43,19 @@ class AuditLog(models.Model):
     request_data = models.JSONField(default=dict)
     response_data = models.JSONField(default=dict)
     status_code = models.IntegerField(null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    # Identificador del evento en el event log (las reinserciones se ignoran)
+    event_id = models.UUIDField(unique=True, null=True, editable=False)
 
     class Meta:
         db_table = 'audit_logs'
         ordering = ['-timestamp']
         indexes = [
-            models.Index(fields=['organization', 'timestamp']),
+            models.Index(fields=['organization', 'timestamp', 'id']),
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['resource_type', 'resource_id']),
+            # Paginación por cursor (-timestamp, -id)
+            models.Index(fields=['timestamp', 'id']),
         ]
 
     def __str__(self):
@@ -130,6 +135,8 @@ class AccessLog(models.Model):
         indexes = [
             models.Index(fields=['user', 'accessed_at']),
             models.Index(fields=['resource_type', 'resource_id']),
+            # Paginación por cursor (-accessed_at, -id)
+            models.Index(fields=['accessed_at', 'id']),
         ]
 
     def __str__(self):
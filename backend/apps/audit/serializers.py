@@ -1,39 +1,40 @@
 """Audit serializers."""
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import AuditLog, ApprovalHistory, AccessLog, ComplianceReport, DataRetentionPolicy, SecurityEvent
 
 
-class AuditLogSerializer(serializers.ModelSerializer):
+class AuditLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = AuditLog
         fields = '__all__'
 
 
-class ApprovalHistorySerializer(serializers.ModelSerializer):
+class ApprovalHistorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ApprovalHistory
         fields = '__all__'
 
 
-class AccessLogSerializer(serializers.ModelSerializer):
+class AccessLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = AccessLog
         fields = '__all__'
 
 
-class ComplianceReportSerializer(serializers.ModelSerializer):
+class ComplianceReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ComplianceReport
         fields = '__all__'
 
 
-class DataRetentionPolicySerializer(serializers.ModelSerializer):
+class DataRetentionPolicySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = DataRetentionPolicy
         fields = '__all__'
 
 
-class SecurityEventSerializer(serializers.ModelSerializer):
+class SecurityEventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = SecurityEvent
         fields = '__all__'
@@ -0,0 +1,51 @@
+"""
+Registro de auditoría (AuditLog) a través del event log.
+
+Las filas se escriben por lotes fuera del hilo de la petición (ver
+apps.core.eventlog), de modo que auditar más acciones no alarga las peticiones.
+"""
+import ipaddress
+
+from django.utils import timezone
+
+from apps.core.eventlog import record_event
+
+
+def client_ip(request):
+    """
+    IP del cliente (primer salto de X-Forwarded-For si existe), o None si no es una IP válida.
+
+    X-Forwarded-For lo controla el cliente: un valor que no es una dirección
+    no debe llegar a la columna ip_address (inet en PostgreSQL).
+    """
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded:
+        candidate = forwarded.split(',')[0].strip()
+    else:
+        candidate = request.META.get('REMOTE_ADDR', '')
+    try:
+        return str(ipaddress.ip_address(candidate))
+    except ValueError:
+        return None
+
+
+def record_audit(request, organization_id, action_type, resource_type, resource_id,
+                 description, resource_name='', status_code=None):
+    """Registra una acción en AuditLog (action_type: AuditLog.ACTION_TYPES); sin organización no se registra."""
+    if organization_id is None:
+        return
+    user = getattr(request, 'user', None)
+    record_event(
+        'audit.AuditLog',
+        organization_id=organization_id,
+        user_id=user.pk if user is not None and user.is_authenticated else None,
+        action_type=action_type,
+        resource_type=resource_type,
+        resource_id=str(resource_id),
+        resource_name=resource_name[:255],
+        description=description,
+        ip_address=client_ip(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        status_code=status_code,
+        timestamp=timezone.now(),
+    )
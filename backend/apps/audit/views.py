@@ -2,6 +2,7 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.pagination import AuditLogCursorPagination, AccessLogCursorPagination
 from .models import AuditLog, ApprovalHistory, AccessLog, ComplianceReport, DataRetentionPolicy, SecurityEvent
 from .serializers import (
     AuditLogSerializer, ApprovalHistorySerializer, AccessLogSerializer,
@@ -13,6 +14,7 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = AuditLogCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['organization', 'user', 'action_type', 'resource_type']
 
@@ -29,6 +31,7 @@ class AccessLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AccessLog.objects.all()
     serializer_class = AccessLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = AccessLogCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['user', 'resource_type']
 
@@ -1,21 +1,22 @@
 """Checklist serializers."""
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import DeliveryChecklist, ChecklistItem, BlockingIssue, DeliveryCertificate, ChecklistTemplate
 
 
-class ChecklistItemSerializer(serializers.ModelSerializer):
+class ChecklistItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ChecklistItem
         fields = '__all__'
 
 
-class BlockingIssueSerializer(serializers.ModelSerializer):
+class BlockingIssueSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = BlockingIssue
         fields = '__all__'
 
 
-class DeliveryChecklistSerializer(serializers.ModelSerializer):
+class DeliveryChecklistSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     project_code = serializers.CharField(source='project.code', read_only=True)
     items = ChecklistItemSerializer(many=True, read_only=True)
     blocking_issues = BlockingIssueSerializer(many=True, read_only=True)
@@ -25,13 +26,13 @@ class DeliveryChecklistSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class DeliveryCertificateSerializer(serializers.ModelSerializer):
+class DeliveryCertificateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryCertificate
         fields = '__all__'
 
 
-class ChecklistTemplateSerializer(serializers.ModelSerializer):
+class ChecklistTemplateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ChecklistTemplate
         fields = '__all__'
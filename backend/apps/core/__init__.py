@@ -0,0 +1 @@
+# Core package - utilidades compartidas por las apps de la API
@@ -0,0 +1,98 @@
+"""
+Core background - tareas ligeras fuera del ciclo de la petición.
+
+Un pool de hilos compartido por proceso ejecuta trabajos cortos e idempotentes
+(precálculo de diffs, renders, etc.) sin bloquear la respuesta. Cada tarea
+cierra sus conexiones a la base de datos al terminar.
+
+El trabajo intensivo en CPU (p. ej. parsear PDF) se delega desde esas tareas
+a un pool de procesos con run_cpu_bound(), para no competir por el GIL con
+los hilos que atienden peticiones.
+
+Con BACKGROUND_TASKS_EAGER = True las tareas se ejecutan en línea (desarrollo
+local con SQLite y depuración).
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_process_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Pool de hilos del proceso, creado en el primer uso."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+                    thread_name_prefix='background'
+                )
+    return _executor
+
+
+def _process_start_method() -> str:
+    """forkserver donde existe (Linux, macOS); spawn en el resto."""
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    """Pool de procesos para funciones puras intensivas en CPU, creado en el primer uso."""
+    global _process_executor
+    if _process_executor is None:
+        with _executor_lock:
+            if _process_executor is None:
+                # Sin fork: este proceso ya tiene hilos de peticiones, del pool y del event log,
+                # y un hijo bifurcado con un lock tomado (logging, driver de BD) quedaría bloqueado
+                _process_executor = ProcessPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_PROCESS_WORKERS', 2),
+                    mp_context=multiprocessing.get_context(_process_start_method()),
+                )
+    return _process_executor
+
+
+def run_cpu_bound(func, *args):
+    """
+    Ejecuta func(*args) en el pool de procesos y espera el resultado.
+
+    func debe ser una función de módulo sin acceso a la base de datos, con
+    argumentos y resultado serializables (pickle). En modo eager se ejecuta en línea.
+    """
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return func(*args)
+    return get_process_executor().submit(func, *args).result()
+
+
+def _run(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception('Error en tarea en segundo plano %s', getattr(func, '__name__', func))
+    finally:
+        # Las conexiones son por hilo: no dejarlas abiertas en el pool
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Ejecuta func(*args, **kwargs) en el pool (o en línea en modo eager)."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            logger.exception('Error en tarea en segundo plano %s', getattr(func, '__name__', func))
+            return None
+    return get_executor().submit(_run, func, args, kwargs)
+
+
+def run_after_commit(func, *args, **kwargs):
+    """Programa la tarea cuando la transacción actual se confirme (los datos ya son visibles)."""
+    transaction.on_commit(lambda: run_in_background(func, *args, **kwargs))
@@ -0,0 +1,51 @@
+"""
+Core concurrency - control de concurrencia optimista (compare-and-swap).
+
+Una edición declara la versión sobre la que se hizo; el guardado se
+convierte en UPDATE ... WHERE id = ? AND <campo> = <versión esperada>. Si otro
+escritor cambió la fila entretanto el UPDATE no afecta filas y se lanza
+VersionConflict, sin bloqueos de fila previos (SELECT ... FOR UPDATE).
+"""
+from django.utils.http import parse_etags
+
+
+class VersionConflict(Exception):
+    """La fila ya no tiene la versión esperada."""
+
+
+class CompareAndSwapMixin:
+    """
+    Mixin de modelo: el siguiente save() solo escribe si cas_field sigue valiendo lo esperado.
+
+        document.expect_version('1.003')
+        document.save()   # VersionConflict si otro guardó antes
+    """
+
+    cas_field = 'version'
+
+    def expect_version(self, expected):
+        self._cas_expected = expected
+
+    def save(self, *args, **kwargs):
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            self._cas_expected = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, '_cas_expected', None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+        updated = super()._do_update(
+            base_qs.filter(**{self.cas_field: expected}), using, pk_val, values, update_fields, forced_update
+        )
+        if not updated:
+            raise VersionConflict(f'{self._meta.label} {pk_val} ya no está en la versión {expected}')
+        return updated
+
+
+def if_match_tags(request):
+    """ETags del encabezado If-Match (lista vacía si no se envió)."""
+    header = request.headers.get('If-Match')
+    return parse_etags(header) if header else []
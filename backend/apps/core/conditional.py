@@ -0,0 +1,157 @@
+"""
+Core conditional GET - validadores ETag/Last-Modified para respuestas de la API.
+
+El cliente reenvía el ETag recibido en If-None-Match (o la fecha en
+If-Modified-Since); si el recurso no cambió se responde 304 Not Modified sin
+serializar ni transferir el cuerpo.
+
+    - Detalle: el ETag se deriva de (id, updated_at, version) del objeto,
+      leídos con una consulta agregada mínima antes de cargar el objeto.
+    - Listado: el ETag es una huella agregada del conjunto filtrado
+      (COUNT, MAX(updated_at), MAX(id)), calculada con una sola consulta.
+
+Ambos incluyen la URL completa (filtros, página, ?fields=) y la organización
+del usuario, ya que forman parte de la representación.
+
+El estado transitorio que se muestra pero no se edita (p. ej. el lease de
+edición de un documento) va en un sufijo del ETag ("<contenido>.<estado>"):
+cambia la respuesta de GET, pero If-Match solo compara la parte de contenido.
+"""
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """ETag fuerte (entre comillas) a partir de las partes que identifican la representación."""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def content_tag(etag):
+    """Parte de contenido de un ETag: sin el sufijo de estado transitorio."""
+    return etag.split('.', 1)[0].rstrip('"') + '"'
+
+
+def to_timestamp(value):
+    """Convierte un datetime en segundos epoch para Last-Modified (None si no hay fecha)."""
+    return int(value.timestamp()) if value else None
+
+
+def check_not_modified(request, etag, last_modified=None):
+    """Retorna una respuesta 304 si el cliente ya tiene esta representación, o None."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """Añade ETag/Last-Modified y obliga al navegador a revalidar antes de reutilizar su copia."""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def queryset_fingerprint(queryset, updated_field='updated_at', **aggregates):
+    """
+    Huella barata del conjunto filtrado en una sola consulta.
+
+    Retorna count, last_modified (MAX(updated_field)), max_id y los agregados
+    extra recibidos (p. ej. MAX de la fecha de una relación anidada). Cambia
+    al crear, editar o eliminar cualquier fila del conjunto.
+    """
+    return queryset.order_by().aggregate(
+        # Los agregados sobre relaciones hacen JOIN: contar cada fila una sola vez
+        count=Count('pk', distinct=bool(aggregates)),
+        last_modified=Max(updated_field),
+        max_id=Max('pk'),
+        **aggregates,
+    )
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para ViewSets: retrieve y list responden 304 cuando el cliente está al día.
+
+    Las vistas pueden definir:
+        - get_conditional_queryset(): queryset ligero (sin anotaciones ni
+          prefetch) sobre el que se calculan los validadores.
+        - get_conditional_aggregates(): agregados extra que forman parte del
+          ETag, p. ej. la última modificación de los objetos anidados.
+        - get_conditional_state_aggregates(): agregados de estado transitorio
+          (p. ej. un lease) que cambian el ETag de GET pero no su parte de
+          contenido, la que se compara en If-Match.
+    """
+
+    conditional_updated_field = 'updated_at'
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_conditional_aggregates(self):
+        return {}
+
+    def get_conditional_state_aggregates(self):
+        return {}
+
+    def get_conditional_validators(self, queryset):
+        """Calcula (etag, last_modified) para la representación de queryset."""
+        state_aggregates = self.get_conditional_state_aggregates()
+        stats = queryset_fingerprint(
+            queryset, self.conditional_updated_field,
+            **self.get_conditional_aggregates(), **state_aggregates
+        )
+        # Fechas futuras (p. ej. el vencimiento de un lease) cambian el ETag, pero no son una modificación
+        now = timezone.now()
+        dates = [value for value in stats.values() if isinstance(value, datetime) and value <= now]
+        etag = make_etag(
+            self.request.get_full_path(),
+            getattr(self.request.user, 'organization_id', None),
+            *(f'{key}={stats[key]}' for key in sorted(stats) if key not in state_aggregates),
+        )
+        if state_aggregates:
+            state = make_etag(*(f'{key}={stats[key]}' for key in sorted(state_aggregates)))
+            etag = f'{etag[:-1]}.{state[1:]}'
+        return stats['count'], etag, to_timestamp(max(dates) if dates else None)
+
+    def conditional_response(self, queryset, render, detail=False):
+        """
+        Responde 304 si los validadores coinciden; si no, llama a render() y
+        añade ETag/Last-Modified a su respuesta.
+
+        En detalle, si el objeto no existe se delega en render() (404 normal).
+        """
+        count, etag, last_modified = self.get_conditional_validators(queryset)
+        if detail and not count:
+            return render()
+
+        not_modified = check_not_modified(self.request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(render(), etag, last_modified)
+
+    def get_conditional_object_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.get_conditional_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_conditional_object_queryset(),
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+            detail=True,
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_conditional_queryset(),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
@@ -0,0 +1,165 @@
+"""
+Core counters - columnas contador desnormalizadas mantenidas por triggers.
+
+Los conteos que se muestran en tarjetas y listados (documentos por workspace,
+versiones por documento, ...) se guardan en una columna del modelo padre. Un
+trigger de la base de datos (PostgreSQL o SQLite) la ajusta en cada INSERT,
+DELETE o UPDATE de la tabla hija, de modo que también cubre bulk_create,
+QuerySet.update() y los borrados por lotes.
+
+Los modelos declaran sus contadores con CounterFieldsMixin:
+
+    counter_fields = {'document_count': ('documents', {'is_deleted': False})}
+
+(nombre de la relación inversa y filtro de las filas que cuentan). El comando
+recount compara y repara las columnas con esa misma declaración.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+class CounterFieldsMixin:
+    """
+    Excluye las columnas contador de save(): solo las escriben los triggers.
+
+    Sin esto, guardar una instancia leída antes de un cambio en las filas
+    hijas sobrescribiría el contador con un valor obsoleto.
+    """
+
+    counter_fields: Dict[str, Tuple[str, Dict]] = {}
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = [name for name in update_fields if name not in self.counter_fields]
+        elif not self._state.adding and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+def counter_subquery(model, counter: str):
+    """Subquery con el conteo real del contador para cada fila de model (OuterRef('pk'))."""
+    related_name, filters = model.counter_fields[counter]
+    relation = model._meta.get_field(related_name)
+    child = relation.related_model
+    fk = relation.field.name
+    return Coalesce(
+        Subquery(
+            child._base_manager.filter(**{fk: OuterRef('pk')}, **filters)
+            .order_by().values(fk).annotate(total=Count('pk')).values('total')
+        ),
+        0
+    )
+
+
+def recount(model, counter: str, dry_run: bool = False) -> int:
+    """Corrige las filas cuyo contador no coincide con el conteo real; retorna cuántas había."""
+    actual = counter_subquery(model, counter)
+    drifted = list(
+        model._base_manager.annotate(actual_count=actual)
+        .exclude(**{counter: F('actual_count')})
+        .values_list('pk', flat=True)
+    )
+    if drifted and not dry_run:
+        model._base_manager.filter(pk__in=drifted).update(**{counter: counter_subquery(model, counter)})
+    return len(drifted)
+
+
+def _condition(condition: Optional[str], row: str) -> str:
+    return condition.format(row=row) if condition else 'TRUE'
+
+
+def counter_trigger_sql(vendor: str, parent_table: str, counter: str, child_table: str,
+                        fk_column: str, condition: Optional[str] = None,
+                        condition_columns: Tuple[str, ...] = ()) -> List[str]:
+    """
+    Sentencias que crean los triggers del contador y rellenan su valor inicial.
+
+    condition: expresión sobre la fila hija con {row} como alias (p. ej.
+    'NOT {row}.is_deleted'); condition_columns: columnas que usa. Los
+    decrementos no bajan de 0 para que un contador desviado no bloquee borrados.
+    """
+    name = f'{child_table}_{counter}'
+    columns = ', '.join((fk_column, *condition_columns))
+    old, new = _condition(condition, 'OLD'), _condition(condition, 'NEW')
+    backfill = (
+        f'UPDATE {parent_table} SET {counter} = ('
+        f'SELECT COUNT(*) FROM {child_table} '
+        f'WHERE {child_table}.{fk_column} = {parent_table}.id AND {_condition(condition, child_table)})'
+    )
+
+    if vendor == 'postgresql':
+        return [
+            f"""
+CREATE OR REPLACE FUNCTION {name}_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.{fk_column} IS NOT DISTINCT FROM NEW.{fk_column} AND ({old}) = ({new}) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.{fk_column} IS NOT NULL AND ({old}) THEN
+            UPDATE {parent_table} SET {counter} = GREATEST({counter} - 1, 0) WHERE id = OLD.{fk_column};
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.{fk_column} IS NOT NULL AND ({new}) THEN
+            UPDATE {parent_table} SET {counter} = {counter} + 1 WHERE id = NEW.{fk_column};
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+            f'DROP TRIGGER IF EXISTS {name}_trigger ON {child_table}',
+            f"""
+CREATE TRIGGER {name}_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF {columns} ON {child_table}
+    FOR EACH ROW EXECUTE FUNCTION {name}_update()""",
+            backfill,
+        ]
+
+    # SQLite: un trigger por operación
+    return [
+        f'DROP TRIGGER IF EXISTS {name}_insert',
+        f"""
+CREATE TRIGGER {name}_insert AFTER INSERT ON {child_table}
+FOR EACH ROW WHEN NEW.{fk_column} IS NOT NULL AND ({new})
+BEGIN
+    UPDATE {parent_table} SET {counter} = {counter} + 1 WHERE id = NEW.{fk_column};
+END""",
+        f'DROP TRIGGER IF EXISTS {name}_delete',
+        f"""
+CREATE TRIGGER {name}_delete AFTER DELETE ON {child_table}
+FOR EACH ROW WHEN OLD.{fk_column} IS NOT NULL AND ({old})
+BEGIN
+    UPDATE {parent_table} SET {counter} = MAX({counter} - 1, 0) WHERE id = OLD.{fk_column};
+END""",
+        f'DROP TRIGGER IF EXISTS {name}_change',
+        f"""
+CREATE TRIGGER {name}_change AFTER UPDATE OF {columns} ON {child_table}
+FOR EACH ROW WHEN NOT (OLD.{fk_column} IS NEW.{fk_column} AND ({old}) = ({new}))
+BEGIN
+    UPDATE {parent_table} SET {counter} = MAX({counter} - 1, 0) WHERE id = OLD.{fk_column} AND ({old});
+    UPDATE {parent_table} SET {counter} = {counter} + 1 WHERE id = NEW.{fk_column} AND ({new});
+END""",
+        backfill,
+    ]
+
+
+def drop_counter_trigger_sql(vendor: str, counter: str, child_table: str) -> List[str]:
+    name = f'{child_table}_{counter}'
+    if vendor == 'postgresql':
+        return [
+            f'DROP TRIGGER IF EXISTS {name}_trigger ON {child_table}',
+            f'DROP FUNCTION IF EXISTS {name}_update()',
+        ]
+    return [f'DROP TRIGGER IF EXISTS {name}_{suffix}' for suffix in ('insert', 'delete', 'change')]
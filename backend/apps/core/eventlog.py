@@ -0,0 +1,247 @@
+"""
+Core event log - escritura diferida y por lotes de registros append-only
+(DocumentHistory, AuditLog).
+
+En la petición, record_event() solo añade una línea JSON a un archivo de spool
+del proceso; un hilo escritor inserta los registros con bulk_create cuando se
+acumulan EVENT_LOG_BATCH_SIZE o pasan EVENT_LOG_FLUSH_SECONDS. La latencia de
+la petición no depende de cuántos registros de auditoría se generen.
+
+Entrega al menos una vez:
+    - El spool se escribe antes de dar el evento por registrado, así que
+      sobrevive a la caída del proceso. Cada archivo está bloqueado (flock)
+      mientras su proceso lo usa; al arrancar, el escritor inserta los
+      archivos que quedaron sin dueño. También lo hace el comando flush_event_log.
+    - Un archivo se borra solo después de insertar su contenido. Si el
+      proceso cae entre ambos pasos, los eventos se reinsertan: cada uno
+      lleva un event_id único y los repetidos se ignoran.
+
+Con EVENT_LOG_EAGER = True (por defecto igual que BACKGROUND_TASKS_EAGER) los
+registros se insertan en línea.
+"""
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, InterfaceError, OperationalError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+SPOOL_SUFFIX = '.jsonl'
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _eager() -> bool:
+    return _setting('EVENT_LOG_EAGER', _setting('BACKGROUND_TASKS_EAGER', False))
+
+
+def spool_dir() -> str:
+    return _setting('EVENT_LOG_SPOOL_DIR', os.path.join(settings.BASE_DIR, 'tmp', 'event_log'))
+
+
+def _build(entries):
+    """Agrupa las líneas del spool por modelo como instancias sin guardar."""
+    by_model = {}
+    for entry in entries:
+        model = apps.get_model(entry['model'])
+        by_model.setdefault(model, []).append(model(event_id=entry['event_id'], **entry['fields']))
+    return by_model
+
+
+# Base de datos no disponible: el lote entero se reintenta más tarde
+CONNECTION_ERRORS = (OperationalError, InterfaceError)
+
+
+def insert_entries(entries) -> int:
+    """
+    Inserta los eventos con bulk_create ignorando los event_id ya insertados.
+
+    Si el lote falla por una fila (p. ej. el documento de un historial ya fue
+    purgado, o un valor que la columna rechaza), se reintenta fila a fila y se
+    descartan solo las filas inválidas. Los errores de conexión se propagan:
+    el spool se conserva y se reintenta entero.
+    """
+    inserted = 0
+    for model, objects in _build(entries).items():
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(objects, ignore_conflicts=True)
+            inserted += len(objects)
+        except CONNECTION_ERRORS:
+            raise
+        except DatabaseError:
+            for obj in objects:
+                try:
+                    with transaction.atomic():
+                        model.objects.bulk_create([obj], ignore_conflicts=True)
+                    inserted += 1
+                except CONNECTION_ERRORS:
+                    raise
+                except DatabaseError as e:
+                    logger.warning('Evento %s descartado: %s no válido (%s)', obj.event_id, model._meta.label, e)
+    return inserted
+
+
+def _read_spool(path):
+    entries = []
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Última línea a medio escribir cuando el proceso cayó
+                logger.warning('Línea incompleta ignorada en %s', path)
+    return entries
+
+
+class EventLogWriter:
+    """Escritor del proceso: spool en disco + hilo que inserta por lotes."""
+
+    def __init__(self):
+        self.batch_size = _setting('EVENT_LOG_BATCH_SIZE', 200)
+        self.flush_seconds = _setting('EVENT_LOG_FLUSH_SECONDS', 2)
+        self.directory = spool_dir()
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = 0
+        self._sealed = []  # archivos cerrados pendientes de insertar (siguen bloqueados)
+        self._segment = None
+        self._open_segment()
+
+        self._thread = threading.Thread(target=self._loop, name='event-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _open_segment(self):
+        path = os.path.join(self.directory, f'{os.getpid()}-{uuid.uuid4().hex}{SPOOL_SUFFIX}')
+        fh = open(path, 'a', encoding='utf-8')
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._segment = (path, fh)
+
+    def append(self, entry: dict) -> None:
+        line = json.dumps(entry, cls=DjangoJSONEncoder) + '\n'
+        with self._lock:
+            _, fh = self._segment
+            fh.write(line)
+            # Al sistema operativo (sobrevive a la caída del proceso) sin esperar a disco
+            fh.flush()
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._wakeup.notify()
+
+    def _seal(self):
+        """Cierra el archivo activo (si tiene eventos) y abre uno nuevo. Requiere self._lock."""
+        if self._pending:
+            self._sealed.append(self._segment)
+            self._pending = 0
+            self._open_segment()
+
+    def flush(self) -> None:
+        """Inserta todo lo registrado hasta ahora (también al terminar el proceso)."""
+        with self._lock:
+            self._seal()
+            sealed, self._sealed = self._sealed, []
+        if not sealed:
+            return
+
+        failed = []
+        for path, fh in sealed:
+            try:
+                insert_entries(_read_spool(path))
+            except Exception:
+                # Base de datos no disponible: se reintenta en la siguiente vuelta
+                logger.exception('No se pudo insertar el spool %s', path)
+                failed.append((path, fh))
+                continue
+            os.remove(path)
+            fh.close()
+        connections.close_all()
+
+        if failed:
+            with self._lock:
+                self._sealed[:0] = failed
+
+    def _loop(self):
+        try:
+            recover_orphan_spools()
+        except Exception:
+            logger.exception('No se pudieron recuperar los spools huérfanos')
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: self._pending >= self.batch_size, timeout=self.flush_seconds)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Error en el escritor del event log')
+
+
+def get_writer() -> EventLogWriter:
+    """Escritor del proceso, creado en el primer uso; al arrancar recupera los spools huérfanos."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = EventLogWriter()
+    return _writer
+
+
+def recover_orphan_spools() -> int:
+    """Inserta los archivos de spool de procesos que ya no existen; retorna cuántos eventos había."""
+    total = 0
+    for path in sorted(glob.glob(os.path.join(spool_dir(), f'*{SPOOL_SUFFIX}'))):
+        try:
+            fh = open(path, 'r+', encoding='utf-8')
+        except FileNotFoundError:
+            continue
+        with fh:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Archivo de un proceso vivo
+                continue
+            entries = _read_spool(path)
+            insert_entries(entries)
+            os.remove(path)
+            total += len(entries)
+    return total
+
+
+def record_event(model_label: str, **fields) -> None:
+    """
+    Registra una fila append-only de model_label ('audit.AuditLog', ...).
+
+    fields usa valores serializables a JSON (ids de claves foráneas con el
+    sufijo _id). Se registra cuando se confirma la transacción actual.
+    """
+    entry = {'model': model_label, 'event_id': str(uuid.uuid4()), 'fields': fields}
+
+    def _record():
+        if _eager():
+            try:
+                insert_entries([json.loads(json.dumps(entry, cls=DjangoJSONEncoder))])
+            except Exception:
+                # La transacción ya se confirmó: un fallo del registro no debe convertirse en un 500
+                logger.exception('No se pudo insertar el evento %s', entry['event_id'])
+        else:
+            get_writer().append(entry)
+
+    transaction.on_commit(_record)
@@ -0,0 +1,205 @@
+"""
+Core events - eventos en tiempo real enviados al navegador por Server-Sent Events.
+
+El código publica eventos en canales por usuario y por organización; la vista
+EventStreamView (GET /api/v1/events/) los reenvía a cada cliente conectado,
+que deja así de re-consultar la API para ver cambios.
+
+    publish_event('document.changed', {...}, organization=org)
+
+El reparto entre procesos lo hace un backend intercambiable (EVENTS_BACKEND):
+    - InProcessBackend: colas en memoria; solo llega a clientes conectados al
+      mismo proceso (desarrollo, pruebas, un único servidor).
+    - RedisBackend: pub/sub de Redis (EVENTS_REDIS_URL, por defecto REDIS_URL);
+      necesario con varios procesos o servidores.
+
+Los eventos no se guardan: un cliente que se reconecta recupera lo perdido
+con el feed de cambios (/documents/changes/?since=).
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Espera antes de reconectar que se sugiere al navegador
+RECONNECT_MILLISECONDS = 3000
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def user_channel(user_id) -> str:
+    return f'user:{user_id}'
+
+
+def organization_channel(organization_id) -> str:
+    return f'org:{organization_id}'
+
+
+class InProcessBackend:
+    """Reparto en memoria: una cola por suscripción, protegidas por un lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def publish(self, channel: str, message: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.put_nowait(message)
+
+    def subscribe(self, channels: Iterable[str]) -> 'InProcessSubscription':
+        return InProcessSubscription(self, list(channels))
+
+
+class InProcessSubscription:
+
+    def __init__(self, backend: InProcessBackend, channels):
+        self._backend = backend
+        self._channels = channels
+        self._queue = queue.Queue()
+        with backend._lock:
+            for channel in channels:
+                backend._subscribers.setdefault(channel, set()).add(self._queue)
+
+    def get(self, timeout: float) -> Optional[str]:
+        """Siguiente mensaje, o None si no llegó ninguno en timeout segundos."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        with self._backend._lock:
+            for channel in self._channels:
+                subscribers = self._backend._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(self._queue)
+                    if not subscribers:
+                        del self._backend._subscribers[channel]
+
+
+class RedisBackend:
+    """Reparto entre procesos con pub/sub de Redis."""
+
+    def __init__(self):
+        import redis
+
+        self._client = redis.Redis.from_url(getattr(settings, 'EVENTS_REDIS_URL', 'redis://localhost:6379/0'))
+
+    def publish(self, channel: str, message: str) -> None:
+        self._client.publish(channel, message)
+
+    def subscribe(self, channels: Iterable[str]) -> 'RedisSubscription':
+        return RedisSubscription(self._client, list(channels))
+
+
+class RedisSubscription:
+
+    def __init__(self, client, channels):
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(*channels)
+
+    def get(self, timeout: float) -> Optional[str]:
+        message = self._pubsub.get_message(timeout=timeout)
+        if message is None:
+            return None
+        data = message['data']
+        return data.decode('utf-8') if isinstance(data, bytes) else data
+
+    def close(self) -> None:
+        self._pubsub.close()
+
+
+def get_event_backend():
+    """Backend configurado en EVENTS_BACKEND, creado en el primer uso."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'EVENTS_BACKEND', 'apps.core.events.InProcessBackend')
+                _backend = import_string(path)()
+    return _backend
+
+
+def _publish(channels, message):
+    backend = get_event_backend()
+    for channel in channels:
+        try:
+            backend.publish(channel, message)
+        except Exception:
+            # Los eventos son una optimización: si el backend falla, los clientes usan el feed
+            logger.exception('No se pudo publicar el evento en %s', channel)
+
+
+def publish_event(event_type: str, data: dict, user=None, organization=None) -> None:
+    """
+    Publica un evento para un usuario y/o una organización (objetos o ids).
+
+    Se envía al confirmarse la transacción actual, para que el cliente que
+    reaccione al evento lea ya el estado nuevo.
+    """
+    channels = []
+    if user is not None:
+        channels.append(user_channel(getattr(user, 'pk', user)))
+    if organization is not None:
+        channels.append(organization_channel(getattr(organization, 'pk', organization)))
+    if not channels:
+        return
+
+    message = json.dumps({'type': event_type, 'data': data}, default=str)
+    transaction.on_commit(lambda: _publish(channels, message))
+
+
+def format_sse(event_type: str, data: str) -> str:
+    """Trama SSE con nombre de evento y datos (una línea JSON)."""
+    return f'event: {event_type}\ndata: {data}\n\n'
+
+
+def event_stream_response(frames) -> StreamingHttpResponse:
+    """StreamingHttpResponse text/event-stream que envía cada trama en cuanto se produce."""
+    response = StreamingHttpResponse(frames, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Evita que nginx acumule el stream en su buffer
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def event_stream(user, keepalive: float, max_duration: float):
+    """
+    Generador de tramas SSE para el usuario: sus eventos y los de su organización.
+
+    Envía un comentario de keepalive cuando no hay eventos, y termina tras
+    max_duration segundos para liberar el hilo; EventSource se reconecta solo.
+    """
+    channels = [user_channel(user.pk)]
+    if user.organization_id:
+        channels.append(organization_channel(user.organization_id))
+
+    # El stream puede durar minutos: no retener la conexión a la base de datos de la petición
+    connections.close_all()
+
+    subscription = get_event_backend().subscribe(channels)
+    deadline = time.monotonic() + max_duration
+    try:
+        # Espera sugerida al navegador antes de reconectar y confirmación de conexión
+        yield f'retry: {RECONNECT_MILLISECONDS}\n' + format_sse('ready', json.dumps({'channels': channels}))
+        while time.monotonic() < deadline:
+            message = subscription.get(timeout=keepalive)
+            if message is None:
+                yield ': keepalive\n\n'
+                continue
+            event_type = json.loads(message).get('type', 'message')
+            yield format_sse(event_type, message)
+    finally:
+        subscription.close()
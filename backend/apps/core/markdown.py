@@ -0,0 +1,66 @@
+"""
+Core markdown - campos HTML mantenidos a partir de campos Markdown del modelo.
+
+Los modelos declaran sus campos con MarkdownRenderMixin:
+
+    markdown_fields = {'content': 'content_html'}
+
+y el HTML se regenera al guardar solo cuando cambia el campo fuente. El
+render y su caché por hash viven en apps.documents.services.rendering, que
+se importa al guardar para no acoplar los modelos a ese módulo.
+"""
+from typing import Dict
+
+
+class MarkdownRenderMixin:
+    """
+    Mixin de modelo que mantiene campos HTML renderizados desde campos Markdown.
+
+    markdown_fields: {campo_fuente: campo_html}. El HTML solo se recalcula
+    cuando el campo fuente cambió respecto a lo leído de la base de datos.
+    """
+
+    markdown_fields: Dict[str, str] = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._markdown_sources = {
+            source: instance.__dict__[source]
+            for source in cls.markdown_fields
+            if source in instance.__dict__
+        }
+        return instance
+
+    def render_markdown_fields(self, update_fields=None):
+        """Actualiza los campos HTML cuyo fuente cambió. Retorna los campos modificados."""
+        from apps.documents.services.rendering import get_rendered_html, render_on_save_enabled
+
+        loaded = getattr(self, '_markdown_sources', {})
+        deferred = self.get_deferred_fields()
+        changed = []
+
+        for source, target in self.markdown_fields.items():
+            if source in deferred or (update_fields is not None and source not in update_fields):
+                continue
+
+            text = getattr(self, source)
+            if source in loaded and loaded[source] == text and target not in deferred:
+                if getattr(self, target) or not text or not render_on_save_enabled():
+                    continue
+
+            html = get_rendered_html(text) if render_on_save_enabled() else ''
+            if target in deferred or getattr(self, target) != html:
+                setattr(self, target, html)
+                changed.append(target)
+            loaded[source] = text
+
+        self._markdown_sources = loaded
+        return changed
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        changed = self.render_markdown_fields(update_fields)
+        if update_fields is not None and changed:
+            kwargs['update_fields'] = {*update_fields, *changed}
+        super().save(*args, **kwargs)
@@ -0,0 +1,42 @@
+"""
+Core pagination - paginación por cursor (keyset) para endpoints de alto volumen.
+
+PageNumberPagination (la paginación global por defecto) ejecuta COUNT(*) y
+OFFSET en cada petición, por lo que las páginas profundas de tablas grandes
+son cada vez más lentas. Los endpoints ordenados por tiempo usan en su lugar
+un cursor sobre (columna de tiempo, id): cada página es una búsqueda por
+índice de coste constante. Las tablas pequeñas siguen usando la paginación
+por número de página.
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class TimeOrderedCursorPagination(CursorPagination):
+    """
+    Cursor sobre una columna de tiempo descendente con desempate estable por id.
+
+    Las subclases definen `ordering`; debe existir un índice compuesto
+    (columna de tiempo, id) para que cada página sea un index scan.
+    """
+
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 20)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class DocumentCursorPagination(TimeOrderedCursorPagination):
+    ordering = ('-updated_at', '-id')
+
+
+class DocumentHistoryCursorPagination(TimeOrderedCursorPagination):
+    ordering = ('-performed_at', '-id')
+
+
+class AuditLogCursorPagination(TimeOrderedCursorPagination):
+    ordering = ('-timestamp', '-id')
+
+
+class AccessLogCursorPagination(TimeOrderedCursorPagination):
+    ordering = ('-accessed_at', '-id')
@@ -0,0 +1,14 @@
+"""
+Core parsers - cuerpos binarios sin envoltorio multipart.
+
+Las subidas por partes envían cada parte como application/octet-stream;
+request.data es entonces el contenido en bytes.
+"""
+from rest_framework.parsers import BaseParser
+
+
+class OctetStreamParser(BaseParser):
+    media_type = 'application/octet-stream'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream.read() if stream is not None else b''
@@ -0,0 +1,21 @@
+"""
+Core renderers - respuestas text/event-stream.
+
+Permite que una vista DRF acepte Accept: text/event-stream. El cuerpo del
+stream lo produce la propia vista (StreamingHttpResponse); este renderer solo
+serializa como JSON las respuestas de error (401, 403...).
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, default=str).encode(self.charset)
@@ -0,0 +1,45 @@
+"""Core serializers - utilidades compartidas por los serializers de todas las apps."""
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Permite al cliente elegir los campos de la respuesta (sparse fieldsets).
+
+        ?fields=id,title,updated_at   -> solo esos campos
+        ?omit=content,content_html    -> todos menos esos
+
+    Solo actúa en peticiones GET y sobre el serializer raíz de la respuesta
+    (o el hijo de un listado), de modo que no altera la validación de las
+    escrituras ni los serializers anidados. Los campos descartados no se
+    calculan, por lo que también se ahorra CPU de serialización.
+    """
+
+    fields_param = 'fields'
+    omit_param = 'omit'
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not self._is_response_root():
+            return fields
+
+        only = self._parse_param(request, self.fields_param)
+        omit = self._parse_param(request, self.omit_param)
+
+        if only:
+            fields = {name: field for name, field in fields.items() if name in only}
+        for name in omit:
+            fields.pop(name, None)
+        return fields
+
+    def _is_response_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _parse_param(self, request, name):
+        value = request.query_params.get(name, '')
+        return {field.strip() for field in value.split(',') if field.strip()}
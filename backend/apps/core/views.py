@@ -0,0 +1,35 @@
+"""Core views."""
+from django.conf import settings
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+
+from .events import event_stream, event_stream_response
+from .renderers import EventStreamRenderer
+
+
+class EventStreamView(APIView):
+    """
+    Canal de eventos en tiempo real (Server-Sent Events).
+
+    GET /api/v1/events/ con el mismo Authorization: Bearer que el resto de la API.
+    Eventos del usuario y de su organización:
+        - document.changed: documento, comentario o adjunto creado, modificado o eliminado
+        - document.lock: bloqueo de edición tomado o soltado
+        - ai.job: cambio de estado de un trabajo de IA encolado, solo para su autor
+          ({job_type, job_id, status}); con SUCCESS o FAILED el cliente lee el
+          resultado en /api/v1/standards/jobs/{job_id}/ (o ai-tests/{job_id}/ si
+          job_type es AI_TEST) en lugar de consultarlo por polling
+    La conexión se cierra tras EVENTS_STREAM_MAX_SECONDS; el cliente se reconecta
+    y recupera lo perdido con el feed de cambios (un ai.job perdido se obtiene
+    consultando el trabajo).
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+
+    def get(self, request):
+        return event_stream_response(event_stream(
+            request.user,
+            keepalive=getattr(settings, 'EVENTS_KEEPALIVE_SECONDS', 15),
+            max_duration=getattr(settings, 'EVENTS_STREAM_MAX_SECONDS', 300),
+        ))
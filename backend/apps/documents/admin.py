@@ -15,8 +15,8 @@ class DocumentAdmin(admin.ModelAdmin):
 
 @admin.register(DocumentVersion)
 class DocumentVersionAdmin(admin.ModelAdmin):
-    list_display = ['document', 'version_number', 'created_at', 'created_by']
-    list_filter = ['created_at']
+    list_display = ['document', 'version_number', 'is_keyframe', 'created_at', 'created_by']
+    list_filter = ['created_at', 'is_keyframe']
 
 
 @admin.register(DocumentComment)
@@ -0,0 +1,97 @@
+"""Documents filters - búsqueda de texto completo sobre documentos."""
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, TextField, Value
+from rest_framework import filters
+from .models import DocumentAttachment
+
+# Configuraciones de texto de PostgreSQL indexadas en Document.search_vector
+SEARCH_CONFIGS = ('spanish', 'english')
+
+
+def supports_full_text_search(queryset):
+    """Indica si la base de datos del queryset tiene el índice tsvector (PostgreSQL)."""
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def build_search_query(text):
+    """Construye una consulta que combina las configuraciones en español e inglés."""
+    query = None
+    for config in SEARCH_CONFIGS:
+        config_query = SearchQuery(text, config=config, search_type='websearch')
+        query = config_query if query is None else query | config_query
+    return query
+
+
+def attachment_matches(queryset, query):
+    """
+    Ids de documentos de queryset con algún adjunto cuyo texto extraído coincide con query.
+
+    Se resuelven en una consulta aparte (índice GIN de attachment_texts) para
+    que el filtro principal sea "search_vector @@ q OR id IN (...)", que
+    PostgreSQL combina con un BitmapOr de índices en lugar de un seq scan.
+    La consulta se limita a los documentos de queryset (ya filtrado por
+    organización), así la lista no incluye coincidencias de otras organizaciones.
+    """
+    return Q(pk__in=list(
+        DocumentAttachment.objects.filter(
+            document__in=queryset.order_by().values('pk'),
+            blob__extracted_text__search_vector=query,
+        ).order_by().values_list('document_id', flat=True).distinct()
+    ))
+
+
+def search_documents(queryset, text):
+    """
+    Filtra y ordena documentos por relevancia usando el índice GIN de search_vector.
+
+    Anota cada documento con:
+        - rank: relevancia ts_rank (el título pesa más que el contenido)
+        - headline: fragmentos del contenido con los términos resaltados en <mark>
+    También encuentra documentos por el texto de sus adjuntos (con rank del
+    documento, por lo que quedan detrás de las coincidencias en el propio contenido).
+    En bases de datos sin soporte (SQLite local) se usa ILIKE sin ranking.
+    """
+    if not supports_full_text_search(queryset):
+        in_attachments = DocumentAttachment.objects.filter(
+            blob__extracted_text__text__icontains=text
+        ).values('document_id')
+        return queryset.filter(
+            Q(title__icontains=text) | Q(content__icontains=text) | Q(pk__in=in_attachments)
+        ).annotate(
+            rank=Value(0.0, output_field=FloatField()),
+            headline=Value('', output_field=TextField()),
+        ).order_by('-updated_at')
+
+    query = build_search_query(text)
+    return queryset.filter(Q(search_vector=query) | attachment_matches(queryset, query)).annotate(
+        rank=SearchRank(F('search_vector'), query),
+        headline=SearchHeadline(
+            'content',
+            query,
+            config=SEARCH_CONFIGS[0],
+            start_sel='<mark>',
+            stop_sel='</mark>',
+            max_words=35,
+            min_words=15,
+            max_fragments=3,
+        ),
+    ).order_by('-rank', '-updated_at')
+
+
+class DocumentSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter que resuelve ?search= contra el índice de texto completo.
+
+    En PostgreSQL usa Document.search_vector (GIN) en lugar de ILIKE '%term%',
+    más el texto extraído de los adjuntos;
+    en otros motores delega en el SearchFilter estándar de DRF.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not supports_full_text_search(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        query = build_search_query(' '.join(search_terms))
+        return queryset.filter(Q(search_vector=query) | attachment_matches(queryset, query))
@@ -3,49 +3,83 @@ Management command to clean up trashed documents older than 30 days.
 
 Usage:
     python manage.py cleanup_trash
+    python manage.py cleanup_trash --dry-run
+    python manage.py cleanup_trash --batch-size 200 --days 60
 
-This command should be run periodically (e.g., daily via cron job)
+This command should be run periodically (e.g., daily via cron job).
+Documents are purged in id-range batches, each in its own short transaction,
+together with their related rows and attachment files.
 """
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from apps.documents.models import Document
+from apps.documents.services.purge import purge_documents
 
 
 class Command(BaseCommand):
     help = 'Elimina permanentemente documentos en la papelera por más de 30 días'
 
-    def handle(self, *args, **options):
-        # Calcular fecha límite (30 días atrás)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-
-        # Buscar documentos eliminados hace más de 30 días
-        old_trashed_docs = Document.objects.filter(
-            is_deleted=True,
-            deleted_at__lt=thirty_days_ago
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Días en la papelera antes de eliminar (por defecto 30)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Documentos por lote/transacción (por defecto 500)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Cuenta lo que se eliminaría sin borrar nada'
         )
 
-        count = old_trashed_docs.count()
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        prefix = '[dry-run] ' if dry_run else ''
+
+        # Buscar documentos eliminados hace más de N días
+        limit = timezone.now() - timedelta(days=options['days'])
+        old_trashed_docs = Document.objects.filter(is_deleted=True, deleted_at__lt=limit)
 
-        if count == 0:
+        if not old_trashed_docs.exists():
             self.stdout.write(
                 self.style.SUCCESS('No hay documentos para eliminar en la papelera.')
             )
             return
 
-        # Mostrar documentos que serán eliminados
-        self.stdout.write(f'\nSe eliminarán {count} documento(s):')
-        for doc in old_trashed_docs:
+        def on_batch(batch):
+            rate = batch['rows'] / batch['elapsed'] if batch['elapsed'] else 0
             self.stdout.write(
-                f'  - ID: {doc.id}, Título: {doc.title}, '
-                f'Eliminado el: {doc.deleted_at.strftime("%Y-%m-%d %H:%M")}'
+                f"  {prefix}Lote {batch['batch']}: {batch['documents']} documento(s) "
+                f"(ids {batch['first_id']}-{batch['last_id']}), {batch['rows']} fila(s) "
+                f"en {batch['elapsed']:.2f}s ({rate:.0f} filas/s)"
             )
 
-        # Eliminar permanentemente
-        old_trashed_docs.delete()
+        report = purge_documents(
+            old_trashed_docs,
+            batch_size=options['batch_size'],
+            dry_run=dry_run,
+            on_batch=on_batch
+        )
+
+        self.stdout.write(f'\n{prefix}Filas eliminadas por tabla:')
+        for label, rows in sorted(report['rows'].items()):
+            self.stdout.write(f'  - {label}: {rows}')
+        for label, rows in sorted(report['updated'].items()):
+            self.stdout.write(f'  - {label}: {rows} (referencia puesta a NULL)')
+        self.stdout.write(f'  - Archivos adjuntos: {report["files"]}')
 
+        elapsed = report['elapsed']
+        rate = report['documents'] / elapsed if elapsed else 0
         self.stdout.write(
             self.style.SUCCESS(
-                f'\n✓ {count} documento(s) eliminado(s) permanentemente.'
+                f'\n✓ {prefix}{report["documents"]} documento(s) eliminado(s) permanentemente '
+                f'en {report["batches"]} lote(s), {elapsed:.2f}s ({rate:.0f} documentos/s).'
             )
         )
@@ -0,0 +1,39 @@
+"""
+Management command to discard abandoned chunked attachment uploads.
+
+Usage:
+    python manage.py cleanup_uploads
+    python manage.py cleanup_uploads --hours 6
+
+Removes upload sessions (and their partial temporary files) that have not
+received data in the given number of hours. Run it periodically (e.g., daily
+via cron job).
+"""
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.documents.models import AttachmentUpload
+from apps.documents.services.attachments import abort_upload
+
+
+class Command(BaseCommand):
+    help = 'Elimina subidas de adjuntos por partes abandonadas y sus archivos temporales'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=24,
+            help='Horas sin actividad antes de descartar una subida (por defecto 24)'
+        )
+
+    def handle(self, *args, **options):
+        limit = timezone.now() - timedelta(hours=options['hours'])
+        stale = AttachmentUpload.objects.filter(updated_at__lt=limit)
+
+        removed = 0
+        for upload in stale.iterator():
+            abort_upload(upload)
+            removed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'✓ {removed} subida(s) eliminada(s).'))
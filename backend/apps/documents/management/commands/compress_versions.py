@@ -0,0 +1,119 @@
+"""
+Management command to migrate document version history to keyframe + delta storage.
+
+Usage:
+    python manage.py compress_versions
+    python manage.py compress_versions --dry-run
+    python manage.py compress_versions --keyframe-interval 20
+
+Rewrites each document's versions so that one full copy (keyframe) is kept
+every N versions and the rest are stored as compressed deltas, then reports
+the space saved.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.documents.models import DocumentVersion
+from apps.documents.services.versioning import get_keyframe_interval, plan_snapshot, stored_size
+
+
+class Command(BaseCommand):
+    help = 'Convierte el historial de versiones a almacenamiento keyframe + delta comprimido'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keyframe-interval',
+            type=int,
+            default=None,
+            help='Versiones entre keyframes (por defecto DOCUMENT_VERSION_KEYFRAME_INTERVAL)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Calcula el ahorro sin modificar la base de datos'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['keyframe_interval'] or get_keyframe_interval()
+        dry_run = options['dry_run']
+
+        document_ids = list(
+            DocumentVersion.objects.order_by().values_list('document_id', flat=True).distinct()
+        )
+
+        total_before = 0
+        total_after = 0
+        documents_count = 0
+        versions_count = 0
+
+        for document_id in document_ids:
+            before, after, count = self._compress_document(document_id, interval, dry_run)
+            total_before += before
+            total_after += after
+            versions_count += count
+            documents_count += 1
+
+        if documents_count == 0:
+            self.stdout.write(self.style.SUCCESS('No hay versiones para comprimir.'))
+            return
+
+        saved = total_before - total_after
+        ratio = (saved / total_before * 100) if total_before else 0
+        prefix = '[dry-run] ' if dry_run else ''
+
+        self.stdout.write(
+            f'\n{prefix}{versions_count} versión(es) de {documents_count} documento(s), '
+            f'keyframe cada {interval} versiones'
+        )
+        self.stdout.write(f'  - Antes:   {self._format_bytes(total_before)}')
+        self.stdout.write(f'  - Después: {self._format_bytes(total_after)}')
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✓ {prefix}Espacio ahorrado: {self._format_bytes(saved)} ({ratio:.1f}%)')
+        )
+
+    def _compress_document(self, document_id, interval, dry_run):
+        """Reescribe las versiones de un documento en orden cronológico."""
+        with transaction.atomic():
+            versions = list(
+                DocumentVersion.objects.select_for_update()
+                .filter(document_id=document_id)
+                .order_by('created_at', 'id')
+            )
+
+            before = sum(stored_size(v.content, v.content_html, v.delta) for v in versions)
+            after = 0
+            latest_keyframe = None
+            since_keyframe = 0
+
+            for version in versions:
+                storage = plan_snapshot(
+                    latest_keyframe, since_keyframe, version.content, version.content_html, interval
+                )
+                after += stored_size(storage['content'], storage['content_html'], storage['delta'])
+
+                if storage['is_keyframe']:
+                    # Conservar el contenido completo en memoria para calcular los siguientes deltas
+                    latest_keyframe = version
+                    since_keyframe = 0
+                else:
+                    since_keyframe += 1
+
+                version.is_keyframe = storage['is_keyframe']
+                version.keyframe = storage['keyframe']
+                version.delta = storage['delta']
+                version.content = storage['content']
+                version.content_html = storage['content_html']
+
+            if not dry_run:
+                DocumentVersion.objects.bulk_update(
+                    versions,
+                    ['is_keyframe', 'keyframe', 'delta', 'content', 'content_html'],
+                    batch_size=500
+                )
+
+        return before, after, len(versions)
+
+    def _format_bytes(self, size):
+        for unit in ('B', 'KB', 'MB', 'GB'):
+            if abs(size) < 1024 or unit == 'GB':
+                return f'{size:.1f} {unit}' if unit != 'B' else f'{size} {unit}'
+            size /= 1024
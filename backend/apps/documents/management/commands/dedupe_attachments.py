@@ -0,0 +1,38 @@
+"""
+Management command to move existing attachments to content-addressed blobs.
+
+Usage:
+    python manage.py dedupe_attachments
+
+Attachments uploaded before deduplication own a file under
+document_attachments/. This command hashes each one, points it to the
+shared blob for its content and deletes the now redundant copy.
+"""
+from django.core.management.base import BaseCommand
+from apps.documents.models import DocumentAttachment
+from apps.documents.services.attachments import adopt_legacy_attachment
+
+
+class Command(BaseCommand):
+    help = 'Migra los adjuntos existentes al almacenamiento deduplicado por SHA-256'
+
+    def handle(self, *args, **options):
+        legacy = DocumentAttachment.objects.filter(blob__isnull=True).only('id', 'file').order_by('pk')
+        total = legacy.count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS('No hay adjuntos pendientes de migrar.'))
+            return
+
+        migrated = missing = 0
+        for attachment in legacy.iterator(chunk_size=200):
+            if adopt_legacy_attachment(attachment):
+                migrated += 1
+            else:
+                missing += 1
+                self.stdout.write(
+                    self.style.WARNING(f'  Archivo no encontrado: {attachment.file.name} (adjunto {attachment.pk})')
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✓ {migrated} de {total} adjunto(s) migrado(s); {missing} sin archivo.')
+        )
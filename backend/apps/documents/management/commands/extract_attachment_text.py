@@ -0,0 +1,56 @@
+"""
+Management command to extract searchable text from attachment files.
+
+Usage:
+    python manage.py extract_attachment_text
+    python manage.py extract_attachment_text --force
+
+New attachments are extracted in the background after upload
+(ATTACHMENT_TEXT_EXTRACTION); this command fills the text for existing
+blobs and retries failed ones. Run dedupe_attachments first so that legacy
+attachments have a blob.
+"""
+from concurrent.futures import Future, wait
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from apps.core.background import run_in_background
+from apps.documents.models import AttachmentBlob
+from apps.documents.services.extraction import extract_blob_text
+
+
+class Command(BaseCommand):
+    help = 'Extrae el texto de los adjuntos (PDF, DOCX, Markdown) para la búsqueda'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Vuelve a extraer también los blobs que ya tienen texto'
+        )
+
+    def handle(self, *args, **options):
+        force = options['force']
+        blobs = AttachmentBlob.objects.filter(ref_count__gt=0)
+        if not force:
+            blobs = blobs.filter(Q(extracted_text__isnull=True) | Q(extracted_text__status='FAILED'))
+        blob_ids = list(blobs.order_by('pk').values_list('pk', flat=True))
+
+        if not blob_ids:
+            self.stdout.write(self.style.SUCCESS('No hay adjuntos pendientes de extraer.'))
+            return
+
+        self.stdout.write(f'Extrayendo texto de {len(blob_ids)} archivo(s)...')
+        # Los hilos del pool leen los archivos; el parseo corre en el pool de procesos
+        pending = [run_in_background(extract_blob_text, blob_id, force) for blob_id in blob_ids]
+        futures = [item for item in pending if isinstance(item, Future)]
+        wait(futures)
+        results = [item.result() if isinstance(item, Future) else item for item in pending]
+
+        by_status = {}
+        for result in results:
+            if result is not None:
+                by_status[result.status] = by_status.get(result.status, 0) + 1
+        for label, total in sorted(by_status.items()):
+            self.stdout.write(f'  - {label}: {total}')
+
+        self.stdout.write(self.style.SUCCESS(f'\n✓ {sum(by_status.values())} archivo(s) procesado(s).'))
@@ -0,0 +1,63 @@
+"""
+Management command to pre-compute diffs between consecutive document versions.
+
+Usage:
+    python manage.py precompute_diffs
+    python manage.py precompute_diffs --min-versions 20
+    python manage.py precompute_diffs --granularity word
+
+New versions get their diff computed in the background automatically
+(DOCUMENT_DIFF_PRECOMPUTE); this command fills the memo for existing
+histories so that comparing consecutive versions is instant.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from apps.documents.models import DocumentVersion, DocumentVersionDiff
+from apps.documents.services.diffing import DIFF_GRANULARITIES, get_version_diff
+
+
+class Command(BaseCommand):
+    help = 'Precalcula los diffs entre versiones consecutivas de cada documento'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-versions',
+            type=int,
+            default=2,
+            help='Solo documentos con al menos N versiones (por defecto 2)'
+        )
+        parser.add_argument(
+            '--granularity',
+            choices=DIFF_GRANULARITIES,
+            default='line',
+            help='Granularidad del diff (por defecto line)'
+        )
+
+    def handle(self, *args, **options):
+        granularity = options['granularity']
+        document_ids = list(
+            DocumentVersion.objects.order_by().values('document_id')
+            .annotate(total=Count('id'))
+            .filter(total__gte=max(options['min_versions'], 2))
+            .values_list('document_id', flat=True)
+        )
+
+        computed = 0
+        for document_id in document_ids:
+            version_ids = list(
+                DocumentVersion.objects.filter(document_id=document_id)
+                .order_by('id').values_list('id', flat=True)
+            )
+            existing = set(
+                DocumentVersionDiff.objects.filter(
+                    to_version_id__in=version_ids, granularity=granularity
+                ).values_list('from_version_id', 'to_version_id')
+            )
+            for pair in zip(version_ids, version_ids[1:]):
+                if pair not in existing:
+                    get_version_diff(pair[0], pair[1], granularity)
+                    computed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ {computed} diff(s) calculado(s) en {len(document_ids)} documento(s)')
+        )
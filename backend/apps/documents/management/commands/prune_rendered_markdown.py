@@ -0,0 +1,51 @@
+"""
+Management command to prune cached Markdown renders no longer referenced.
+
+Usage:
+    python manage.py prune_rendered_markdown
+    python manage.py prune_rendered_markdown --dry-run
+    python manage.py prune_rendered_markdown --min-age-hours 48 --batch-size 5000
+
+Every distinct content hash (each save, version keyframe, example or AI
+output) adds a RenderedMarkdown row. This command deletes the rows whose hash
+no longer matches any stored source text (edited content, purged documents,
+renders from an older RENDERER_VERSION). Run it periodically, e.g. daily after
+cleanup_trash.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.documents.services.rendering import prune_rendered_markdown
+
+
+class Command(BaseCommand):
+    help = 'Elimina de la caché los renders Markdown que ya no usa ningún contenido'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age-hours',
+            type=int,
+            default=24,
+            help='Solo borra renders creados hace más de estas horas (por defecto 24)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Filas por lote (por defecto 1000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Cuenta lo que se eliminaría sin borrar nada'
+        )
+
+    def handle(self, *args, **options):
+        pruned = prune_rendered_markdown(
+            min_age=timedelta(hours=options['min_age_hours']),
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(f'✓ {prefix}{pruned} render(s) sin uso eliminado(s) de la caché'))
@@ -0,0 +1,43 @@
+"""
+Management command to verify and repair denormalized counter columns.
+
+Usage:
+    python manage.py recount
+    python manage.py recount --dry-run
+
+Counters (documents per workspace, versions per document, active examples
+per standard, active workspaces per type) are maintained by database
+triggers; this command recomputes them from the related rows and fixes any
+drift (e.g. after restoring a backup or editing tables by hand).
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from apps.core.counters import CounterFieldsMixin, recount
+
+
+class Command(BaseCommand):
+    help = 'Recalcula las columnas contador desnormalizadas y corrige las desviaciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo informa las filas desviadas sin corregirlas'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        prefix = '[dry-run] ' if dry_run else ''
+        total = 0
+
+        for model in apps.get_models():
+            if not issubclass(model, CounterFieldsMixin):
+                continue
+            for counter in model.counter_fields:
+                drifted = recount(model, counter, dry_run=dry_run)
+                total += drifted
+                style = self.style.WARNING if drifted else self.style.SUCCESS
+                self.stdout.write(style(f'  {prefix}{model._meta.label}.{counter}: {drifted} fila(s) desviada(s)'))
+
+        action = 'detectada(s)' if dry_run else 'corregida(s)'
+        self.stdout.write(self.style.SUCCESS(f'\n✓ {prefix}{total} fila(s) {action}.'))
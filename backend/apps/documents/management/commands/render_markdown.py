@@ -0,0 +1,70 @@
+"""
+Management command to render Markdown content to sanitized HTML.
+
+Usage:
+    python manage.py render_markdown
+    python manage.py render_markdown --missing-only
+    python manage.py render_markdown --batch-size 1000
+
+Fills content_html / generated_content_html for documents, version keyframes,
+documentation examples and AI generation tests. Identical content is rendered
+only once thanks to the content-hash cache (RenderedMarkdown). Run it after
+deploying, after bumping RENDERER_VERSION, or periodically when
+MARKDOWN_RENDER_ON_SAVE is disabled.
+"""
+from django.core.management.base import BaseCommand
+from apps.documents.services.rendering import markdown_sources, render_many
+
+
+class Command(BaseCommand):
+    help = 'Renderiza el contenido Markdown a HTML sanitizado usando la caché por hash'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Solo procesa filas sin HTML renderizado'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Filas por lote (por defecto 500)'
+        )
+
+    def handle(self, *args, **options):
+        for label, queryset, source, target in markdown_sources():
+            if options['missing_only']:
+                queryset = queryset.filter(**{target: ''})
+            processed, updated = self._render_queryset(queryset, source, target, options['batch_size'])
+            self.stdout.write(f'  - {label}: {updated} actualizado(s) de {processed}')
+
+        self.stdout.write(self.style.SUCCESS('\n✓ Renderizado completado'))
+
+    def _render_queryset(self, queryset, source, target, batch_size):
+        """Recorre el queryset por rangos de id y actualiza solo las filas cuyo HTML cambió."""
+        model = queryset.model
+        processed = 0
+        updated = 0
+        last_id = 0
+
+        while True:
+            rows = list(
+                queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', source, target)[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            processed += len(rows)
+
+            rendered = render_many(text for _, text, _ in rows)
+            changes = [
+                model(pk=pk, **{target: rendered.get(text, '')})
+                for pk, text, html in rows
+                if rendered.get(text, '') != html
+            ]
+            if changes:
+                model.objects.bulk_update(changes, [target], batch_size=batch_size)
+                updated += len(changes)
+
+        return processed, updated
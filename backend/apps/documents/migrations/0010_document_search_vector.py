@@ -0,0 +1,81 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:14
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION documents_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT'
+        OR NEW.search_vector IS NULL
+        OR NEW.title IS DISTINCT FROM OLD.title
+        OR NEW.content IS DISTINCT FROM OLD.content THEN
+        NEW.search_vector :=
+            setweight(to_tsvector('spanish', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('spanish', coalesce(NEW.content, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+    ELSE
+        NEW.search_vector := OLD.search_vector;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS documents_search_vector_trigger ON documents;
+CREATE TRIGGER documents_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON documents
+    FOR EACH ROW EXECUTE FUNCTION documents_search_vector_update();
+
+UPDATE documents SET search_vector = NULL;
+
+CREATE INDEX IF NOT EXISTS documents_search_gin ON documents USING gin (search_vector);
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP INDEX IF EXISTS documents_search_gin;
+DROP TRIGGER IF EXISTS documents_search_vector_trigger ON documents;
+DROP FUNCTION IF EXISTS documents_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    """Crea el trigger que mantiene search_vector y el índice GIN (solo PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(SEARCH_VECTOR_SQL)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_SEARCH_VECTOR_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0009_document_is_favorite'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # El índice GIN se crea en SQL para no romper SQLite en desarrollo local
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='document',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='documents_search_gin'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_trigger, reverse_code=drop_search_trigger),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0010_document_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversion',
+            name='delta',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='documentversion',
+            name='is_keyframe',
+            field=models.BooleanField(default=True, help_text='Versión almacenada completa. Si es False, se reconstruye desde keyframe + delta.'),
+        ),
+        migrations.AddField(
+            model_name='documentversion',
+            name='keyframe',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='deltas', to='documents.documentversion'),
+        ),
+        migrations.AlterField(
+            model_name='documentversion',
+            name='content',
+            field=models.TextField(blank=True),
+        ),
+    ]
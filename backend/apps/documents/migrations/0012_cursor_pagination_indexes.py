@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0011_documentversion_delta_storage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['updated_at', 'id'], name='documents_updated_835b49_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documenthistory',
+            index=models.Index(fields=['performed_at', 'id'], name='document_hi_perform_c44ef0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documenthistory',
+            index=models.Index(fields=['document', 'performed_at', 'id'], name='document_hi_documen_e1d4b9_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0013_renderedmarkdown'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentVersionDiff',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('line', 'Por línea'), ('word', 'Por palabra')], default='line', max_length=10)),
+                ('diff', models.JSONField(help_text='Diff unificado (line) o lista de segmentos (word)')),
+                ('stats', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('from_version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='documents.documentversion')),
+                ('to_version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='documents.documentversion')),
+            ],
+            options={
+                'db_table': 'document_version_diffs',
+                'unique_together': {('from_version', 'to_version', 'granularity')},
+            },
+        ),
+    ]
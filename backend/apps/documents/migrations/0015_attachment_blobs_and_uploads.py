@@ -0,0 +1,70 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:39
+
+import apps.documents.models
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0014_document_version_diffs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to=apps.documents.models.attachment_blob_path)),
+                ('size', models.BigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'attachment_blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='documentattachment',
+            name='file',
+            field=models.FileField(max_length=255, upload_to='document_attachments/'),
+        ),
+        migrations.AlterField(
+            model_name='documentattachment',
+            name='file_size',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AddField(
+            model_name='documentattachment',
+            name='blob',
+            field=models.ForeignKey(blank=True, help_text='Contenido deduplicado; file apunta al mismo archivo', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attachments', to='documents.attachmentblob'),
+        ),
+        migrations.CreateModel(
+            name='AttachmentUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_size', models.BigIntegerField()),
+                ('file_type', models.CharField(blank=True, max_length=50)),
+                ('description', models.TextField(blank=True)),
+                ('sha256', models.CharField(max_length=64)),
+                ('received_bytes', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('PENDING', 'Pendiente'), ('COMPLETED', 'Completada'), ('FAILED', 'Fallida')], default='PENDING', max_length=20)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('attachment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='documents.documentattachment')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachment_uploads', to='documents.document')),
+            ],
+            options={
+                'db_table': 'attachment_uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:41
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION attachment_texts_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT'
+        OR NEW.search_vector IS NULL
+        OR NEW.text IS DISTINCT FROM OLD.text THEN
+        NEW.search_vector :=
+            to_tsvector('spanish', coalesce(NEW.text, '')) ||
+            to_tsvector('english', coalesce(NEW.text, ''));
+    ELSE
+        NEW.search_vector := OLD.search_vector;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS attachment_texts_search_vector_trigger ON attachment_texts;
+CREATE TRIGGER attachment_texts_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON attachment_texts
+    FOR EACH ROW EXECUTE FUNCTION attachment_texts_search_vector_update();
+
+CREATE INDEX IF NOT EXISTS attachment_texts_search_gin ON attachment_texts USING gin (search_vector);
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP INDEX IF EXISTS attachment_texts_search_gin;
+DROP TRIGGER IF EXISTS attachment_texts_search_vector_trigger ON attachment_texts;
+DROP FUNCTION IF EXISTS attachment_texts_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    """Crea el trigger que mantiene search_vector y el índice GIN (solo PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(SEARCH_VECTOR_SQL)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_SEARCH_VECTOR_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0015_attachment_blobs_and_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentText',
+            fields=[
+                ('blob', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='extracted_text', serialize=False, to='documents.attachmentblob')),
+                ('status', models.CharField(choices=[('DONE', 'Extraído'), ('UNSUPPORTED', 'Formato no soportado'), ('FAILED', 'Error')], max_length=20)),
+                ('kind', models.CharField(blank=True, help_text='pdf, docx o text', max_length=10)),
+                ('text', models.TextField(blank=True)),
+                ('truncated', models.BooleanField(default=False)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'attachment_texts',
+            },
+        ),
+        # El índice GIN se crea en SQL para no romper SQLite en desarrollo local
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='attachmenttext',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='attachment_texts_search_gin'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_trigger, reverse_code=drop_search_trigger),
+            ],
+        ),
+    ]
@@ -0,0 +1,228 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:45
+
+from django.db import migrations, models
+
+# SQL generado con apps.core.counters al crear esta migración, congelado aquí para
+# que cambios posteriores en esos helpers no alteren lo que ejecuta en una base nueva.
+# Contadores: workspaces.document_count (documentos no eliminados),
+# documents.version_count y workspace_types.active_workspace_count (workspaces activos).
+CREATE_TRIGGERS_SQL = {
+    'postgresql': [
+        """
+CREATE OR REPLACE FUNCTION documents_document_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.workspace_id IS NOT DISTINCT FROM NEW.workspace_id AND (NOT OLD.is_deleted) = (NOT NEW.is_deleted) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.workspace_id IS NOT NULL AND (NOT OLD.is_deleted) THEN
+            UPDATE workspaces SET document_count = GREATEST(document_count - 1, 0) WHERE id = OLD.workspace_id;
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.workspace_id IS NOT NULL AND (NOT NEW.is_deleted) THEN
+            UPDATE workspaces SET document_count = document_count + 1 WHERE id = NEW.workspace_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS documents_document_count_trigger ON documents',
+        """
+CREATE TRIGGER documents_document_count_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF workspace_id, is_deleted ON documents
+    FOR EACH ROW EXECUTE FUNCTION documents_document_count_update()""",
+        'UPDATE workspaces SET document_count = (SELECT COUNT(*) FROM documents WHERE documents.workspace_id = workspaces.id AND NOT documents.is_deleted)',
+        """
+CREATE OR REPLACE FUNCTION document_versions_version_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.document_id IS NOT DISTINCT FROM NEW.document_id AND (TRUE) = (TRUE) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.document_id IS NOT NULL AND (TRUE) THEN
+            UPDATE documents SET version_count = GREATEST(version_count - 1, 0) WHERE id = OLD.document_id;
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.document_id IS NOT NULL AND (TRUE) THEN
+            UPDATE documents SET version_count = version_count + 1 WHERE id = NEW.document_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS document_versions_version_count_trigger ON document_versions',
+        """
+CREATE TRIGGER document_versions_version_count_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF document_id ON document_versions
+    FOR EACH ROW EXECUTE FUNCTION document_versions_version_count_update()""",
+        'UPDATE documents SET version_count = (SELECT COUNT(*) FROM document_versions WHERE document_versions.document_id = documents.id AND TRUE)',
+        """
+CREATE OR REPLACE FUNCTION workspaces_active_workspace_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.workspace_type_id IS NOT DISTINCT FROM NEW.workspace_type_id AND (OLD.is_active) = (NEW.is_active) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.workspace_type_id IS NOT NULL AND (OLD.is_active) THEN
+            UPDATE workspace_types SET active_workspace_count = GREATEST(active_workspace_count - 1, 0) WHERE id = OLD.workspace_type_id;
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.workspace_type_id IS NOT NULL AND (NEW.is_active) THEN
+            UPDATE workspace_types SET active_workspace_count = active_workspace_count + 1 WHERE id = NEW.workspace_type_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_trigger ON workspaces',
+        """
+CREATE TRIGGER workspaces_active_workspace_count_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF workspace_type_id, is_active ON workspaces
+    FOR EACH ROW EXECUTE FUNCTION workspaces_active_workspace_count_update()""",
+        'UPDATE workspace_types SET active_workspace_count = (SELECT COUNT(*) FROM workspaces WHERE workspaces.workspace_type_id = workspace_types.id AND workspaces.is_active)',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documents_document_count_insert',
+        """
+CREATE TRIGGER documents_document_count_insert AFTER INSERT ON documents
+FOR EACH ROW WHEN NEW.workspace_id IS NOT NULL AND (NOT NEW.is_deleted)
+BEGIN
+    UPDATE workspaces SET document_count = document_count + 1 WHERE id = NEW.workspace_id;
+END""",
+        'DROP TRIGGER IF EXISTS documents_document_count_delete',
+        """
+CREATE TRIGGER documents_document_count_delete AFTER DELETE ON documents
+FOR EACH ROW WHEN OLD.workspace_id IS NOT NULL AND (NOT OLD.is_deleted)
+BEGIN
+    UPDATE workspaces SET document_count = MAX(document_count - 1, 0) WHERE id = OLD.workspace_id;
+END""",
+        'DROP TRIGGER IF EXISTS documents_document_count_change',
+        """
+CREATE TRIGGER documents_document_count_change AFTER UPDATE OF workspace_id, is_deleted ON documents
+FOR EACH ROW WHEN NOT (OLD.workspace_id IS NEW.workspace_id AND (NOT OLD.is_deleted) = (NOT NEW.is_deleted))
+BEGIN
+    UPDATE workspaces SET document_count = MAX(document_count - 1, 0) WHERE id = OLD.workspace_id AND (NOT OLD.is_deleted);
+    UPDATE workspaces SET document_count = document_count + 1 WHERE id = NEW.workspace_id AND (NOT NEW.is_deleted);
+END""",
+        'UPDATE workspaces SET document_count = (SELECT COUNT(*) FROM documents WHERE documents.workspace_id = workspaces.id AND NOT documents.is_deleted)',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_insert',
+        """
+CREATE TRIGGER document_versions_version_count_insert AFTER INSERT ON document_versions
+FOR EACH ROW WHEN NEW.document_id IS NOT NULL AND (TRUE)
+BEGIN
+    UPDATE documents SET version_count = version_count + 1 WHERE id = NEW.document_id;
+END""",
+        'DROP TRIGGER IF EXISTS document_versions_version_count_delete',
+        """
+CREATE TRIGGER document_versions_version_count_delete AFTER DELETE ON document_versions
+FOR EACH ROW WHEN OLD.document_id IS NOT NULL AND (TRUE)
+BEGIN
+    UPDATE documents SET version_count = MAX(version_count - 1, 0) WHERE id = OLD.document_id;
+END""",
+        'DROP TRIGGER IF EXISTS document_versions_version_count_change',
+        """
+CREATE TRIGGER document_versions_version_count_change AFTER UPDATE OF document_id ON document_versions
+FOR EACH ROW WHEN NOT (OLD.document_id IS NEW.document_id AND (TRUE) = (TRUE))
+BEGIN
+    UPDATE documents SET version_count = MAX(version_count - 1, 0) WHERE id = OLD.document_id AND (TRUE);
+    UPDATE documents SET version_count = version_count + 1 WHERE id = NEW.document_id AND (TRUE);
+END""",
+        'UPDATE documents SET version_count = (SELECT COUNT(*) FROM document_versions WHERE document_versions.document_id = documents.id AND TRUE)',
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_insert',
+        """
+CREATE TRIGGER workspaces_active_workspace_count_insert AFTER INSERT ON workspaces
+FOR EACH ROW WHEN NEW.workspace_type_id IS NOT NULL AND (NEW.is_active)
+BEGIN
+    UPDATE workspace_types SET active_workspace_count = active_workspace_count + 1 WHERE id = NEW.workspace_type_id;
+END""",
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_delete',
+        """
+CREATE TRIGGER workspaces_active_workspace_count_delete AFTER DELETE ON workspaces
+FOR EACH ROW WHEN OLD.workspace_type_id IS NOT NULL AND (OLD.is_active)
+BEGIN
+    UPDATE workspace_types SET active_workspace_count = MAX(active_workspace_count - 1, 0) WHERE id = OLD.workspace_type_id;
+END""",
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_change',
+        """
+CREATE TRIGGER workspaces_active_workspace_count_change AFTER UPDATE OF workspace_type_id, is_active ON workspaces
+FOR EACH ROW WHEN NOT (OLD.workspace_type_id IS NEW.workspace_type_id AND (OLD.is_active) = (NEW.is_active))
+BEGIN
+    UPDATE workspace_types SET active_workspace_count = MAX(active_workspace_count - 1, 0) WHERE id = OLD.workspace_type_id AND (OLD.is_active);
+    UPDATE workspace_types SET active_workspace_count = active_workspace_count + 1 WHERE id = NEW.workspace_type_id AND (NEW.is_active);
+END""",
+        'UPDATE workspace_types SET active_workspace_count = (SELECT COUNT(*) FROM workspaces WHERE workspaces.workspace_type_id = workspace_types.id AND workspaces.is_active)',
+    ],
+}
+
+
+DROP_TRIGGERS_SQL = {
+    'postgresql': [
+        'DROP TRIGGER IF EXISTS documents_document_count_trigger ON documents',
+        'DROP FUNCTION IF EXISTS documents_document_count_update()',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_trigger ON document_versions',
+        'DROP FUNCTION IF EXISTS document_versions_version_count_update()',
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_trigger ON workspaces',
+        'DROP FUNCTION IF EXISTS workspaces_active_workspace_count_update()',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documents_document_count_insert',
+        'DROP TRIGGER IF EXISTS documents_document_count_delete',
+        'DROP TRIGGER IF EXISTS documents_document_count_change',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_insert',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_delete',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_change',
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_insert',
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_delete',
+        'DROP TRIGGER IF EXISTS workspaces_active_workspace_count_change',
+    ],
+}
+
+
+def _execute(schema_editor, statements):
+    vendor = schema_editor.connection.vendor
+    for statement in statements['postgresql' if vendor == 'postgresql' else 'sqlite']:
+        schema_editor.execute(statement)
+
+
+def create_counter_triggers(apps, schema_editor):
+    """Crea los triggers de los contadores y calcula su valor inicial (PostgreSQL y SQLite)."""
+    _execute(schema_editor, CREATE_TRIGGERS_SQL)
+
+
+def drop_counter_triggers(apps, schema_editor):
+    _execute(schema_editor, DROP_TRIGGERS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0016_attachment_text_extraction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='version_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='document_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='workspacetype',
+            name='active_workspace_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(create_counter_triggers, reverse_code=drop_counter_triggers),
+    ]
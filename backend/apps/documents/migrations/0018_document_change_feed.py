@@ -0,0 +1,192 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:52
+
+from django.db import migrations, models
+
+# SQL generado con apps.documents.services.changes al crear esta migración, congelado
+# aquí para que cambios posteriores en ese módulo no alteren lo que ejecuta en una base nueva.
+# Tablas del feed: documents, document_comments y document_attachments.
+CREATE_TRIGGERS_SQL = {
+    'postgresql': [
+        """
+CREATE OR REPLACE FUNCTION documents_change_feed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'document', NEW.id, NEW.id, NEW.workspace_id, (SELECT organization_id FROM workspaces WHERE id = NEW.workspace_id), 'created', now());
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'document', OLD.id, OLD.id, OLD.workspace_id, (SELECT organization_id FROM workspaces WHERE id = OLD.workspace_id), 'purged', now());
+    ELSIF OLD.is_deleted IS DISTINCT FROM NEW.is_deleted OR OLD.updated_at IS DISTINCT FROM NEW.updated_at THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'document', NEW.id, NEW.id, NEW.workspace_id, (SELECT organization_id FROM workspaces WHERE id = NEW.workspace_id), CASE WHEN OLD.is_deleted IS DISTINCT FROM NEW.is_deleted THEN CASE WHEN NEW.is_deleted THEN 'deleted' ELSE 'restored' END ELSE 'updated' END, now());
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS documents_change_feed_trigger ON documents',
+        """
+CREATE TRIGGER documents_change_feed_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON documents
+    FOR EACH ROW EXECUTE FUNCTION documents_change_feed()""",
+        """
+CREATE OR REPLACE FUNCTION document_comments_change_feed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'comment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'created', now());
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'comment', OLD.id, OLD.document_id, (SELECT workspace_id FROM documents WHERE id = OLD.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = OLD.document_id)), 'deleted', now());
+    ELSIF OLD.updated_at IS DISTINCT FROM NEW.updated_at THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'comment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'updated', now());
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_trigger ON document_comments',
+        """
+CREATE TRIGGER document_comments_change_feed_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON document_comments
+    FOR EACH ROW EXECUTE FUNCTION document_comments_change_feed()""",
+        """
+CREATE OR REPLACE FUNCTION document_attachments_change_feed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'attachment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'created', now());
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'attachment', OLD.id, OLD.document_id, (SELECT workspace_id FROM documents WHERE id = OLD.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = OLD.document_id)), 'deleted', now());
+    ELSIF TRUE THEN
+        INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (txid_current(), 'attachment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'updated', now());
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_trigger ON document_attachments',
+        """
+CREATE TRIGGER document_attachments_change_feed_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON document_attachments
+    FOR EACH ROW EXECUTE FUNCTION document_attachments_change_feed()""",
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documents_change_feed_insert',
+        """
+CREATE TRIGGER documents_change_feed_insert AFTER INSERT ON documents
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'document', NEW.id, NEW.id, NEW.workspace_id, (SELECT organization_id FROM workspaces WHERE id = NEW.workspace_id), 'created', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS documents_change_feed_update',
+        """
+CREATE TRIGGER documents_change_feed_update AFTER UPDATE ON documents
+FOR EACH ROW WHEN OLD.is_deleted IS NOT NEW.is_deleted OR OLD.updated_at IS NOT NEW.updated_at
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'document', NEW.id, NEW.id, NEW.workspace_id, (SELECT organization_id FROM workspaces WHERE id = NEW.workspace_id), CASE WHEN OLD.is_deleted IS NOT NEW.is_deleted THEN CASE WHEN NEW.is_deleted THEN 'deleted' ELSE 'restored' END ELSE 'updated' END, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS documents_change_feed_delete',
+        """
+CREATE TRIGGER documents_change_feed_delete AFTER DELETE ON documents
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'document', OLD.id, OLD.id, OLD.workspace_id, (SELECT organization_id FROM workspaces WHERE id = OLD.workspace_id), 'purged', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_insert',
+        """
+CREATE TRIGGER document_comments_change_feed_insert AFTER INSERT ON document_comments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'comment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'created', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_update',
+        """
+CREATE TRIGGER document_comments_change_feed_update AFTER UPDATE ON document_comments
+FOR EACH ROW WHEN OLD.updated_at IS NOT NEW.updated_at
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'comment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'updated', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_delete',
+        """
+CREATE TRIGGER document_comments_change_feed_delete AFTER DELETE ON document_comments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'comment', OLD.id, OLD.document_id, (SELECT workspace_id FROM documents WHERE id = OLD.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = OLD.document_id)), 'deleted', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_insert',
+        """
+CREATE TRIGGER document_attachments_change_feed_insert AFTER INSERT ON document_attachments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'attachment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'created', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_update',
+        """
+CREATE TRIGGER document_attachments_change_feed_update AFTER UPDATE ON document_attachments
+FOR EACH ROW WHEN 1
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'attachment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'updated', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_delete',
+        """
+CREATE TRIGGER document_attachments_change_feed_delete AFTER DELETE ON document_attachments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'attachment', OLD.id, OLD.document_id, (SELECT workspace_id FROM documents WHERE id = OLD.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = OLD.document_id)), 'deleted', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+    ],
+}
+
+
+DROP_TRIGGERS_SQL = {
+    'postgresql': [
+        'DROP TRIGGER IF EXISTS documents_change_feed_trigger ON documents',
+        'DROP FUNCTION IF EXISTS documents_change_feed()',
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_trigger ON document_comments',
+        'DROP FUNCTION IF EXISTS document_comments_change_feed()',
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_trigger ON document_attachments',
+        'DROP FUNCTION IF EXISTS document_attachments_change_feed()',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documents_change_feed_insert',
+        'DROP TRIGGER IF EXISTS documents_change_feed_update',
+        'DROP TRIGGER IF EXISTS documents_change_feed_delete',
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_insert',
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_update',
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_delete',
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_insert',
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_update',
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_delete',
+    ],
+}
+
+
+def _execute(schema_editor, statements):
+    vendor = schema_editor.connection.vendor
+    for statement in statements['postgresql' if vendor == 'postgresql' else 'sqlite']:
+        schema_editor.execute(statement)
+
+
+def create_change_triggers(apps, schema_editor):
+    """Crea los triggers que alimentan document_changes (PostgreSQL y SQLite)."""
+    _execute(schema_editor, CREATE_TRIGGERS_SQL)
+
+
+def drop_change_triggers(apps, schema_editor):
+    _execute(schema_editor, DROP_TRIGGERS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0017_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('txid', models.BigIntegerField(default=0)),
+                ('object_type', models.CharField(choices=[('document', 'Documento'), ('comment', 'Comentario'), ('attachment', 'Adjunto')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('document_id', models.BigIntegerField()),
+                ('workspace_id', models.BigIntegerField(null=True)),
+                ('organization_id', models.BigIntegerField(null=True)),
+                ('action', models.CharField(choices=[('created', 'Creado'), ('updated', 'Modificado'), ('deleted', 'Eliminado'), ('restored', 'Restaurado'), ('purged', 'Eliminado permanentemente')], max_length=20)),
+                ('changed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'document_changes',
+                'ordering': ['txid', 'id'],
+                'indexes': [models.Index(fields=['txid', 'id'], name='document_ch_txid_6007f8_idx'), models.Index(fields=['organization_id', 'txid', 'id'], name='document_ch_organiz_3b4ae6_idx')],
+            },
+        ),
+        migrations.RunPython(create_change_triggers, reverse_code=drop_change_triggers),
+    ]
@@ -0,0 +1,190 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# SQLite quita columnas reconstruyendo la tabla documents: antes hay que quitar sus
+# triggers y los de las tablas que la referencian, y recrearlos después.
+# En PostgreSQL los triggers no se ven afectados.
+# SQL de los contadores (0017) y del feed de cambios (0018) para esas tablas, congelado
+# al crear esta migración para que no dependa de apps.core.counters ni de services.changes.
+SQLITE_CREATE_TRIGGERS_SQL = {
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documents_document_count_insert',
+        """
+CREATE TRIGGER documents_document_count_insert AFTER INSERT ON documents
+FOR EACH ROW WHEN NEW.workspace_id IS NOT NULL AND (NOT NEW.is_deleted)
+BEGIN
+    UPDATE workspaces SET document_count = document_count + 1 WHERE id = NEW.workspace_id;
+END""",
+        'DROP TRIGGER IF EXISTS documents_document_count_delete',
+        """
+CREATE TRIGGER documents_document_count_delete AFTER DELETE ON documents
+FOR EACH ROW WHEN OLD.workspace_id IS NOT NULL AND (NOT OLD.is_deleted)
+BEGIN
+    UPDATE workspaces SET document_count = MAX(document_count - 1, 0) WHERE id = OLD.workspace_id;
+END""",
+        'DROP TRIGGER IF EXISTS documents_document_count_change',
+        """
+CREATE TRIGGER documents_document_count_change AFTER UPDATE OF workspace_id, is_deleted ON documents
+FOR EACH ROW WHEN NOT (OLD.workspace_id IS NEW.workspace_id AND (NOT OLD.is_deleted) = (NOT NEW.is_deleted))
+BEGIN
+    UPDATE workspaces SET document_count = MAX(document_count - 1, 0) WHERE id = OLD.workspace_id AND (NOT OLD.is_deleted);
+    UPDATE workspaces SET document_count = document_count + 1 WHERE id = NEW.workspace_id AND (NOT NEW.is_deleted);
+END""",
+        'UPDATE workspaces SET document_count = (SELECT COUNT(*) FROM documents WHERE documents.workspace_id = workspaces.id AND NOT documents.is_deleted)',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_insert',
+        """
+CREATE TRIGGER document_versions_version_count_insert AFTER INSERT ON document_versions
+FOR EACH ROW WHEN NEW.document_id IS NOT NULL AND (TRUE)
+BEGIN
+    UPDATE documents SET version_count = version_count + 1 WHERE id = NEW.document_id;
+END""",
+        'DROP TRIGGER IF EXISTS document_versions_version_count_delete',
+        """
+CREATE TRIGGER document_versions_version_count_delete AFTER DELETE ON document_versions
+FOR EACH ROW WHEN OLD.document_id IS NOT NULL AND (TRUE)
+BEGIN
+    UPDATE documents SET version_count = MAX(version_count - 1, 0) WHERE id = OLD.document_id;
+END""",
+        'DROP TRIGGER IF EXISTS document_versions_version_count_change',
+        """
+CREATE TRIGGER document_versions_version_count_change AFTER UPDATE OF document_id ON document_versions
+FOR EACH ROW WHEN NOT (OLD.document_id IS NEW.document_id AND (TRUE) = (TRUE))
+BEGIN
+    UPDATE documents SET version_count = MAX(version_count - 1, 0) WHERE id = OLD.document_id AND (TRUE);
+    UPDATE documents SET version_count = version_count + 1 WHERE id = NEW.document_id AND (TRUE);
+END""",
+        'UPDATE documents SET version_count = (SELECT COUNT(*) FROM document_versions WHERE document_versions.document_id = documents.id AND TRUE)',
+        'DROP TRIGGER IF EXISTS documents_change_feed_insert',
+        """
+CREATE TRIGGER documents_change_feed_insert AFTER INSERT ON documents
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'document', NEW.id, NEW.id, NEW.workspace_id, (SELECT organization_id FROM workspaces WHERE id = NEW.workspace_id), 'created', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS documents_change_feed_update',
+        """
+CREATE TRIGGER documents_change_feed_update AFTER UPDATE ON documents
+FOR EACH ROW WHEN OLD.is_deleted IS NOT NEW.is_deleted OR OLD.updated_at IS NOT NEW.updated_at
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'document', NEW.id, NEW.id, NEW.workspace_id, (SELECT organization_id FROM workspaces WHERE id = NEW.workspace_id), CASE WHEN OLD.is_deleted IS NOT NEW.is_deleted THEN CASE WHEN NEW.is_deleted THEN 'deleted' ELSE 'restored' END ELSE 'updated' END, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS documents_change_feed_delete',
+        """
+CREATE TRIGGER documents_change_feed_delete AFTER DELETE ON documents
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'document', OLD.id, OLD.id, OLD.workspace_id, (SELECT organization_id FROM workspaces WHERE id = OLD.workspace_id), 'purged', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_insert',
+        """
+CREATE TRIGGER document_comments_change_feed_insert AFTER INSERT ON document_comments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'comment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'created', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_update',
+        """
+CREATE TRIGGER document_comments_change_feed_update AFTER UPDATE ON document_comments
+FOR EACH ROW WHEN OLD.updated_at IS NOT NEW.updated_at
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'comment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'updated', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_delete',
+        """
+CREATE TRIGGER document_comments_change_feed_delete AFTER DELETE ON document_comments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'comment', OLD.id, OLD.document_id, (SELECT workspace_id FROM documents WHERE id = OLD.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = OLD.document_id)), 'deleted', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_insert',
+        """
+CREATE TRIGGER document_attachments_change_feed_insert AFTER INSERT ON document_attachments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'attachment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'created', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_update',
+        """
+CREATE TRIGGER document_attachments_change_feed_update AFTER UPDATE ON document_attachments
+FOR EACH ROW WHEN 1
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'attachment', NEW.id, NEW.document_id, (SELECT workspace_id FROM documents WHERE id = NEW.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = NEW.document_id)), 'updated', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_delete',
+        """
+CREATE TRIGGER document_attachments_change_feed_delete AFTER DELETE ON document_attachments
+BEGIN
+    INSERT INTO document_changes (txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) VALUES (0, 'attachment', OLD.id, OLD.document_id, (SELECT workspace_id FROM documents WHERE id = OLD.document_id), (SELECT organization_id FROM workspaces WHERE id = (SELECT workspace_id FROM documents WHERE id = OLD.document_id)), 'deleted', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END""",
+    ],
+}
+
+
+SQLITE_DROP_TRIGGERS_SQL = {
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documents_document_count_insert',
+        'DROP TRIGGER IF EXISTS documents_document_count_delete',
+        'DROP TRIGGER IF EXISTS documents_document_count_change',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_insert',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_delete',
+        'DROP TRIGGER IF EXISTS document_versions_version_count_change',
+        'DROP TRIGGER IF EXISTS documents_change_feed_insert',
+        'DROP TRIGGER IF EXISTS documents_change_feed_update',
+        'DROP TRIGGER IF EXISTS documents_change_feed_delete',
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_insert',
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_update',
+        'DROP TRIGGER IF EXISTS document_comments_change_feed_delete',
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_insert',
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_update',
+        'DROP TRIGGER IF EXISTS document_attachments_change_feed_delete',
+    ],
+}
+
+
+def drop_sqlite_document_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in SQLITE_DROP_TRIGGERS_SQL['sqlite']:
+        schema_editor.execute(statement)
+
+
+def create_sqlite_document_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in SQLITE_CREATE_TRIGGERS_SQL['sqlite']:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0018_document_change_feed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_sqlite_document_triggers, reverse_code=create_sqlite_document_triggers),
+        migrations.RemoveField(
+            model_name='document',
+            name='is_locked',
+        ),
+        migrations.RemoveField(
+            model_name='document',
+            name='locked_at',
+        ),
+        migrations.RemoveField(
+            model_name='document',
+            name='locked_by',
+        ),
+        migrations.CreateModel(
+            name='DocumentLock',
+            fields=[
+                ('document', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='lock', serialize=False, to='documents.document')),
+                ('acquired_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_locks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'document_locks',
+            },
+        ),
+        migrations.RunPython(create_sqlite_document_triggers, reverse_code=drop_sqlite_document_triggers),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-17 11:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0019_document_lease_locks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documenthistory',
+            name='event_id',
+            field=models.UUIDField(editable=False, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='documenthistory',
+            name='performed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-17 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agile', '0002_initial'),
+        ('documents', '0020_event_log_ids'),
+        ('projects', '0002_initial'),
+        ('standards', '0004_active_examples_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='document',
+            name='documents_updated_835b49_idx',
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['updated_at', 'id'], name='documents_live_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['workspace', 'updated_at', 'id'], name='documents_live_ws_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='documents_trash_deleted_idx'),
+        ),
+    ]
@@ -1,13 +1,20 @@
 """Documents models."""
+import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.users.models import User, Organization
 from apps.projects.models import Project
 from apps.agile.models import UserStory, Task
 from apps.standards.models import DocumentationStandard
+from apps.core.concurrency import CompareAndSwapMixin
+from apps.core.counters import CounterFieldsMixin
+from apps.core.markdown import MarkdownRenderMixin
 
 
-class WorkspaceType(models.Model):
+class WorkspaceType(CounterFieldsMixin, models.Model):
     """
     Tipo de Workspace - Define categorías personalizables de espacios de trabajo.
     Puede ser global (organization=null) o específico de una organización.
@@ -58,6 +65,10 @@ class WorkspaceType(models.Model):
         null=True,
         related_name='created_workspace_types'
     )
+    # Contador mantenido por trigger (ver apps.core.counters)
+    active_workspace_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = {'active_workspace_count': ('workspaces', {'is_active': True})}
 
     class Meta:
         db_table = 'workspace_types'
@@ -70,7 +81,7 @@ class WorkspaceType(models.Model):
         return f"{self.label} (Global)"
 
 
-class Workspace(models.Model):
+class Workspace(CounterFieldsMixin, models.Model):
     """
     Workspace model - Categorizes documents into different knowledge areas.
 
@@ -128,6 +139,10 @@ class Workspace(models.Model):
         null=True,
         related_name='created_workspaces'
     )
+    # Contador mantenido por trigger (ver apps.core.counters)
+    document_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = {'document_count': ('documents', {'is_deleted': False})}
 
     class Meta:
         db_table = 'workspaces'
@@ -138,7 +153,20 @@ class Workspace(models.Model):
         return f"{self.name} ({self.get_type_display()})"
 
 
-class Document(models.Model):
+class DocumentQuerySet(models.QuerySet):
+    """QuerySet de documentos con helpers para los endpoints de listado."""
+
+    def with_list_data(self):
+        """
+        Carga en la misma consulta las relaciones y agregados que usa DocumentSerializer
+        (nombres de workspace/proyecto/usuarios), evitando N+1.
+        """
+        return self.select_related(
+            'workspace', 'project', 'created_by', 'last_modified_by', 'deleted_by', 'lock__user'
+        )
+
+
+class Document(MarkdownRenderMixin, CompareAndSwapMixin, CounterFieldsMixin, models.Model):
     """Main document model."""
 
     STATUS_CHOICES = [
@@ -187,15 +215,6 @@ class Document(models.Model):
         blank=True,
         related_name='documents'
     )
-    is_locked = models.BooleanField(default=False)
-    locked_by = models.ForeignKey(
-        User,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name='locked_documents'
-    )
-    locked_at = models.DateTimeField(null=True, blank=True)
     is_favorite = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -221,10 +240,40 @@ class Document(models.Model):
         blank=True,
         related_name='deleted_documents'
     )
+    # Búsqueda de texto completo: mantenido por trigger en PostgreSQL (título peso A, contenido peso B)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Contador mantenido por trigger (ver apps.core.counters)
+    version_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = DocumentQuerySet.as_manager()
+
+    counter_fields = {'version_count': ('versions', {})}
+
+    # content_html se genera en el servidor (Markdown sanitizado, cacheado por hash)
+    markdown_fields = {'content': 'content_html'}
 
     class Meta:
         db_table = 'documents'
         ordering = ['-updated_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='documents_search_gin'),
+            # Índices parciales: toda consulta filtra por is_deleted, así cada índice solo
+            # cubre su lado (documentos vivos o papelera) y no crece con el otro.
+            # Listado (-updated_at, -id) de documentos vivos, global y por workspace
+            models.Index(
+                fields=['updated_at', 'id'], condition=models.Q(is_deleted=False),
+                name='documents_live_updated_idx'
+            ),
+            models.Index(
+                fields=['workspace', 'updated_at', 'id'], condition=models.Q(is_deleted=False),
+                name='documents_live_ws_updated_idx'
+            ),
+            # Papelera (listado completo) y purga (deleted_at < límite)
+            models.Index(
+                fields=['deleted_at'], condition=models.Q(is_deleted=True),
+                name='documents_trash_deleted_idx'
+            ),
+        ]
 
     def __str__(self):
         if self.project:
@@ -251,17 +300,47 @@ class Document(models.Model):
         return self.version
 
     def create_version_snapshot(self, user=None, changes_description=''):
-        """Crea un snapshot de la versión actual en DocumentVersion."""
+        """
+        Crea un snapshot de la versión actual en DocumentVersion.
+
+        Se guarda completo cada DOCUMENT_VERSION_KEYFRAME_INTERVAL versiones;
+        en las intermedias solo se guarda un delta respecto al último keyframe.
+        """
         from .models import DocumentVersion
+        from .services.versioning import plan_snapshot
 
-        DocumentVersion.objects.create(
+        latest_keyframe = (
+            DocumentVersion.objects.filter(document=self, is_keyframe=True)
+            .only('id', 'is_keyframe', 'content', 'content_html')
+            .order_by('-id')
+            .first()
+        )
+        versions_since_keyframe = 0
+        if latest_keyframe:
+            versions_since_keyframe = DocumentVersion.objects.filter(
+                document=self, id__gt=latest_keyframe.id
+            ).count()
+
+        storage = plan_snapshot(latest_keyframe, versions_since_keyframe, self.content, self.content_html)
+
+        version = DocumentVersion.objects.create(
             document=self,
             version_number=self.version,
-            content=self.content,
-            content_html=self.content_html,
             changes_description=changes_description,
-            created_by=user
+            created_by=user,
+            **storage
         )
+        # El trigger ya incrementó la columna; se refleja en la instancia para la respuesta
+        self.version_count += 1
+
+        from apps.core.background import run_after_commit
+        from .services.diffing import precompute_consecutive_diff, precompute_enabled
+
+        if precompute_enabled():
+            # El diff con la versión anterior queda listo antes de que alguien lo pida
+            run_after_commit(precompute_consecutive_diff, version.id)
+
+        return version
 
     def soft_delete(self, user=None):
         """Marca el documento como eliminado (papelera)."""
@@ -280,8 +359,48 @@ class Document(models.Model):
         self.save()
 
 
+class DocumentVersionIterable(models.query.ModelIterable):
+    """Reconstruye el contenido de las versiones delta al iterar el queryset."""
+
+    def __iter__(self):
+        # Por lotes de chunk_size para que .iterator() mantenga la memoria acotada
+        batch = []
+        for version in super().__iter__():
+            batch.append(version)
+            if len(batch) >= self.chunk_size:
+                yield from self._prepare(batch)
+                batch = []
+        yield from self._prepare(batch)
+
+    def _prepare(self, versions):
+        from .services.rendering import fill_rendered_html
+        from .services.versioning import materialize_versions
+
+        materialize_versions(versions)
+        # Versiones anteriores al renderizado en servidor: servir el HTML cacheado
+        fill_rendered_html(
+            [v for v in versions if not {'content', 'content_html'} & v.get_deferred_fields()],
+            'content', 'content_html'
+        )
+        return versions
+
+
+class DocumentVersionQuerySet(models.QuerySet):
+    """QuerySet que devuelve siempre versiones con content/content_html completos."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._iterable_class = DocumentVersionIterable
+
+
 class DocumentVersion(models.Model):
-    """Version history for documents."""
+    """
+    Version history for documents.
+
+    Las versiones keyframe guardan content/content_html completos; el resto
+    guarda un delta comprimido respecto a su keyframe. El queryset reconstruye
+    el contenido de forma transparente.
+    """
 
     document = models.ForeignKey(
         Document,
@@ -289,8 +408,20 @@ class DocumentVersion(models.Model):
         related_name='versions'
     )
     version_number = models.CharField(max_length=20)
-    content = models.TextField()
+    content = models.TextField(blank=True)
     content_html = models.TextField(blank=True)
+    is_keyframe = models.BooleanField(
+        default=True,
+        help_text="Versión almacenada completa. Si es False, se reconstruye desde keyframe + delta."
+    )
+    keyframe = models.ForeignKey(
+        'self',
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name='deltas'
+    )
+    delta = models.BinaryField(null=True, blank=True, editable=False)
     changes_description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(
@@ -299,6 +430,8 @@ class DocumentVersion(models.Model):
         null=True
     )
 
+    objects = DocumentVersionQuerySet.as_manager()
+
     class Meta:
         db_table = 'document_versions'
         ordering = ['-created_at']
@@ -308,6 +441,56 @@ class DocumentVersion(models.Model):
         return f"{self.document.title} - v{self.version_number}"
 
 
+class DocumentVersionDiff(models.Model):
+    """Diff memoizado entre dos versiones; las versiones son inmutables."""
+
+    GRANULARITY_CHOICES = [
+        ('line', 'Por línea'),
+        ('word', 'Por palabra'),
+    ]
+
+    from_version = models.ForeignKey(
+        DocumentVersion,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    to_version = models.ForeignKey(
+        DocumentVersion,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES, default='line')
+    diff = models.JSONField(help_text="Diff unificado (line) o lista de segmentos (word)")
+    stats = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'document_version_diffs'
+        unique_together = ['from_version', 'to_version', 'granularity']
+
+    def __str__(self):
+        return f"{self.from_version_id} -> {self.to_version_id} ({self.granularity})"
+
+
+class RenderedMarkdown(models.Model):
+    """
+    Caché de renders Markdown -> HTML sanitizado, indexada por hash del contenido.
+
+    Compartida por documentos, versiones, ejemplos y salidas de IA: el mismo
+    texto se renderiza una sola vez.
+    """
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    html = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'rendered_markdown'
+
+    def __str__(self):
+        return self.content_hash
+
+
 class DocumentComment(models.Model):
     """Comments on documents."""
 
@@ -341,6 +524,72 @@ class DocumentComment(models.Model):
         return f"Comment on {self.document.title}"
 
 
+def attachment_blob_path(instance, filename):
+    """Ruta derivada del hash: blobs/ab/cd/abcd... (el nombre original no importa)."""
+    return f'blobs/{instance.sha256[:2]}/{instance.sha256[2:4]}/{instance.sha256}'
+
+
+class AttachmentBlob(models.Model):
+    """
+    Contenido de un adjunto, direccionado por su SHA-256.
+
+    Cada archivo se guarda una sola vez aunque se adjunte a muchos documentos;
+    ref_count cuenta los DocumentAttachment que lo usan y el archivo se borra
+    cuando llega a cero.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=attachment_blob_path, max_length=255)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'attachment_blobs'
+
+    def __str__(self):
+        return self.sha256
+
+
+class AttachmentText(models.Model):
+    """
+    Texto extraído del contenido de un blob (PDF, DOCX, Markdown).
+
+    Al colgar del blob, cada contenido se parsea una sola vez aunque esté
+    adjuntado a muchos documentos. search_vector lo mantiene un trigger en
+    PostgreSQL y permite encontrar documentos por el texto de sus adjuntos.
+    """
+
+    STATUS_CHOICES = [
+        ('DONE', 'Extraído'),
+        ('UNSUPPORTED', 'Formato no soportado'),
+        ('FAILED', 'Error'),
+    ]
+
+    blob = models.OneToOneField(
+        AttachmentBlob,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='extracted_text'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    kind = models.CharField(max_length=10, blank=True, help_text="pdf, docx o text")
+    text = models.TextField(blank=True)
+    truncated = models.BooleanField(default=False)
+    error = models.CharField(max_length=255, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'attachment_texts'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='attachment_texts_search_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.blob_id} ({self.status})"
+
+
 class DocumentAttachment(models.Model):
     """File attachments for documents."""
 
@@ -349,9 +598,17 @@ class DocumentAttachment(models.Model):
         on_delete=models.CASCADE,
         related_name='attachments'
     )
-    file = models.FileField(upload_to='document_attachments/')
+    file = models.FileField(upload_to='document_attachments/', max_length=255)
+    blob = models.ForeignKey(
+        AttachmentBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='attachments',
+        help_text="Contenido deduplicado; file apunta al mismo archivo"
+    )
     file_name = models.CharField(max_length=255)
-    file_size = models.IntegerField()
+    file_size = models.BigIntegerField()
     file_type = models.CharField(max_length=50)
     description = models.TextField(blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -369,6 +626,58 @@ class DocumentAttachment(models.Model):
         return self.file_name
 
 
+class AttachmentUpload(models.Model):
+    """
+    Subida de un adjunto por partes (reanudable).
+
+    El cliente declara tamaño y SHA-256 del archivo; los bytes recibidos se
+    acumulan en un archivo temporal y received_bytes indica desde dónde
+    continuar tras una interrupción.
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pendiente'),
+        ('COMPLETED', 'Completada'),
+        ('FAILED', 'Fallida'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.CASCADE,
+        related_name='attachment_uploads'
+    )
+    file_name = models.CharField(max_length=255)
+    file_size = models.BigIntegerField()
+    file_type = models.CharField(max_length=50, blank=True)
+    description = models.TextField(blank=True)
+    sha256 = models.CharField(max_length=64)
+    received_bytes = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    error = models.CharField(max_length=255, blank=True)
+    attachment = models.ForeignKey(
+        DocumentAttachment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'attachment_uploads'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.file_name} ({self.received_bytes}/{self.file_size})"
+
+
 class DocumentHistory(models.Model):
     """Audit trail for document changes."""
 
@@ -396,11 +705,18 @@ class DocumentHistory(models.Model):
         on_delete=models.SET_NULL,
         null=True
     )
-    performed_at = models.DateTimeField(auto_now_add=True)
+    performed_at = models.DateTimeField(default=timezone.now)
+    # Identificador del evento en el event log (las reinserciones se ignoran)
+    event_id = models.UUIDField(unique=True, null=True, editable=False)
 
     class Meta:
         db_table = 'document_history'
         ordering = ['-performed_at']
+        indexes = [
+            # Paginación por cursor (-performed_at, -id), global y por documento
+            models.Index(fields=['performed_at', 'id']),
+            models.Index(fields=['document', 'performed_at', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.document.title} - {self.action}"
@@ -436,3 +752,85 @@ class DocumentReference(models.Model):
 
     def __str__(self):
         return f"{self.document.title} references"
+
+
+class DocumentChange(models.Model):
+    """
+    Registro append-only de cambios para el feed incremental (/documents/changes/).
+
+    Lo escriben triggers de la base de datos al insertar, modificar o borrar
+    documentos, comentarios y adjuntos (ver services/changes.py). Guarda ids
+    sin claves foráneas para conservar el rastro de objetos ya purgados.
+    """
+
+    OBJECT_TYPE_CHOICES = [
+        ('document', 'Documento'),
+        ('comment', 'Comentario'),
+        ('attachment', 'Adjunto'),
+    ]
+
+    ACTION_CHOICES = [
+        ('created', 'Creado'),
+        ('updated', 'Modificado'),
+        ('deleted', 'Eliminado'),
+        ('restored', 'Restaurado'),
+        ('purged', 'Eliminado permanentemente'),
+    ]
+
+    # Transacción que escribió el cambio (PostgreSQL); el feed se ordena por (txid, id)
+    txid = models.BigIntegerField(default=0)
+    object_type = models.CharField(max_length=20, choices=OBJECT_TYPE_CHOICES)
+    object_id = models.BigIntegerField()
+    document_id = models.BigIntegerField()
+    workspace_id = models.BigIntegerField(null=True)
+    organization_id = models.BigIntegerField(null=True)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'document_changes'
+        ordering = ['txid', 'id']
+        indexes = [
+            # Lectura de la cola del feed, global y por organización
+            models.Index(fields=['txid', 'id']),
+            models.Index(fields=['organization_id', 'txid', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.object_type} {self.object_id} {self.action}"
+
+
+class DocumentLock(models.Model):
+    """
+    Bloqueo de edición con lease (ver services/locks.py).
+
+    Vive fuera de la fila del documento: tomarlo, renovarlo o soltarlo no
+    reescribe el documento. Un lease con expires_at vencido ya no bloquea,
+    aunque su fila siga existiendo hasta que otro usuario tome el bloqueo.
+    """
+
+    document = models.OneToOneField(
+        Document,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='lock'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='document_locks'
+    )
+    acquired_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'document_locks'
+
+    def __str__(self):
+        return f"{self.document_id} - {self.user_id} hasta {self.expires_at}"
+
+    @property
+    def is_active(self):
+        from django.utils import timezone
+
+        return self.expires_at > timezone.now()
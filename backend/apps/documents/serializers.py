@@ -1,12 +1,15 @@
 """Documents serializers."""
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import (
     WorkspaceType, Workspace, Document, DocumentVersion, DocumentComment,
-    DocumentAttachment, DocumentHistory, DocumentReference
+    DocumentAttachment, DocumentHistory, DocumentReference, AttachmentUpload, DocumentChange, DocumentLock
 )
+from .services.attachments import upload_chunk_size
+from .services.changes import encode_cursor
 
 
-class WorkspaceTypeSerializer(serializers.ModelSerializer):
+class WorkspaceTypeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for WorkspaceType model."""
 
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -23,16 +26,13 @@ class WorkspaceTypeSerializer(serializers.ModelSerializer):
         if obj.is_system:
             return False
         # Si tiene workspaces asociados, no puede eliminarse
-        if obj.workspaces.filter(is_active=True).exists():
-            return False
-        return True
+        return obj.active_workspace_count == 0
 
 
-class WorkspaceSerializer(serializers.ModelSerializer):
+class WorkspaceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Workspace model."""
 
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
-    document_count = serializers.SerializerMethodField()
     type_display = serializers.SerializerMethodField()
 
     # Campos dinámicos del WorkspaceType
@@ -43,10 +43,6 @@ class WorkspaceSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'organization']
 
-    def get_document_count(self, obj):
-        """Retorna el número total de documentos en el workspace."""
-        return obj.documents.filter(is_deleted=False).count()
-
     def get_type_display(self, obj):
         """Retorna el label del WorkspaceType si existe, sino usa get_type_display legacy."""
         if obj.workspace_type:
@@ -67,37 +63,82 @@ class WorkspaceSerializer(serializers.ModelSerializer):
         return None
 
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentLockSerializer(serializers.ModelSerializer):
+    user_name = serializers.CharField(source='user.get_full_name', read_only=True)
+
+    class Meta:
+        model = DocumentLock
+        fields = ['document', 'user', 'user_name', 'acquired_at', 'expires_at']
+
+
+class DocumentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     workspace_name = serializers.CharField(source='workspace.name', read_only=True, required=False, allow_null=True)
     project_code = serializers.CharField(source='project.code', read_only=True, required=False, allow_null=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True, required=False, allow_null=True)
     last_modified_by_name = serializers.CharField(source='last_modified_by.get_full_name', read_only=True, required=False, allow_null=True)
     deleted_by_name = serializers.CharField(source='deleted_by.get_full_name', read_only=True, required=False, allow_null=True)
-    version_count = serializers.SerializerMethodField()
+    lock = serializers.SerializerMethodField()
 
     class Meta:
         model = Document
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = [
             'created_at', 'updated_at', 'created_by', 'last_modified_by',
-            'is_deleted', 'deleted_at', 'deleted_by', 'version'
+            'is_deleted', 'deleted_at', 'deleted_by', 'version', 'content_html'
         ]
 
-    def get_version_count(self, obj):
-        """Retorna el número total de versiones del documento."""
-        return obj.versions.count()
+    def get_lock(self, obj):
+        """Bloqueo de edición vigente, o None si no hay o ya venció."""
+        try:
+            lock = obj.lock
+        except DocumentLock.DoesNotExist:
+            return None
+        return DocumentLockSerializer(lock).data if lock.is_active else None
+
+
+class DocumentListSerializer(DocumentSerializer):
+    """
+    Representación compacta para listados: sin content ni content_html.
+
+    Incluye un extracto corto del contenido (anotado en la consulta) para
+    previsualizaciones.
+    """
+
+    excerpt = serializers.CharField(read_only=True)
+
+    class Meta(DocumentSerializer.Meta):
+        exclude = ['search_vector', 'content', 'content_html']
+
+
+class DocumentSearchResultSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Resultado de búsqueda de texto completo: metadatos, relevancia y fragmentos resaltados."""
+
+    workspace_name = serializers.CharField(source='workspace.name', read_only=True, allow_null=True)
+    project_code = serializers.CharField(source='project.code', read_only=True, allow_null=True)
+    last_modified_by_name = serializers.CharField(source='last_modified_by.get_full_name', read_only=True, allow_null=True)
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Document
+        fields = [
+            'id', 'title', 'workspace', 'workspace_name', 'project', 'project_code',
+            'documentation_standard', 'status', 'version', 'is_favorite',
+            'last_modified_by', 'last_modified_by_name', 'updated_at', 'rank', 'headline'
+        ]
 
 
-class DocumentVersionSerializer(serializers.ModelSerializer):
+class DocumentVersionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
 
     class Meta:
         model = DocumentVersion
-        fields = '__all__'
+        # Los campos de almacenamiento (keyframe/delta) son internos: content siempre llega reconstruido
+        exclude = ['is_keyframe', 'keyframe', 'delta']
         read_only_fields = ['created_at']
 
 
-class DocumentCommentSerializer(serializers.ModelSerializer):
+class DocumentCommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
 
     class Meta:
@@ -106,16 +147,42 @@ class DocumentCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class DocumentAttachmentSerializer(serializers.ModelSerializer):
+class DocumentAttachmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
 
     class Meta:
         model = DocumentAttachment
         fields = '__all__'
-        read_only_fields = ['uploaded_at']
+        read_only_fields = ['uploaded_at', 'blob']
+
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    """Subida reanudable: el cliente declara tamaño y SHA-256; el resto lo lleva el servidor."""
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$')
+    file_size = serializers.IntegerField(min_value=1)
+    chunk_size = serializers.SerializerMethodField()
+    attachment = DocumentAttachmentSerializer(read_only=True)
+
+    class Meta:
+        model = AttachmentUpload
+        fields = [
+            'id', 'document', 'file_name', 'file_size', 'file_type', 'description', 'sha256',
+            'received_bytes', 'chunk_size', 'status', 'error', 'attachment', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['received_bytes', 'status', 'error', 'created_at', 'updated_at']
+
+    def get_chunk_size(self, obj):
+        return upload_chunk_size()
 
+    def validate_document(self, value):
+        user = self.context['request'].user
+        workspace = value.workspace
+        if user.organization and (workspace is None or workspace.organization_id != user.organization_id):
+            raise serializers.ValidationError('El documento no pertenece a tu organización')
+        return value
 
-class DocumentHistorySerializer(serializers.ModelSerializer):
+
+class DocumentHistorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     performed_by_name = serializers.CharField(source='performed_by.get_full_name', read_only=True)
 
     class Meta:
@@ -124,8 +191,43 @@ class DocumentHistorySerializer(serializers.ModelSerializer):
         read_only_fields = ['performed_at']
 
 
-class DocumentReferenceSerializer(serializers.ModelSerializer):
+class DocumentChangeSerializer(serializers.ModelSerializer):
+    """Entrada del feed de cambios; cursor permite reanudar justo después de ella."""
+    cursor = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DocumentChange
+        fields = ['cursor', 'object_type', 'object_id', 'document_id', 'workspace_id', 'action', 'changed_at']
+
+    def get_cursor(self, obj):
+        return encode_cursor(obj.txid, obj.id)
+
+
+class DocumentReferenceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = DocumentReference
         fields = '__all__'
         read_only_fields = ['created_at']
+
+
+class DocumentImportSerializer(serializers.Serializer):
+    """Entrada de la importación masiva: archivo NDJSON o ZIP de Markdown y destino por defecto."""
+    file = serializers.FileField()
+    workspace = serializers.IntegerField(required=False, allow_null=True)
+    project = serializers.IntegerField(required=False, allow_null=True)
+    batch_size = serializers.IntegerField(required=False, min_value=1, max_value=2000, default=500)
+    start_batch = serializers.IntegerField(
+        required=False, min_value=1, default=1,
+        help_text="Primer lote a procesar; permite reanudar una importación interrumpida"
+    )
+
+
+class DocumentImportRowSerializer(serializers.Serializer):
+    """Validación de una fila importada (las referencias se comprueban por lote)."""
+    title = serializers.CharField(max_length=255)
+    content = serializers.CharField(required=False, allow_blank=True, default='', trim_whitespace=False)
+    status = serializers.ChoiceField(choices=Document.STATUS_CHOICES, required=False, default='EN_REVISION')
+    version = serializers.RegexField(r'^\d+\.\d+$', max_length=20, required=False, default='1.000')
+    workspace = serializers.IntegerField(required=False, allow_null=True)
+    project = serializers.IntegerField(required=False, allow_null=True)
+    documentation_standard = serializers.IntegerField(required=False, allow_null=True)
@@ -0,0 +1,5 @@
+"""Documents services."""
+from .rendering import get_rendered_html, render_many, render_markdown
+from .versioning import materialize_versions, plan_snapshot
+
+__all__ = ['get_rendered_html', 'materialize_versions', 'plan_snapshot', 'render_many', 'render_markdown']
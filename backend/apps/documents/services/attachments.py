@@ -0,0 +1,339 @@
+"""
+Adjuntos direccionados por contenido y subidas reanudables por partes.
+
+Cada archivo se guarda una sola vez como AttachmentBlob, identificado por su
+SHA-256; los DocumentAttachment apuntan al blob y su ref_count decide cuándo
+se puede borrar el archivo del storage.
+
+Flujo de subida reanudable:
+    1. start_upload(): el cliente declara nombre, tamaño y SHA-256. Si el
+       contenido ya existe en la organización el adjunto se crea al instante.
+    2. write_chunk(): las partes se escriben en un archivo temporal en orden;
+       received_bytes indica desde dónde continuar tras una interrupción.
+    3. complete_upload(): se verifica el hash, se guarda el blob (o se reutiliza)
+       y se crea el adjunto.
+"""
+
+import hashlib
+import os
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .extraction import schedule_extraction
+
+# Tamaño de lectura al calcular hashes
+HASH_READ_SIZE = 1024 * 1024
+
+
+class UploadOffsetError(ValueError):
+    """La parte no empieza donde terminó la anterior; el cliente debe reanudar desde expected."""
+
+    def __init__(self, expected: int):
+        super().__init__(f'Se esperaba la parte desde el byte {expected}')
+        self.expected = expected
+
+
+def upload_chunk_size() -> int:
+    return getattr(settings, 'ATTACHMENT_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+
+
+def _storage():
+    from apps.documents.models import AttachmentBlob
+
+    return AttachmentBlob._meta.get_field('file').storage
+
+
+def hash_file(fileobj) -> Tuple[str, int]:
+    """(sha256 hexadecimal, tamaño en bytes) leyendo el archivo por bloques."""
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    for block in iter(lambda: fileobj.read(HASH_READ_SIZE), b''):
+        digest.update(block)
+        size += len(block)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+def find_blob(sha256: str, size: int, organization=None):
+    """
+    Blob con ese contenido ya adjuntado en la organización (o None).
+
+    La deduplicación sin subir el archivo se limita a contenido que la
+    organización ya tiene, para que conocer un hash no dé acceso a archivos ajenos.
+    """
+    from apps.documents.models import AttachmentBlob
+
+    blobs = AttachmentBlob.objects.filter(sha256=sha256, size=size, ref_count__gt=0)
+    if organization is not None:
+        blobs = blobs.filter(attachments__document__workspace__organization=organization)
+    return blobs.first()
+
+
+def store_blob(fileobj, sha256: Optional[str] = None, size: Optional[int] = None):
+    """Retorna el AttachmentBlob del contenido de fileobj, guardando el archivo solo si es nuevo."""
+    from apps.documents.models import AttachmentBlob, attachment_blob_path
+
+    if sha256 is None or size is None:
+        sha256, size = hash_file(fileobj)
+
+    blob = AttachmentBlob.objects.filter(sha256=sha256).first()
+    if blob is not None:
+        return blob
+
+    storage = _storage()
+    blob = AttachmentBlob(sha256=sha256, size=size)
+    name = attachment_blob_path(blob, None)
+    if storage.exists(name) and storage.size(name) == size:
+        # Archivo de un intento anterior que no llegó a registrarse: mismo contenido por construcción
+        blob.file.name = name
+    else:
+        if storage.exists(name):
+            storage.delete(name)
+        fileobj.seek(0)
+        blob.file.save(name, File(fileobj), save=False)
+
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # Otra petición registró el mismo contenido a la vez
+        if blob.file.name != name:
+            storage.delete(blob.file.name)
+        return AttachmentBlob.objects.get(sha256=sha256)
+    return blob
+
+
+def add_attachment(document, blob, user, file_name: str, file_type: str = '', description: str = ''):
+    """
+    Crea un DocumentAttachment que referencia blob e incrementa su ref_count.
+
+    Tras el commit se extrae el texto del blob si aún no se hizo.
+    """
+    from apps.documents.models import AttachmentBlob, DocumentAttachment
+
+    with transaction.atomic():
+        acquired = AttachmentBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        if not acquired:
+            raise ValueError('El contenido del archivo ya no existe; vuelve a subirlo')
+        schedule_extraction(blob)
+        return DocumentAttachment.objects.create(
+            document=document,
+            blob=blob,
+            file=blob.file.name,
+            file_name=file_name,
+            file_size=blob.size,
+            file_type=file_type,
+            description=description,
+            uploaded_by=user,
+        )
+
+
+def _delete_blob_files(blobs) -> int:
+    from apps.documents.models import AttachmentBlob
+
+    storage = _storage()
+    deleted = 0
+    for sha256, name in blobs:
+        # Si el mismo contenido se volvió a registrar entretanto, el archivo sigue en uso
+        if AttachmentBlob.objects.filter(sha256=sha256).exists():
+            continue
+        try:
+            storage.delete(name)
+            deleted += 1
+        except OSError:
+            continue
+    return deleted
+
+
+def release_blobs(counts: Dict[int, int]) -> int:
+    """
+    Descuenta referencias ({blob_id: n}) y borra los blobs que quedan sin uso.
+
+    Los archivos se eliminan del storage tras el commit. Retorna cuántos blobs se liberaron.
+    """
+    from apps.documents.models import AttachmentBlob
+
+    counts = {blob_id: n for blob_id, n in counts.items() if blob_id and n}
+    if not counts:
+        return 0
+
+    by_amount = {}
+    for blob_id, n in counts.items():
+        by_amount.setdefault(n, []).append(blob_id)
+
+    with transaction.atomic():
+        for n, blob_ids in by_amount.items():
+            AttachmentBlob.objects.filter(pk__in=blob_ids).update(
+                ref_count=Greatest(F('ref_count') - n, 0)
+            )
+        orphans = list(
+            AttachmentBlob.objects.select_for_update()
+            .filter(pk__in=list(counts), ref_count=0)
+            .values_list('pk', 'sha256', 'file')
+        )
+        if orphans:
+            AttachmentBlob.objects.filter(pk__in=[pk for pk, _, _ in orphans]).delete()
+            files = [(sha256, name) for _, sha256, name in orphans]
+            transaction.on_commit(lambda: _delete_blob_files(files))
+    return len(orphans)
+
+
+def delete_attachment(attachment) -> None:
+    """Borra un adjunto y libera su blob (o su archivo, si es anterior a la deduplicación)."""
+    from .purge import delete_attachment_files
+
+    with transaction.atomic():
+        blob_id = attachment.blob_id
+        name = attachment.file.name
+        attachment.delete()
+        if blob_id:
+            release_blobs({blob_id: 1})
+        elif name:
+            transaction.on_commit(lambda: delete_attachment_files([name]))
+
+
+def adopt_legacy_attachment(attachment) -> bool:
+    """
+    Pasa un adjunto anterior a la deduplicación a su blob y borra la copia propia.
+
+    Retorna False si el archivo no existe en el storage.
+    """
+    from apps.documents.models import AttachmentBlob, DocumentAttachment
+    from .purge import delete_attachment_files
+
+    old_name = attachment.file.name
+    storage = DocumentAttachment._meta.get_field('file').storage
+    if not old_name or not storage.exists(old_name):
+        return False
+
+    with storage.open(old_name, 'rb') as fh:
+        blob = store_blob(fh)
+
+    with transaction.atomic():
+        AttachmentBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        DocumentAttachment.objects.filter(pk=attachment.pk).update(
+            blob=blob, file=blob.file.name, file_size=blob.size
+        )
+        if old_name != blob.file.name:
+            transaction.on_commit(lambda: delete_attachment_files([old_name]))
+        schedule_extraction(blob)
+    return True
+
+
+def upload_temp_path(upload) -> str:
+    temp_dir = getattr(settings, 'ATTACHMENT_UPLOAD_TEMP_DIR', os.path.join(settings.MEDIA_ROOT, 'uploads_tmp'))
+    return os.path.join(temp_dir, f'{upload.pk}.part')
+
+
+def _remove_temp(upload) -> None:
+    try:
+        os.remove(upload_temp_path(upload))
+    except FileNotFoundError:
+        pass
+
+
+def start_upload(document, user, file_name: str, file_size: int, sha256: str,
+                 file_type: str = '', description: str = ''):
+    """
+    Registra una subida. Si el contenido ya existe, la subida nace completada
+    con su adjunto; si no, queda pendiente de recibir las partes.
+    """
+    from apps.documents.models import AttachmentUpload
+
+    upload = AttachmentUpload(
+        document=document,
+        file_name=file_name,
+        file_size=file_size,
+        file_type=file_type,
+        description=description,
+        sha256=sha256.lower(),
+        created_by=user,
+    )
+    with transaction.atomic():
+        blob = find_blob(upload.sha256, file_size, user.organization)
+        if blob is not None:
+            upload.attachment = add_attachment(document, blob, user, file_name, file_type, description)
+            upload.received_bytes = file_size
+            upload.status = 'COMPLETED'
+        upload.save()
+    return upload
+
+
+def write_chunk(upload, offset: int, data: bytes):
+    """
+    Escribe una parte a partir de offset y retorna la subida actualizada.
+
+    Reenviar una parte ya recibida no tiene efecto; una parte que deja un
+    hueco lanza UploadOffsetError con el offset esperado.
+    """
+    from apps.documents.models import AttachmentUpload
+
+    with transaction.atomic():
+        upload = AttachmentUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status != 'PENDING':
+            raise ValueError('La subida ya no admite partes')
+        if offset < 0 or offset > upload.received_bytes:
+            raise UploadOffsetError(upload.received_bytes)
+        end = offset + len(data)
+        if end > upload.file_size:
+            raise ValueError('La parte excede el tamaño declarado del archivo')
+        if end <= upload.received_bytes:
+            return upload
+
+        path = upload_temp_path(upload)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'r+b') as fh:
+            # received_bytes es la fuente de verdad: descarta bytes de un intento sin confirmar
+            fh.seek(upload.received_bytes)
+            fh.write(data[upload.received_bytes - offset:])
+            fh.truncate()
+
+        upload.received_bytes = end
+        upload.save(update_fields=['received_bytes', 'updated_at'])
+    return upload
+
+
+def complete_upload(upload):
+    """
+    Verifica el archivo recibido y crea el adjunto.
+
+    Si el hash no coincide la subida queda FAILED con el motivo en error.
+    Completar dos veces retorna la misma subida.
+    """
+    from apps.documents.models import AttachmentUpload
+
+    with transaction.atomic():
+        upload = AttachmentUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status != 'PENDING':
+            return upload
+        if upload.received_bytes != upload.file_size:
+            raise ValueError(f'Faltan bytes: recibidos {upload.received_bytes} de {upload.file_size}')
+
+        with open(upload_temp_path(upload), 'rb') as fh:
+            sha256, size = hash_file(fh)
+            if sha256 != upload.sha256 or size != upload.file_size:
+                upload.status = 'FAILED'
+                upload.error = 'El SHA-256 del archivo recibido no coincide con el declarado'
+            else:
+                blob = store_blob(fh, sha256, size)
+                upload.attachment = add_attachment(
+                    upload.document, blob, upload.created_by,
+                    upload.file_name, upload.file_type, upload.description
+                )
+                upload.status = 'COMPLETED'
+        upload.save()
+        transaction.on_commit(lambda: _remove_temp(upload))
+    return upload
+
+
+def abort_upload(upload) -> None:
+    """Descarta una subida y su archivo temporal."""
+    _remove_temp(upload)
+    upload.delete()
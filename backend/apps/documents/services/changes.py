@@ -0,0 +1,183 @@
+"""
+Feed incremental de cambios: qué documentos, comentarios y adjuntos cambiaron
+desde la última visita del cliente.
+
+Triggers de la base de datos (PostgreSQL o SQLite) añaden una fila a
+DocumentChange en cada INSERT, UPDATE o DELETE de las tablas del feed, por lo
+que también quedan registrados bulk_create, QuerySet.update() y las purgas por
+lotes.
+
+Orden y cursor:
+    Los ids se asignan al insertar, no al confirmar: una transacción lenta
+    puede confirmar un id menor que otro ya leído. Por eso cada fila guarda
+    el id de su transacción (txid) y el feed solo entrega filas de
+    transacciones anteriores al xmin del snapshot actual, es decir, ya
+    terminadas. Cualquier fila que aparezca después tendrá un txid mayor,
+    así que el cursor (txid, id) nunca salta cambios. En SQLite las
+    escrituras son serializadas: txid es 0 y el orden es el del id.
+"""
+
+from typing import List, Tuple
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Cursor inicial: antes de cualquier cambio
+START_CURSOR = (0, 0)
+
+
+def _ne(vendor: str) -> str:
+    return 'IS DISTINCT FROM' if vendor == 'postgresql' else 'IS NOT'
+
+
+def _insert(vendor: str, table_spec: dict, row: str, action: str) -> str:
+    """INSERT en document_changes para la fila row (NEW u OLD)."""
+    workspace = table_spec['workspace'].format(row=row)
+    if vendor == 'postgresql':
+        txid, now = 'txid_current()', 'now()'
+    else:
+        txid, now = '0', "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+    return (
+        'INSERT INTO document_changes '
+        '(txid, object_type, object_id, document_id, workspace_id, organization_id, action, changed_at) '
+        f"VALUES ({txid}, '{table_spec['object_type']}', {row}.id, {table_spec['document'].format(row=row)}, "
+        f'{workspace}, (SELECT organization_id FROM workspaces WHERE id = {workspace}), {action}, {now});'
+    )
+
+
+def _update_parts(vendor: str, table_spec: dict) -> Tuple[str, str]:
+    """(condición para registrar un UPDATE, expresión de su acción)."""
+    ne = _ne(vendor)
+    conditions = []
+    action = "'updated'"
+    if table_spec.get('soft_delete'):
+        conditions.append(f'OLD.is_deleted {ne} NEW.is_deleted')
+        action = (
+            f"CASE WHEN OLD.is_deleted {ne} NEW.is_deleted THEN "
+            f"CASE WHEN NEW.is_deleted THEN 'deleted' ELSE 'restored' END ELSE 'updated' END"
+        )
+    if table_spec.get('modified'):
+        # Solo los guardados reales (auto_now): no los contadores ni el search_vector
+        conditions.append(f"OLD.{table_spec['modified']} {ne} NEW.{table_spec['modified']}")
+    return ' OR '.join(conditions) or ('TRUE' if vendor == 'postgresql' else '1'), action
+
+
+def change_trigger_sql(vendor: str, table: str, table_spec: dict) -> List[str]:
+    """
+    Sentencias que crean los triggers del feed para table.
+
+    table_spec:
+        object_type: valor de DocumentChange.object_type
+        document / workspace: expresiones con {row} (NEW u OLD) que dan el documento y el workspace
+        modified: columna auto_now cuyo cambio indica una modificación (None: cualquier UPDATE)
+        soft_delete: True si la tabla tiene is_deleted (acciones deleted / restored)
+        delete_action: acción de un DELETE físico
+    """
+    name = f'{table}_change_feed'
+    update_when, update_action = _update_parts(vendor, table_spec)
+    delete_action = f"'{table_spec.get('delete_action', 'deleted')}'"
+
+    if vendor == 'postgresql':
+        return [
+            f"""
+CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_insert(vendor, table_spec, 'NEW', "'created'")}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_insert(vendor, table_spec, 'OLD', delete_action)}
+    ELSIF {update_when} THEN
+        {_insert(vendor, table_spec, 'NEW', update_action)}
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+            f'DROP TRIGGER IF EXISTS {name}_trigger ON {table}',
+            f"""
+CREATE TRIGGER {name}_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON {table}
+    FOR EACH ROW EXECUTE FUNCTION {name}()""",
+        ]
+
+    # SQLite: un trigger por operación
+    return [
+        f'DROP TRIGGER IF EXISTS {name}_insert',
+        f"""
+CREATE TRIGGER {name}_insert AFTER INSERT ON {table}
+BEGIN
+    {_insert(vendor, table_spec, 'NEW', "'created'")}
+END""",
+        f'DROP TRIGGER IF EXISTS {name}_update',
+        f"""
+CREATE TRIGGER {name}_update AFTER UPDATE ON {table}
+FOR EACH ROW WHEN {update_when}
+BEGIN
+    {_insert(vendor, table_spec, 'NEW', update_action)}
+END""",
+        f'DROP TRIGGER IF EXISTS {name}_delete',
+        f"""
+CREATE TRIGGER {name}_delete AFTER DELETE ON {table}
+BEGIN
+    {_insert(vendor, table_spec, 'OLD', delete_action)}
+END""",
+    ]
+
+
+def drop_change_trigger_sql(vendor: str, table: str) -> List[str]:
+    name = f'{table}_change_feed'
+    if vendor == 'postgresql':
+        return [
+            f'DROP TRIGGER IF EXISTS {name}_trigger ON {table}',
+            f'DROP FUNCTION IF EXISTS {name}()',
+        ]
+    return [f'DROP TRIGGER IF EXISTS {name}_{suffix}' for suffix in ('insert', 'update', 'delete')]
+
+
+def encode_cursor(txid: int, change_id: int) -> str:
+    return f'{txid}.{change_id}'
+
+
+def decode_cursor(token: str) -> Tuple[int, int]:
+    """(txid, id) del token; ValueError si no es válido."""
+    txid, change_id = token.split('.')
+    txid, change_id = int(txid), int(change_id)
+    if txid < 0 or change_id < 0:
+        raise ValueError(token)
+    return txid, change_id
+
+
+def _finished(queryset):
+    """Solo filas de transacciones ya terminadas (ver docstring del módulo)."""
+    if connection.vendor != 'postgresql':
+        return queryset
+    return queryset.filter(txid__lt=RawSQL('txid_snapshot_xmin(txid_current_snapshot())', []))
+
+
+def head_cursor() -> str:
+    """Cursor del último cambio visible: para empezar a seguir el feed desde ahora."""
+    from apps.documents.models import DocumentChange
+
+    last = _finished(DocumentChange.objects.all()).order_by('-txid', '-id').values_list('txid', 'id').first()
+    return encode_cursor(*(last or START_CURSOR))
+
+
+def changes_since(cursor: Tuple[int, int], organization=None, limit: int = 100):
+    """
+    Retorna (cambios, siguiente cursor, has_more) a partir de cursor.
+
+    Con organization solo se incluyen cambios de sus workspaces. Si no hay
+    cambios nuevos el siguiente cursor es el mismo recibido.
+    """
+    from apps.documents.models import DocumentChange
+
+    txid, change_id = cursor
+    queryset = DocumentChange.objects.filter(Q(txid__gt=txid) | Q(txid=txid, id__gt=change_id))
+    if organization is not None:
+        queryset = queryset.filter(organization_id=organization.pk)
+
+    changes = list(_finished(queryset).order_by('txid', 'id')[:limit + 1])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    next_cursor = (changes[-1].txid, changes[-1].id) if changes else cursor
+    return changes, encode_cursor(*next_cursor), has_more
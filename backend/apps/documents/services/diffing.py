@@ -0,0 +1,157 @@
+"""
+Diff entre versiones de un documento, memoizado por par de versiones.
+
+Las versiones son inmutables, así que el diff de (from, to, granularidad)
+se calcula una sola vez y se guarda en DocumentVersionDiff. Los diffs entre
+versiones consecutivas se precalculan en segundo plano al crear cada versión.
+
+Granularidades:
+    - line: diff unificado (texto) por líneas
+    - word: lista de segmentos {'op': 'equal'|'insert'|'delete', 'text': ...}
+"""
+
+import difflib
+import re
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+
+DIFF_GRANULARITIES = ('line', 'word')
+
+# Líneas de contexto alrededor de cada cambio en el diff unificado
+DIFF_CONTEXT_LINES = 3
+
+_WORD_TOKENS = re.compile(r'\s+|\w+|[^\w\s]', re.UNICODE)
+
+
+def _stats(additions: int, deletions: int, unchanged: int) -> Dict:
+    total = additions + deletions + 2 * unchanged
+    return {
+        'additions': additions,
+        'deletions': deletions,
+        'unchanged': unchanged,
+        'similarity': round(2 * unchanged / total, 4) if total else 1.0,
+    }
+
+
+def line_diff(old: str, new: str, from_label: str = 'from', to_label: str = 'to') -> Tuple[str, Dict]:
+    """Diff unificado por líneas y estadísticas de líneas añadidas/eliminadas."""
+    old_lines = (old or '').splitlines(keepends=True)
+    new_lines = (new or '').splitlines(keepends=True)
+
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    additions = deletions = unchanged = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            unchanged += i2 - i1
+        else:
+            deletions += i2 - i1
+            additions += j2 - j1
+
+    diff = ''.join(
+        line if line.endswith('\n') else line + '\n'
+        for line in difflib.unified_diff(
+            old_lines, new_lines, fromfile=from_label, tofile=to_label, n=DIFF_CONTEXT_LINES
+        )
+    )
+    return diff, _stats(additions, deletions, unchanged)
+
+
+def word_diff(old: str, new: str) -> Tuple[List[Dict], Dict]:
+    """Segmentos de diff por palabras (los espacios se conservan) y estadísticas de palabras."""
+    old_tokens = _WORD_TOKENS.findall(old or '')
+    new_tokens = _WORD_TOKENS.findall(new or '')
+
+    def words(tokens):
+        return sum(1 for token in tokens if not token.isspace())
+
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    segments = []
+    additions = deletions = unchanged = 0
+
+    def append(op, tokens):
+        if not tokens:
+            return
+        text = ''.join(tokens)
+        if segments and segments[-1]['op'] == op:
+            segments[-1]['text'] += text
+        else:
+            segments.append({'op': op, 'text': text})
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            unchanged += words(old_tokens[i1:i2])
+            append('equal', old_tokens[i1:i2])
+        else:
+            deletions += words(old_tokens[i1:i2])
+            additions += words(new_tokens[j1:j2])
+            append('delete', old_tokens[i1:i2])
+            append('insert', new_tokens[j1:j2])
+
+    return segments, _stats(additions, deletions, unchanged)
+
+
+def compute_diff(from_version, to_version, granularity: str = 'line') -> Dict:
+    """Calcula el diff entre dos versiones ya materializadas."""
+    if granularity == 'word':
+        diff, stats = word_diff(from_version.content, to_version.content)
+    else:
+        diff, stats = line_diff(
+            from_version.content, to_version.content,
+            f'v{from_version.version_number}', f'v{to_version.version_number}'
+        )
+    return {'diff': diff, 'stats': stats}
+
+
+def get_version_diff(from_version_id: int, to_version_id: int, granularity: str = 'line'):
+    """
+    Retorna (DocumentVersionDiff, cached) para el par de versiones.
+
+    Si no está memoizado, carga ambas versiones (reconstruyendo los deltas),
+    lo calcula y lo guarda.
+    """
+    from apps.documents.models import DocumentVersion, DocumentVersionDiff
+
+    memo = DocumentVersionDiff.objects.filter(
+        from_version_id=from_version_id, to_version_id=to_version_id, granularity=granularity
+    ).first()
+    if memo is not None:
+        return memo, True
+
+    versions = DocumentVersion.objects.filter(pk__in=[from_version_id, to_version_id]).in_bulk()
+    result = compute_diff(versions[from_version_id], versions[to_version_id], granularity)
+    memo, _ = DocumentVersionDiff.objects.get_or_create(
+        from_version_id=from_version_id,
+        to_version_id=to_version_id,
+        granularity=granularity,
+        defaults=result,
+    )
+    return memo, False
+
+
+def previous_version_id(version):
+    """Id de la versión inmediatamente anterior del mismo documento (o None)."""
+    from apps.documents.models import DocumentVersion
+
+    return (
+        DocumentVersion.objects.filter(document_id=version.document_id, id__lt=version.id)
+        .order_by('-id')
+        .values_list('id', flat=True)
+        .first()
+    )
+
+
+def precompute_consecutive_diff(version_id: int) -> None:
+    """Tarea en segundo plano: memoiza el diff por líneas respecto a la versión anterior."""
+    from apps.documents.models import DocumentVersion
+
+    version = DocumentVersion.objects.filter(pk=version_id).only('id', 'document_id').first()
+    if version is None:
+        return
+    previous_id = previous_version_id(version)
+    if previous_id is not None:
+        get_version_diff(previous_id, version.id, 'line')
+
+
+def precompute_enabled() -> bool:
+    return getattr(settings, 'DOCUMENT_DIFF_PRECOMPUTE', True)
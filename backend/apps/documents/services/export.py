@@ -0,0 +1,177 @@
+"""
+Exportación masiva de documentos en streaming.
+
+Los documentos se leen con QuerySet.iterator() (cursor del lado del servidor
+en PostgreSQL) y se emiten a medida que llegan, de modo que la memoria se
+mantiene constante sin importar el tamaño del workspace o proyecto.
+
+Formatos:
+    - zip:    un archivo Markdown por documento (contenido actual con cabecera)
+    - ndjson: una línea JSON por documento, con todas sus versiones
+"""
+
+import io
+import json
+import zipfile
+from typing import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+
+EXPORT_FORMATS = ('zip', 'ndjson')
+
+# Filas por viaje al cursor del servidor
+EXPORT_CHUNK_SIZE = 200
+
+
+def export_documents_queryset(queryset):
+    """Documentos no eliminados en orden de id, con las relaciones que se exportan."""
+    return (
+        queryset.filter(is_deleted=False)
+        .select_related('workspace', 'project', 'documentation_standard', 'created_by', 'last_modified_by')
+        .defer('search_vector')
+        .order_by('id')
+    )
+
+
+def _user_email(user):
+    return user.email if user else None
+
+
+def _document_payload(document):
+    return {
+        'id': document.id,
+        'title': document.title,
+        'status': document.status,
+        'version': document.version,
+        'workspace': document.workspace_id,
+        'workspace_name': document.workspace.name if document.workspace else None,
+        'project': document.project_id,
+        'project_code': document.project.code if document.project else None,
+        'documentation_standard': document.documentation_standard_id,
+        'content': document.content,
+        'content_html': document.content_html,
+        'created_at': document.created_at,
+        'updated_at': document.updated_at,
+        'created_by': _user_email(document.created_by),
+        'last_modified_by': _user_email(document.last_modified_by),
+    }
+
+
+def _version_payload(version):
+    return {
+        'id': version.id,
+        'version_number': version.version_number,
+        'content': version.content,
+        'content_html': version.content_html,
+        'changes_description': version.changes_description,
+        'created_at': version.created_at,
+        'created_by': _user_email(version.created_by),
+    }
+
+
+def iter_ndjson(queryset) -> Iterator[bytes]:
+    """
+    Una línea JSON por documento con sus versiones en orden cronológico.
+
+    Documentos y versiones se recorren con dos cursores ordenados por
+    documento y se combinan (merge join): dos consultas en total.
+    """
+    from apps.documents.models import DocumentVersion
+
+    documents = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    versions = (
+        DocumentVersion.objects.filter(document__in=queryset.values('pk'))
+        .select_related('created_by')
+        .order_by('document_id', 'created_at', 'id')
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    pending = next(versions, None)
+
+    for document in documents:
+        payload = _document_payload(document)
+        payload['versions'] = []
+        while pending is not None and pending.document_id <= document.id:
+            if pending.document_id == document.id:
+                payload['versions'].append(_version_payload(pending))
+            pending = next(versions, None)
+        yield (json.dumps(payload, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class _StreamSink(io.RawIOBase):
+    """Destino no posicionable para ZipFile: acumula bytes hasta que se vacían."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _markdown_file(document) -> str:
+    """Contenido del documento con una cabecera de metadatos (front matter)."""
+    header = [
+        '---',
+        f'title: {json.dumps(document.title, ensure_ascii=False)}',
+        f'id: {document.id}',
+        f'status: {document.status}',
+        f'version: "{document.version}"',
+        f'updated_at: {document.updated_at.isoformat()}',
+        '---',
+        '',
+    ]
+    return '\n'.join(header) + (document.content or '') + '\n'
+
+
+def _markdown_path(document) -> str:
+    folder = document.project.code if document.project else (
+        slugify(document.workspace.name) if document.workspace else 'sin-ubicacion'
+    )
+    name = slugify(document.title)[:80] or 'documento'
+    return f'{folder}/{name}-{document.id}.md'
+
+
+def iter_zip(queryset) -> Iterator[bytes]:
+    """ZIP con un archivo .md por documento, emitido a medida que se comprime."""
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for document in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            info = zipfile.ZipInfo(
+                _markdown_path(document),
+                date_time=timezone.localtime(document.updated_at).timetuple()[:6]
+            )
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(info, mode='w') as entry:
+                entry.write(_markdown_file(document).encode('utf-8'))
+            yield sink.drain()
+    # Directorio central del ZIP
+    yield sink.drain()
+
+
+def export_response(queryset, export_format, basename) -> StreamingHttpResponse:
+    """StreamingHttpResponse con la exportación en el formato pedido."""
+    queryset = export_documents_queryset(queryset)
+    filename = f'{slugify(basename) or "export"}-{timezone.now():%Y%m%d}'
+
+    if export_format == 'ndjson':
+        response = StreamingHttpResponse(iter_ndjson(queryset), content_type='application/x-ndjson')
+        filename += '.ndjson'
+    else:
+        response = StreamingHttpResponse(iter_zip(queryset), content_type='application/zip')
+        filename += '.zip'
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Evitar que proxies (nginx) acumulen la respuesta completa antes de enviarla
+    response['X-Accel-Buffering'] = 'no'
+    return response
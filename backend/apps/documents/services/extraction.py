@@ -0,0 +1,137 @@
+"""
+Extracción de texto de adjuntos para la búsqueda.
+
+El texto se extrae una vez por contenido (AttachmentBlob) en segundo plano:
+la tarea corre en el pool de hilos y el parseo, intensivo en CPU, en el pool
+de procesos. El resultado se guarda en AttachmentText, cuyo search_vector
+consulta la búsqueda de documentos.
+
+Formatos soportados:
+    - pdf: PyPDF2
+    - docx: python-docx (párrafos y tablas)
+    - text: Markdown y texto plano (UTF-8)
+"""
+
+import io
+import zipfile
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+from apps.core.background import run_after_commit, run_cpu_bound
+
+TEXT_EXTENSIONS = ('.md', '.markdown', '.txt')
+
+# Bytes leídos para detectar el formato
+SNIFF_SIZE = 8
+
+
+def extraction_enabled() -> bool:
+    return getattr(settings, 'ATTACHMENT_TEXT_EXTRACTION', True)
+
+
+def max_chars() -> int:
+    return getattr(settings, 'ATTACHMENT_TEXT_MAX_CHARS', 200000)
+
+
+def detect_kind(head: bytes, data: bytes, file_name: str = '') -> Optional[str]:
+    """'pdf', 'docx', 'text' o None según la firma del contenido y la extensión."""
+    if head.startswith(b'%PDF-'):
+        return 'pdf'
+    if head.startswith(b'PK'):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if 'word/document.xml' in archive.namelist():
+                    return 'docx'
+        except zipfile.BadZipFile:
+            return None
+        return None
+    if file_name.lower().endswith(TEXT_EXTENSIONS):
+        return 'text'
+    return None
+
+
+def _extract_pdf(data: bytes) -> str:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return '\n\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _extract_docx(data: bytes) -> str:
+    import docx
+
+    document = docx.Document(io.BytesIO(data))
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            parts.append(' | '.join(cell.text for cell in row.cells))
+    return '\n'.join(parts)
+
+
+def _extract_text(data: bytes) -> str:
+    return data.decode('utf-8')
+
+
+EXTRACTORS = {
+    'pdf': _extract_pdf,
+    'docx': _extract_docx,
+    'text': _extract_text,
+}
+
+
+def extract_text(kind: str, data: bytes) -> str:
+    """Función pura (sin base de datos) que se ejecuta en el pool de procesos."""
+    # PostgreSQL no admite el carácter NUL en columnas de texto
+    return EXTRACTORS[kind](data).replace('\x00', '')
+
+
+def _limit(text: str) -> Tuple[str, bool]:
+    limit = max_chars()
+    if len(text) > limit:
+        return text[:limit], True
+    return text, False
+
+
+def extract_blob_text(blob_id: int, force: bool = False):
+    """
+    Extrae y guarda el texto del blob (tarea en segundo plano).
+
+    Si ya hay un resultado no se vuelve a parsear, salvo force=True o un
+    intento anterior fallido.
+    """
+    from apps.documents.models import AttachmentBlob, AttachmentText
+
+    existing = AttachmentText.objects.filter(blob_id=blob_id).values_list('status', flat=True).first()
+    if existing and existing != 'FAILED' and not force:
+        return None
+
+    blob = AttachmentBlob.objects.filter(pk=blob_id).first()
+    if blob is None:
+        return None
+    # El nombre del archivo solo se usa para reconocer Markdown / texto plano
+    file_name = blob.attachments.values_list('file_name', flat=True).first() or ''
+
+    values = {'kind': '', 'text': '', 'truncated': False, 'error': ''}
+    try:
+        with blob.file.open('rb') as fh:
+            data = fh.read()
+        kind = detect_kind(data[:SNIFF_SIZE], data, file_name)
+        if kind is None:
+            values['status'] = 'UNSUPPORTED'
+        else:
+            values['kind'] = kind
+            values['text'], values['truncated'] = _limit(run_cpu_bound(extract_text, kind, data))
+            values['status'] = 'DONE'
+    except Exception as exc:
+        values['status'] = 'FAILED'
+        values['error'] = f'{type(exc).__name__}: {exc}'[:255]
+
+    result, _ = AttachmentText.objects.update_or_create(blob_id=blob_id, defaults=values)
+    return result
+
+
+def schedule_extraction(blob) -> None:
+    """Programa la extracción del blob cuando se confirme la transacción actual."""
+    if extraction_enabled():
+        run_after_commit(extract_blob_text, blob.pk)
@@ -0,0 +1,23 @@
+"""
+Historial de documentos (DocumentHistory) a través del event log.
+
+Las filas se escriben por lotes fuera del hilo de la petición (ver
+apps.core.eventlog); las vistas solo registran el evento.
+"""
+from django.utils import timezone
+
+from apps.core.eventlog import record_event
+
+
+def record_history(document, action, description, user=None, old_value='', new_value=''):
+    """Registra una entrada de historial del documento (action: DocumentHistory.ACTION_CHOICES)."""
+    record_event(
+        'documents.DocumentHistory',
+        document_id=document.pk,
+        action=action,
+        description=description,
+        old_value=old_value,
+        new_value=new_value,
+        performed_by_id=getattr(user, 'pk', None),
+        performed_at=timezone.now(),
+    )
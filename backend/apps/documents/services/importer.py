@@ -0,0 +1,335 @@
+"""
+Importación masiva de documentos por lotes.
+
+Acepta un archivo NDJSON (una línea JSON por documento, compatible con la
+exportación) o un ZIP de archivos Markdown. Las filas se validan por lotes y
+cada lote se escribe en su propia transacción con bulk_create para Document,
+su DocumentVersion inicial y su DocumentHistory.
+
+La numeración de lotes depende solo del archivo y de batch_size, así que una
+importación interrumpida se reanuda volviendo a enviar el mismo archivo con
+start_batch = last_completed_batch + 1.
+"""
+
+import json
+import os
+import zipfile
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+
+from .rendering import render_many
+
+IMPORT_FORMATS = ('ndjson', 'zip')
+
+MARKDOWN_EXTENSIONS = ('.md', '.markdown', '.txt')
+
+# Límite de errores por fila incluidos en el reporte
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportRow(NamedTuple):
+    number: int
+    source: str
+    load: Callable[[], Dict]
+
+
+def detect_format(uploaded_file) -> str:
+    """'zip' si el archivo es un ZIP, si no 'ndjson'."""
+    is_zip = zipfile.is_zipfile(uploaded_file)
+    uploaded_file.seek(0)
+    return 'zip' if is_zip else 'ndjson'
+
+
+def _parse_json_line(line: bytes) -> Dict:
+    try:
+        data = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f'JSON inválido: {exc}')
+    if not isinstance(data, dict):
+        raise ValueError('Cada línea debe ser un objeto JSON')
+    return data
+
+
+def iter_ndjson_rows(uploaded_file) -> Iterator[ImportRow]:
+    """Una fila por línea no vacía; el JSON se decodifica al procesar su lote."""
+    for number, line in enumerate(uploaded_file, start=1):
+        if line.strip():
+            yield ImportRow(number, f'línea {number}', lambda line=line: _parse_json_line(line))
+
+
+def parse_markdown_file(name: str, text: str) -> Dict:
+    """
+    Convierte un archivo Markdown en una fila de importación.
+
+    Lee la cabecera de metadatos (front matter) si existe, como la que genera
+    la exportación; si no hay título usa el primer encabezado o el nombre del archivo.
+    """
+    data = {}
+    body = text
+    if text.startswith('---\n'):
+        end = text.find('\n---\n', 4)
+        if end != -1:
+            for line in text[4:end].splitlines():
+                key, sep, value = line.partition(':')
+                if not sep:
+                    continue
+                value = value.strip()
+                if value.startswith('"'):
+                    try:
+                        value = json.loads(value)
+                    except json.JSONDecodeError:
+                        value = value.strip('"')
+                data[key.strip()] = value
+            body = text[end + 5:]
+
+    if not data.get('title'):
+        heading = next((line for line in body.splitlines() if line.startswith('# ')), None)
+        data['title'] = heading[2:].strip() if heading else os.path.splitext(os.path.basename(name))[0]
+
+    # Los ids de la exportación pertenecen al sistema de origen
+    data.pop('id', None)
+    data.pop('updated_at', None)
+    data['content'] = body
+    return data
+
+
+def import_zip_max_file_size() -> int:
+    return getattr(settings, 'IMPORT_ZIP_MAX_FILE_SIZE', 5 * 1024 * 1024)
+
+
+def import_zip_max_total_size() -> int:
+    return getattr(settings, 'IMPORT_ZIP_MAX_TOTAL_SIZE', 200 * 1024 * 1024)
+
+
+def _load_zip_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo, max_size: int) -> Dict:
+    # Nunca se descomprime más de max_size aunque la cabecera del ZIP declare menos
+    with archive.open(info) as entry:
+        data = entry.read(max_size + 1)
+    if len(data) > max_size:
+        raise ValueError(f'El archivo supera el máximo de {max_size} bytes descomprimido')
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError('El archivo no está en UTF-8')
+    return parse_markdown_file(info.filename, text)
+
+
+def _reject_entry(message: str) -> Dict:
+    raise ValueError(message)
+
+
+def iter_zip_rows(uploaded_file) -> Iterator[ImportRow]:
+    """
+    Una fila por archivo Markdown del ZIP, en orden alfabético de ruta.
+
+    El tamaño descomprimido declarado de cada archivo y el acumulado se
+    comprueban antes de leerlo (IMPORT_ZIP_MAX_FILE_SIZE, IMPORT_ZIP_MAX_TOTAL_SIZE);
+    los que no caben se reportan como error de su fila sin descomprimirlos.
+    """
+    max_file_size = import_zip_max_file_size()
+    max_total_size = import_zip_max_total_size()
+    # Sin "with": las entradas se leen al procesar su lote, incluso después de agotar el generador
+    archive = zipfile.ZipFile(uploaded_file)
+    entries = sorted(
+        (info for info in archive.infolist()
+         if not info.is_dir() and info.filename.lower().endswith(MARKDOWN_EXTENSIONS)),
+        key=lambda info: info.filename
+    )
+    total_size = 0
+    for number, info in enumerate(entries, start=1):
+        if info.file_size > max_file_size:
+            load = partial(
+                _reject_entry,
+                f'El archivo ocupa {info.file_size} bytes descomprimido; el máximo es {max_file_size}'
+            )
+        elif total_size + info.file_size > max_total_size:
+            load = partial(_reject_entry, f'El ZIP supera el máximo de {max_total_size} bytes descomprimidos')
+        else:
+            total_size += info.file_size
+            load = partial(_load_zip_entry, archive, info, max_file_size)
+        yield ImportRow(number, info.filename, load)
+
+
+def _chunked(rows: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class DocumentImporter:
+    """
+    Importa filas de documentos por lotes para un usuario.
+
+    Uso:
+        importer = DocumentImporter(user, workspace_id=3)
+        report = importer.run(iter_ndjson_rows(file), batch_size=500, start_batch=1)
+    """
+
+    def __init__(self, user, workspace_id: Optional[int] = None, project_id: Optional[int] = None):
+        self.user = user
+        self.organization = user.organization
+        self.defaults = {'workspace': workspace_id, 'project': project_id}
+
+    def run(self, rows: Iterable[ImportRow], batch_size: int = 500, start_batch: int = 1) -> Dict:
+        report = {
+            'batch_size': batch_size,
+            'start_batch': start_batch,
+            'total_rows': 0,
+            'skipped_rows': 0,
+            'created': 0,
+            'failed': 0,
+            'last_completed_batch': start_batch - 1,
+            'interrupted': False,
+            'batches': [],
+            'errors': [],
+        }
+
+        for batch_number, batch in enumerate(_chunked(rows, batch_size), start=1):
+            if batch_number < start_batch:
+                report['skipped_rows'] += len(batch)
+                continue
+
+            report['total_rows'] += len(batch)
+            valid, errors = self._validate_batch(batch)
+            try:
+                created = self._write_batch(valid)
+            except DatabaseError as exc:
+                # Los lotes anteriores ya están confirmados: reanudar desde este
+                report['interrupted'] = True
+                report['error'] = f'Lote {batch_number}: {exc}'
+                break
+
+            report['created'] += created
+            report['failed'] += len(errors)
+            report['last_completed_batch'] = batch_number
+            report['batches'].append({
+                'batch': batch_number,
+                'first_row': batch[0].number,
+                'last_row': batch[-1].number,
+                'created': created,
+                'failed': len(errors),
+            })
+            remaining = MAX_REPORTED_ERRORS - len(report['errors'])
+            report['errors'].extend(errors[:max(remaining, 0)])
+
+        return report
+
+    def _validate_batch(self, batch: List[ImportRow]):
+        """Valida campos fila a fila y las referencias de todo el lote en una consulta por modelo."""
+        from apps.documents.serializers import DocumentImportRowSerializer
+
+        candidates = []
+        errors = []
+        for row in batch:
+            try:
+                # El destino indicado en la petición prevalece sobre los ids de origen de la fila
+                data = {**row.load(), **{k: v for k, v in self.defaults.items() if v is not None}}
+            except (ValueError, KeyError, zipfile.BadZipFile) as exc:
+                errors.append({'row': row.number, 'source': row.source, 'errors': {'non_field_errors': [str(exc)]}})
+                continue
+
+            serializer = DocumentImportRowSerializer(data=data)
+            if serializer.is_valid():
+                candidates.append((row, serializer.validated_data))
+            else:
+                errors.append({'row': row.number, 'source': row.source, 'errors': serializer.errors})
+
+        allowed = self._allowed_references(candidates)
+        valid = []
+        for row, values in candidates:
+            row_errors = {}
+            if not values.get('workspace'):
+                row_errors['workspace'] = ['Se requiere un workspace (en la fila o en la petición)']
+            for field in ('workspace', 'project', 'documentation_standard'):
+                if values.get(field) and values[field] not in allowed[field]:
+                    row_errors.setdefault(field, []).append(f'No existe o no pertenece a tu organización: {values[field]}')
+            if row_errors:
+                errors.append({'row': row.number, 'source': row.source, 'errors': row_errors})
+            else:
+                valid.append((row, values))
+
+        return valid, errors
+
+    def _allowed_references(self, candidates) -> Dict[str, set]:
+        from apps.documents.models import Workspace
+        from apps.projects.models import Project
+        from apps.standards.models import DocumentationStandard
+
+        ids = {
+            field: {values[field] for _, values in candidates if values.get(field)}
+            for field in ('workspace', 'project', 'documentation_standard')
+        }
+
+        workspaces = Workspace.objects.filter(pk__in=ids['workspace'])
+        projects = Project.objects.filter(pk__in=ids['project'])
+        standards = DocumentationStandard.objects.filter(pk__in=ids['documentation_standard'])
+        if self.organization:
+            workspaces = workspaces.filter(organization=self.organization)
+            projects = projects.filter(organization=self.organization)
+            standards = standards.filter(Q(organization__isnull=True) | Q(organization=self.organization))
+        else:
+            standards = standards.filter(organization__isnull=True)
+
+        return {
+            'workspace': set(workspaces.values_list('pk', flat=True)) if ids['workspace'] else set(),
+            'project': set(projects.values_list('pk', flat=True)) if ids['project'] else set(),
+            'documentation_standard': (
+                set(standards.values_list('pk', flat=True)) if ids['documentation_standard'] else set()
+            ),
+        }
+
+    def _write_batch(self, valid) -> int:
+        """Inserta documentos, versiones iniciales e historial del lote en una transacción."""
+        from apps.documents.models import Document, DocumentHistory, DocumentVersion
+
+        if not valid:
+            return 0
+
+        rendered = render_many(values['content'] for _, values in valid)
+
+        with transaction.atomic():
+            documents = Document.objects.bulk_create([
+                Document(
+                    title=values['title'],
+                    content=values['content'],
+                    content_html=rendered.get(values['content'], ''),
+                    status=values['status'],
+                    version=values['version'],
+                    workspace_id=values.get('workspace'),
+                    project_id=values.get('project'),
+                    documentation_standard_id=values.get('documentation_standard'),
+                    created_by=self.user,
+                    last_modified_by=self.user,
+                )
+                for _, values in valid
+            ])
+            DocumentVersion.objects.bulk_create([
+                DocumentVersion(
+                    document=document,
+                    version_number=document.version,
+                    content=document.content,
+                    content_html=document.content_html,
+                    changes_description='Versión inicial (importación)',
+                    created_by=self.user,
+                )
+                for document in documents
+            ])
+            DocumentHistory.objects.bulk_create([
+                DocumentHistory(
+                    document=document,
+                    action='CREATE',
+                    description=f'Documento importado desde {row.source}',
+                    performed_by=self.user,
+                )
+                for document, (row, _) in zip(documents, valid)
+            ])
+
+        return len(documents)
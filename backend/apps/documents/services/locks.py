@@ -0,0 +1,126 @@
+"""
+Bloqueos de edición con lease (TTL) y renovación por heartbeat.
+
+Un usuario toma el bloqueo al empezar a editar y lo renueva cada pocos
+segundos mientras el editor sigue abierto. Si el navegador se cierra sin
+soltarlo, el lease vence solo tras DOCUMENT_LOCK_TTL_SECONDS.
+
+El estado vive en DocumentLock (una fila por documento, clave primaria =
+document_id): comprobar si un documento está bloqueado es una búsqueda por
+clave primaria, sin cargar ni reescribir el documento. Cada operación es una
+sola sentencia condicional, de modo que dos usuarios que intentan bloquear a
+la vez no pueden quedar ambos como titulares.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.events import publish_event
+
+
+class DocumentLocked(Exception):
+    """El documento está bloqueado por otro usuario."""
+
+    def __init__(self, lock):
+        super().__init__(f'Documento bloqueado por el usuario {lock.user_id} hasta {lock.expires_at}')
+        self.lock = lock
+
+
+def lock_ttl() -> int:
+    return getattr(settings, 'DOCUMENT_LOCK_TTL_SECONDS', 120)
+
+
+def get_active_lock(document_id):
+    """Lease vigente del documento (con su usuario), o None."""
+    from apps.documents.models import DocumentLock
+
+    return DocumentLock.objects.select_related('user').filter(
+        document_id=document_id, expires_at__gt=timezone.now()
+    ).first()
+
+
+def check_not_locked(document_id, user) -> None:
+    """Lanza DocumentLocked si otro usuario tiene un lease vigente sobre el documento."""
+    lock = get_active_lock(document_id)
+    if lock is not None and lock.user_id != user.pk:
+        raise DocumentLocked(lock)
+
+
+def _publish(document_id, organization_id, action, lock=None):
+    if organization_id is None:
+        return
+    publish_event('document.lock', {
+        'document_id': document_id,
+        'action': action,
+        'user': lock.user_id if lock else None,
+        'expires_at': lock.expires_at if lock else None,
+    }, organization=organization_id)
+
+
+def acquire_lock(document_id, user, organization_id=None):
+    """
+    Toma el bloqueo, o lo renueva si ya es del usuario.
+
+    Un lease vencido de otro usuario se reemplaza. Lanza DocumentLocked si
+    otro usuario tiene uno vigente.
+    """
+    from apps.documents.models import DocumentLock
+
+    with transaction.atomic():
+        # Solo se repite si la fila que impidió el INSERT venció entretanto: el siguiente UPDATE la toma
+        while True:
+            now = timezone.now()
+            expires_at = now + timedelta(seconds=lock_ttl())
+            # Renovar el propio o quedarse con uno vencido, en una sola sentencia
+            taken = DocumentLock.objects.filter(document_id=document_id).filter(
+                Q(user=user) | Q(expires_at__lte=now)
+            ).update(user=user, acquired_at=now, expires_at=expires_at)
+            if not taken:
+                try:
+                    with transaction.atomic():
+                        DocumentLock.objects.create(
+                            document_id=document_id, user=user, acquired_at=now, expires_at=expires_at
+                        )
+                except IntegrityError:
+                    # Otro usuario lo tiene (o lo tomó entre las dos sentencias)
+                    lock = get_active_lock(document_id)
+                    if lock is not None:
+                        raise DocumentLocked(lock)
+                    continue
+
+            lock = DocumentLock.objects.select_related('user').get(document_id=document_id)
+            _publish(document_id, organization_id, 'acquired', lock)
+            return lock
+
+
+def renew_lock(document_id, user):
+    """
+    Heartbeat: extiende el lease del usuario si sigue vigente.
+
+    Retorna el lease renovado, o None si ya venció o lo tomó otro usuario
+    (el cliente debe volver a llamar a acquire_lock antes de guardar).
+    """
+    from apps.documents.models import DocumentLock
+
+    now = timezone.now()
+    renewed = DocumentLock.objects.filter(
+        document_id=document_id, user=user, expires_at__gt=now
+    ).update(expires_at=now + timedelta(seconds=lock_ttl()))
+    if not renewed:
+        return None
+    return DocumentLock.objects.select_related('user').get(document_id=document_id)
+
+
+def release_lock(document_id, user, organization_id=None) -> bool:
+    """Suelta el bloqueo del usuario; retorna False si no lo tenía."""
+    from apps.documents.models import DocumentLock
+
+    with transaction.atomic():
+        deleted, _ = DocumentLock.objects.filter(document_id=document_id, user=user).delete()
+        if deleted:
+            _publish(document_id, organization_id, 'released')
+    return bool(deleted)
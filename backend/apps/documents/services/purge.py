@@ -0,0 +1,210 @@
+"""
+Borrado definitivo de documentos por lotes.
+
+QuerySet.delete() deja que el Collector de Django cargue en memoria cada fila
+relacionada (versiones, comentarios, adjuntos, historial, validaciones...)
+antes de borrarla. Aquí el plan de borrado se deriva una sola vez de las
+relaciones del modelo y se ejecuta con DELETE/UPDATE por conjunto de ids:
+
+    - Los documentos se procesan en lotes por rango de id, cada uno en una
+      transacción corta.
+    - Las relaciones CASCADE se borran de hoja a raíz con un DELETE por tabla.
+    - Las relaciones SET_NULL se actualizan con un UPDATE por tabla.
+    - Los adjuntos liberan su referencia al blob; los blobs sin uso y los
+      archivos de adjuntos antiguos se eliminan del storage tras el commit.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.db import models, router, transaction
+from django.db.models import Count, Q
+
+
+def build_purge_plan(model) -> Tuple[List, List]:
+    """
+    Calcula (updates, deletes) para borrar filas de model y todo lo que cuelga de ellas.
+
+    updates: [(modelo, lookup, campo)]  -> UPDATE modelo SET campo = NULL WHERE lookup IN ids
+    deletes: [(modelo, [lookups])]      -> DELETE FROM modelo WHERE lookup IN ids OR ... (hojas primero)
+    Los lookups son rutas hasta el id del modelo raíz (p. ej. 'from_version__document').
+    """
+    updates = []
+    deletes = []
+
+    def walk(current, path, visiting):
+        # include_hidden: relaciones con related_name='+' y tablas intermedias de ManyToMany
+        for relation in current._meta.get_fields(include_hidden=True):
+            if not (relation.auto_created and not relation.concrete) or relation.many_to_many:
+                continue
+
+            related = relation.related_model
+            field = relation.field
+            lookup = f'{field.name}__{path}' if path else field.name
+            on_delete = field.remote_field.on_delete
+
+            if related is current:
+                # Auto-referencias (p. ej. keyframe de DocumentVersion): se borran con el mismo conjunto
+                continue
+            if on_delete is models.CASCADE:
+                if related in visiting:
+                    continue
+                walk(related, lookup, visiting | {related})
+                deletes.append((related, lookup))
+            elif on_delete is models.SET_NULL:
+                updates.append((related, lookup, field.name))
+            elif on_delete is models.DO_NOTHING:
+                continue
+            else:
+                raise ValueError(
+                    f'{related._meta.label}.{field.name} usa {on_delete.__name__}; '
+                    'el borrado por lotes no lo soporta'
+                )
+
+    walk(model, '', {model})
+
+    # Una sola sentencia por tabla aunque llegue por varias rutas (p. ej. from_version / to_version)
+    merged = {}
+    for related, lookup in deletes:
+        merged.setdefault(related, []).append(lookup)
+    return updates, list(merged.items())
+
+
+def _attachment_files(document_ids) -> List[str]:
+    """Archivos propios de adjuntos anteriores a la deduplicación (sin blob)."""
+    from apps.documents.models import DocumentAttachment
+
+    return [
+        name for name in DocumentAttachment.objects.filter(document_id__in=document_ids, blob__isnull=True)
+        .values_list('file', flat=True)
+        if name
+    ]
+
+
+def _attachment_blob_refs(document_ids) -> Dict[int, int]:
+    """{blob_id: referencias} de los adjuntos de los documentos."""
+    from apps.documents.models import DocumentAttachment
+
+    return dict(
+        DocumentAttachment.objects.filter(document_id__in=document_ids, blob__isnull=False)
+        .values('blob_id').annotate(refs=Count('id')).values_list('blob_id', 'refs')
+    )
+
+
+def _releasable_blobs(refs: Dict[int, int]) -> int:
+    """Blobs que quedarían sin referencias (para --dry-run)."""
+    from apps.documents.models import AttachmentBlob
+
+    return sum(
+        1 for pk, ref_count in AttachmentBlob.objects.filter(pk__in=list(refs)).values_list('pk', 'ref_count')
+        if ref_count <= refs[pk]
+    )
+
+
+def delete_attachment_files(names: List[str]) -> int:
+    """Elimina archivos de adjuntos del storage; retorna cuántos se borraron."""
+    from apps.documents.models import DocumentAttachment
+
+    storage = DocumentAttachment._meta.get_field('file').storage
+    deleted = 0
+    for name in names:
+        try:
+            storage.delete(name)
+            deleted += 1
+        except OSError:
+            # Un archivo ya ausente no debe impedir el resto del borrado
+            continue
+    return deleted
+
+
+def purge_documents(
+    queryset,
+    batch_size: int = 500,
+    dry_run: bool = False,
+    on_batch: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Borra definitivamente los documentos del queryset por lotes de ids.
+
+    Solo se borran documentos que siguen en la papelera al momento de cada
+    lote (un documento restaurado mientras tanto se conserva).
+
+    Returns:
+        Dict con documents, rows (por tabla), files, batches, elapsed.
+    """
+    from apps.documents.models import Document
+    from .attachments import release_blobs
+
+    updates, deletes = build_purge_plan(Document)
+    db = router.db_for_write(Document)
+    report = {'documents': 0, 'rows': {}, 'updated': {}, 'files': 0, 'batches': 0, 'elapsed': 0.0}
+    started = time.monotonic()
+    last_id = 0
+
+    def count(label, bucket, value):
+        if value:
+            report[bucket][label] = report[bucket].get(label, 0) + value
+
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+        batch_started = time.monotonic()
+        batch_rows = 0
+
+        with transaction.atomic(using=db):
+            ids = list(
+                Document.objects.using(db).select_for_update()
+                .filter(pk__in=ids, is_deleted=True)
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            )
+            if not ids:
+                continue
+            files = _attachment_files(ids)
+            blob_refs = _attachment_blob_refs(ids)
+
+            for related, lookup, field_name in updates:
+                rows = related._base_manager.using(db).filter(**{f'{lookup}__in': ids})
+                affected = rows.count() if dry_run else rows.update(**{field_name: None})
+                count(related._meta.label, 'updated', affected)
+
+            for related, lookups in deletes:
+                condition = Q()
+                for lookup in lookups:
+                    condition |= Q(**{f'{lookup}__in': ids})
+                rows = related._base_manager.using(db).filter(condition)
+                # _raw_delete: DELETE directo sin que el Collector cargue las filas
+                affected = rows.count() if dry_run else rows._raw_delete(db)
+                count(related._meta.label, 'rows', affected)
+                batch_rows += affected
+
+            documents = Document._base_manager.using(db).filter(pk__in=ids)
+            affected = len(ids) if dry_run else documents._raw_delete(db)
+            count(Document._meta.label, 'rows', affected)
+            batch_rows += affected
+
+            report['files'] += len(files)
+            if dry_run:
+                report['files'] += _releasable_blobs(blob_refs)
+            else:
+                report['files'] += release_blobs(blob_refs)
+                transaction.on_commit(lambda files=files: delete_attachment_files(files), using=db)
+
+        report['documents'] += len(ids)
+        report['batches'] += 1
+        if on_batch:
+            on_batch({
+                'batch': report['batches'],
+                'documents': len(ids),
+                'rows': batch_rows,
+                'first_id': ids[0],
+                'last_id': ids[-1],
+                'elapsed': time.monotonic() - batch_started,
+            })
+
+    report['elapsed'] = time.monotonic() - started
+    return report
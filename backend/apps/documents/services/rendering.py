@@ -0,0 +1,185 @@
+"""
+Renderizado de Markdown a HTML sanitizado con caché por hash de contenido.
+
+El contenido (Markdown o HTML del editor) se convierte con python-markdown y
+se limpia con bleach. Cada resultado se guarda una sola vez en la tabla
+RenderedMarkdown, indexada por el SHA-256 del texto fuente: documentos,
+versiones, ejemplos y salidas de IA con el mismo contenido comparten el mismo
+render.
+
+Los modelos declaran sus campos con apps.core.markdown.MarkdownRenderMixin:
+    markdown_fields = {'content': 'content_html'}
+y el HTML se regenera al guardar solo cuando cambia el campo fuente.
+
+Cada contenido distinto agrega una fila a la caché; prune_rendered_markdown
+borra las de hashes que ya no corresponden a ningún texto guardado
+(contenido editado, documentos purgados, RENDERER_VERSION anterior).
+"""
+
+import hashlib
+from datetime import timedelta
+from typing import Dict, Iterable, List, Tuple
+
+import bleach
+import markdown
+from django.conf import settings
+from django.utils import timezone
+
+# Cambiar al modificar extensiones o reglas de sanitizado: invalida los renders cacheados
+RENDERER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists']
+
+ALLOWED_TAGS = frozenset(bleach.sanitizer.ALLOWED_TAGS) | {
+    'p', 'br', 'hr', 'pre', 'span', 'div', 'img',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'table', 'thead', 'tbody', 'tr', 'th', 'td',
+    'dl', 'dt', 'dd', 'del', 'ins', 'sup', 'sub', 'u', 's', 'mark',
+}
+
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title'],
+    'abbr': ['title'],
+    'acronym': ['title'],
+    'img': ['src', 'alt', 'title'],
+    # language-mermaid, etc.: el frontend los usa para resaltar y dibujar diagramas
+    'code': ['class'],
+    'pre': ['class'],
+    'div': ['class'],
+    'span': ['class'],
+    'th': ['align'],
+    'td': ['align'],
+}
+
+ALLOWED_PROTOCOLS = frozenset({'http', 'https', 'mailto'})
+
+
+def render_on_save_enabled() -> bool:
+    """Si es False, el HTML se vacía al guardar y lo completa el comando render_markdown."""
+    return getattr(settings, 'MARKDOWN_RENDER_ON_SAVE', True)
+
+
+def markdown_hash(text: str) -> str:
+    """Clave de caché del render: SHA-256 de la versión del renderer y el texto fuente."""
+    return hashlib.sha256(f'{RENDERER_VERSION}:{text}'.encode('utf-8')).hexdigest()
+
+
+def render_markdown(text: str) -> str:
+    """Convierte Markdown a HTML sanitizado (sin caché)."""
+    if not text:
+        return ''
+    html = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS, output_format='html')
+    return bleach.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+    )
+
+
+def render_many(texts: Iterable[str]) -> Dict[str, str]:
+    """
+    Retorna {texto: html} usando la caché por hash.
+
+    Una consulta para los renders existentes y un bulk_create para los nuevos.
+    """
+    from apps.documents.models import RenderedMarkdown
+
+    by_hash = {markdown_hash(text): text for text in set(texts) if text}
+    if not by_hash:
+        return {}
+
+    cached = dict(
+        RenderedMarkdown.objects.filter(content_hash__in=by_hash).values_list('content_hash', 'html')
+    )
+    missing = [
+        RenderedMarkdown(content_hash=content_hash, html=render_markdown(text))
+        for content_hash, text in by_hash.items()
+        if content_hash not in cached
+    ]
+    if missing:
+        # Otro proceso pudo renderizar el mismo contenido a la vez: el resultado es idéntico
+        RenderedMarkdown.objects.bulk_create(missing, ignore_conflicts=True, batch_size=500)
+        cached.update((rendered.content_hash, rendered.html) for rendered in missing)
+
+    return {text: cached[content_hash] for content_hash, text in by_hash.items()}
+
+
+def get_rendered_html(text: str) -> str:
+    """HTML sanitizado de un texto, desde la caché si ya se renderizó antes."""
+    if not text:
+        return ''
+    return render_many([text])[text]
+
+
+def markdown_sources() -> List[Tuple]:
+    """(etiqueta, queryset, campo_fuente, campo_html) de cada tabla con HTML renderizado."""
+    from apps.documents.models import Document, DocumentVersion
+    from apps.standards.models import AIGenerationTest, DocumentationExample
+
+    return [
+        ('Documentos', Document.objects.all(), 'content', 'content_html'),
+        # Las versiones delta reconstruyen su HTML desde el keyframe al leerse
+        ('Versiones', DocumentVersion.objects.filter(is_keyframe=True), 'content', 'content_html'),
+        ('Ejemplos', DocumentationExample.objects.all(), 'generated_content', 'generated_content_html'),
+        ('Pruebas IA', AIGenerationTest.objects.all(), 'generated_content', 'generated_content_html'),
+    ]
+
+
+def referenced_markdown_hashes(batch_size: int = 1000) -> set:
+    """Hashes de caché de todos los textos fuente guardados, leídos por rangos de id."""
+    hashes = set()
+    for _, queryset, source, _ in markdown_sources():
+        last_id = 0
+        while True:
+            rows = list(
+                queryset.exclude(**{source: ''}).filter(pk__gt=last_id)
+                .order_by('pk').values_list('pk', source)[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            hashes.update(markdown_hash(text) for _, text in rows)
+    return hashes
+
+
+def prune_rendered_markdown(min_age: timedelta = timedelta(hours=24), batch_size: int = 1000,
+                            dry_run: bool = False) -> int:
+    """
+    Borra los renders cacheados cuyo hash ya no corresponde a ningún texto guardado.
+
+    Solo considera filas creadas hace más de min_age: un guardado en curso pudo
+    crear su render antes de confirmar el texto. Borrar un render en uso solo
+    cuesta volver a renderizarlo. Retorna cuántas filas se borraron (o se
+    borrarían con dry_run).
+    """
+    from apps.documents.models import RenderedMarkdown
+
+    referenced = referenced_markdown_hashes(batch_size)
+    cutoff = timezone.now() - min_age
+    pruned = 0
+    last_id = 0
+    while True:
+        rows = list(
+            RenderedMarkdown.objects.filter(pk__gt=last_id, created_at__lt=cutoff)
+            .order_by('pk').values_list('pk', 'content_hash')[:batch_size]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        stale = [pk for pk, content_hash in rows if content_hash not in referenced]
+        if stale and not dry_run:
+            RenderedMarkdown.objects.filter(pk__in=stale).delete()
+        pruned += len(stale)
+    return pruned
+
+
+def fill_rendered_html(objects: Iterable, source: str, target: str) -> None:
+    """Completa en memoria target en los objetos que aún no tienen HTML (una consulta por lote)."""
+    pending = [obj for obj in objects if getattr(obj, source) and not getattr(obj, target)]
+    if not pending:
+        return
+    rendered = render_many(getattr(obj, source) for obj in pending)
+    for obj in pending:
+        setattr(obj, target, rendered[getattr(obj, source)])
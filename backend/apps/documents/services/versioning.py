@@ -0,0 +1,155 @@
+"""
+Almacenamiento comprimido del historial de versiones.
+
+Cada documento guarda una versión completa (keyframe) cada N versiones y,
+entre keyframes, solo un delta comprimido respecto al keyframe más reciente.
+Reconstruir cualquier versión requiere como máximo dos filas: el keyframe y
+el propio delta.
+
+Formato del delta: JSON comprimido con zlib. Por cada campo de texto
+(content, content_html) se guarda una lista de operaciones sobre las líneas
+del keyframe:
+    [i1, i2]  -> copiar las líneas i1..i2 del keyframe
+    "texto"   -> insertar el texto literal
+"""
+
+import difflib
+import json
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+# Campos de DocumentVersion que se almacenan como delta
+DELTA_FIELDS = ('content', 'content_html')
+
+# Columnas necesarias para reconstruir una versión cargada desde la base de datos
+STORAGE_ATTNAMES = {'is_keyframe', 'keyframe_id', 'delta', 'content', 'content_html'}
+
+
+def get_keyframe_interval() -> int:
+    """Número de versiones entre keyframes completos (mínimo 1 = sin deltas)."""
+    return max(1, int(getattr(settings, 'DOCUMENT_VERSION_KEYFRAME_INTERVAL', 10)))
+
+
+def _diff_ops(base: str, target: str) -> List:
+    """Calcula las operaciones necesarias para pasar de base a target por líneas."""
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif tag in ('replace', 'insert'):
+            ops.append(''.join(target_lines[j1:j2]))
+        # 'delete': las líneas del keyframe simplemente no se copian
+    return ops
+
+
+def _apply_ops(base: str, ops: List) -> str:
+    """Aplica las operaciones de _diff_ops sobre el texto base."""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return ''.join(parts)
+
+
+def encode_delta(base: Dict[str, str], target: Dict[str, str]) -> bytes:
+    """Codifica target como delta comprimido respecto a base."""
+    payload = {
+        field: _diff_ops(base.get(field) or '', target.get(field) or '')
+        for field in DELTA_FIELDS
+    }
+    return zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_delta(base: Dict[str, str], delta: bytes) -> Dict[str, str]:
+    """Reconstruye los campos de texto aplicando el delta sobre base."""
+    payload = json.loads(zlib.decompress(bytes(delta)).decode('utf-8'))
+    return {
+        field: _apply_ops(base.get(field) or '', payload.get(field, []))
+        for field in DELTA_FIELDS
+    }
+
+
+def stored_size(content: str, content_html: str, delta: Optional[bytes]) -> int:
+    """Bytes ocupados por una fila de versión (texto completo o delta)."""
+    if delta:
+        return len(delta)
+    return len((content or '').encode('utf-8')) + len((content_html or '').encode('utf-8'))
+
+
+def plan_snapshot(
+    latest_keyframe,
+    versions_since_keyframe: int,
+    content: str,
+    content_html: str,
+    keyframe_interval: Optional[int] = None
+) -> Dict:
+    """
+    Decide cómo almacenar una nueva versión.
+
+    Args:
+        latest_keyframe: Último keyframe del documento (o None si no hay versiones)
+        versions_since_keyframe: Versiones delta guardadas después de ese keyframe
+        content, content_html: Texto completo de la nueva versión
+        keyframe_interval: Sobrescribe DOCUMENT_VERSION_KEYFRAME_INTERVAL
+
+    Returns:
+        Dict con los valores de almacenamiento para DocumentVersion:
+        is_keyframe, keyframe, delta, content, content_html
+    """
+    target = {'content': content or '', 'content_html': content_html or ''}
+    full = {'is_keyframe': True, 'keyframe': None, 'delta': None, **target}
+
+    interval = keyframe_interval or get_keyframe_interval()
+    if latest_keyframe is None or versions_since_keyframe + 1 >= interval:
+        return full
+
+    delta = encode_delta(
+        {'content': latest_keyframe.content, 'content_html': latest_keyframe.content_html},
+        target
+    )
+    # Si el delta no ahorra espacio, guardar la versión completa
+    if len(delta) >= stored_size(content, content_html, None):
+        return full
+
+    return {'is_keyframe': False, 'keyframe': latest_keyframe, 'delta': delta, 'content': '', 'content_html': ''}
+
+
+def materialize_versions(versions: Iterable) -> None:
+    """
+    Rellena content y content_html de las versiones almacenadas como delta.
+
+    Los keyframes que no estén en el lote se cargan en una sola consulta.
+    """
+    from apps.documents.models import DocumentVersion
+
+    versions = [v for v in versions if not (STORAGE_ATTNAMES & v.get_deferred_fields())]
+    pending = [v for v in versions if not v.is_keyframe and v.delta]
+    if not pending:
+        return
+
+    loaded = {v.pk: v for v in versions if v.is_keyframe}
+    missing = {v.keyframe_id for v in pending} - set(loaded)
+    if missing:
+        loaded.update(
+            DocumentVersion.objects.filter(pk__in=missing, is_keyframe=True)
+            .only('id', 'is_keyframe', 'content', 'content_html')
+            .in_bulk()
+        )
+
+    for version in pending:
+        keyframe = loaded[version.keyframe_id]
+        fields = decode_delta(
+            {'content': keyframe.content, 'content_html': keyframe.content_html},
+            version.delta
+        )
+        version.content = fields['content']
+        version.content_html = fields['content_html']
@@ -0,0 +1,72 @@
+"""
+Eventos en tiempo real de documentos (ver apps.core.events).
+
+Cada guardado o borrado de un documento, comentario o adjunto publica
+document.changed en el canal de la organización del workspace. Los cambios
+masivos (QuerySet.update(), bulk_create, purgas) no emiten eventos; quedan
+en el feed de cambios.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.events import publish_event
+
+from .models import Document, DocumentAttachment, DocumentComment, Workspace
+
+
+def _organization_of(workspace_id):
+    if workspace_id is None:
+        return None
+    return Workspace.objects.filter(pk=workspace_id).values_list('organization_id', flat=True).first()
+
+
+def _publish_change(object_type, object_id, document_id, workspace_id, action, **extra):
+    organization_id = _organization_of(workspace_id)
+    if organization_id is None:
+        return
+    publish_event('document.changed', {
+        'object_type': object_type,
+        'object_id': object_id,
+        'document_id': document_id,
+        'workspace_id': workspace_id,
+        'action': action,
+        **extra,
+    }, organization=organization_id)
+
+
+def _publish_document(document, action):
+    _publish_change(
+        'document', document.pk, document.pk, document.workspace_id, action,
+        version=document.version,
+        status=document.status,
+        is_deleted=document.is_deleted,
+        modified_by=document.last_modified_by_id,
+    )
+
+
+def _publish_child(sender, instance, action):
+    object_type = 'comment' if sender is DocumentComment else 'attachment'
+    workspace_id = Document.objects.filter(pk=instance.document_id).values_list('workspace_id', flat=True).first()
+    _publish_change(object_type, instance.pk, instance.document_id, workspace_id, action)
+
+
+@receiver(post_save, sender=Document)
+def document_saved(sender, instance, created, **kwargs):
+    _publish_document(instance, 'created' if created else 'updated')
+
+
+@receiver(post_delete, sender=Document)
+def document_deleted(sender, instance, **kwargs):
+    _publish_document(instance, 'purged')
+
+
+@receiver(post_save, sender=DocumentComment)
+@receiver(post_save, sender=DocumentAttachment)
+def document_child_saved(sender, instance, created, **kwargs):
+    _publish_child(sender, instance, 'created' if created else 'updated')
+
+
+@receiver(post_delete, sender=DocumentComment)
+@receiver(post_delete, sender=DocumentAttachment)
+def document_child_deleted(sender, instance, **kwargs):
+    _publish_child(sender, instance, 'deleted')
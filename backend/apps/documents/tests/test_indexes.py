@@ -0,0 +1,83 @@
+"""
+Los índices parciales de documentos deben aparecer en los planes de las consultas reales.
+
+Solo PostgreSQL entiende índices parciales y EXPLAIN con este formato; en SQLite se omite.
+Para ejecutarlos: pytest backend/ --ds=config.settings.test_pg
+"""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.pagination import DocumentCursorPagination
+from apps.documents.models import Document, Workspace
+from apps.documents.views import DocumentViewSet
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason='Requiere PostgreSQL (--ds=config.settings.test_pg)'),
+]
+
+LIVE_DOCUMENTS = 5000
+WORKSPACES = 50
+TRASHED_DOCUMENTS = 30
+
+
+@pytest.fixture
+def workspaces(organization, user):
+    """Varios workspaces con muchos documentos vivos y una papelera pequeña."""
+    workspaces = [
+        Workspace.objects.create(name=f'Workspace {i}', organization=organization, created_by=user)
+        for i in range(WORKSPACES)
+    ]
+    now = timezone.now()
+    Document.objects.bulk_create(
+        Document(
+            title=f'Documento {i}', content='Contenido', workspace=workspaces[i % len(workspaces)],
+            created_by=user, is_deleted=i < TRASHED_DOCUMENTS,
+            deleted_at=now - timedelta(days=60) if i < TRASHED_DOCUMENTS else None,
+        )
+        for i in range(LIVE_DOCUMENTS + TRASHED_DOCUMENTS)
+    )
+    # Estadísticas al día para que el planificador estime con los datos sembrados
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE documents, workspaces')
+    return workspaces
+
+
+def _list_queryset(user, params=None):
+    """Queryset del listado tal como lo arma DocumentViewSet, ordenado y recortado como la paginación."""
+    request = APIRequestFactory().get('/api/v1/documents/documents/', params or {})
+    force_authenticate(request, user)
+    view = DocumentViewSet(action_map={'get': 'list'}, format_kwarg=None, args=(), kwargs={})
+    view.request = view.initialize_request(request)
+    queryset = view.filter_queryset(view.get_queryset())
+    return queryset.order_by(*DocumentCursorPagination.ordering)[:DocumentCursorPagination.page_size + 1]
+
+
+def test_list_uses_live_updated_index(user, workspaces):
+    assert 'documents_live_updated_idx' in _list_queryset(user).explain()
+
+
+def test_workspace_list_uses_live_workspace_index(user, workspaces):
+    plan = _list_queryset(user, {'workspace': workspaces[0].pk}).explain()
+    assert 'documents_live_ws_updated_idx' in plan
+
+
+def test_trash_uses_trash_index(user, workspaces):
+    # Mismo queryset que DocumentViewSet.trash
+    view = DocumentViewSet()
+    queryset = view._compact(
+        Document.objects.filter(is_deleted=True).defer('search_vector').with_list_data()
+    ).order_by('-updated_at')
+    assert 'documents_trash_deleted_idx' in queryset.explain()
+
+
+def test_cleanup_trash_batches_use_trash_index(workspaces):
+    # Queryset de cleanup_trash y el lote por rango de id de purge_documents
+    limit = timezone.now() - timedelta(days=30)
+    old_trashed_docs = Document.objects.filter(is_deleted=True, deleted_at__lt=limit)
+    batch = old_trashed_docs.filter(pk__gt=0).order_by('pk').values_list('pk', flat=True)[:500]
+    assert 'documents_trash_deleted_idx' in batch.explain()
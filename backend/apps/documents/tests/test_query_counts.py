@@ -0,0 +1,97 @@
+"""
+Regresión N+1: el número de consultas de los listados no debe crecer con las filas.
+
+Cada listado se pide con dos tamaños de página (o dos volúmenes de filas cuando la
+vista usa la paginación global) y se exige el mismo conteo de consultas.
+"""
+import pytest
+
+from apps.documents.models import Document, Workspace, WorkspaceType
+from apps.users.models import User
+
+DOCUMENTS_URL = '/api/v1/documents/documents/'
+TRASH_URL = '/api/v1/documents/documents/trash/'
+WORKSPACES_URL = '/api/v1/documents/workspaces/'
+WORKSPACE_TYPES_URL = '/api/v1/documents/workspace-types/'
+
+
+def _create_documents(workspace, organization, count, start=0):
+    """Crea documentos con autores distintos y una versión cada uno."""
+    documents = []
+    for i in range(start, start + count):
+        author = User.objects.create_user(
+            email=f'autor{i}@example.com', password='x', organization=organization
+        )
+        document = Document.objects.create(
+            title=f'Documento {i}', content=f'# Documento {i}',
+            workspace=workspace, created_by=author, last_modified_by=author,
+        )
+        document.create_version_snapshot(user=author, changes_description='Versión inicial')
+        documents.append(document)
+    return documents
+
+
+@pytest.fixture
+def workspace(organization, user):
+    return Workspace.objects.create(name='Principal', organization=organization, created_by=user)
+
+
+@pytest.mark.django_db
+def test_document_list_queries_do_not_depend_on_page_size(query_count, workspace, organization):
+    _create_documents(workspace, organization, 12)
+
+    small, response = query_count(f'{DOCUMENTS_URL}?page_size=2')
+    assert len(response.data['results']) == 2
+    large, response = query_count(f'{DOCUMENTS_URL}?page_size=12')
+    assert len(response.data['results']) == 12
+    assert small == large
+
+
+@pytest.mark.django_db
+def test_document_trash_queries_do_not_depend_on_rows(query_count, workspace, organization):
+    for document in _create_documents(workspace, organization, 2):
+        document.soft_delete()
+    small, response = query_count(TRASH_URL)
+    assert len(response.data) == 2
+
+    for document in _create_documents(workspace, organization, 8, start=2):
+        document.soft_delete()
+    large, response = query_count(TRASH_URL)
+    assert len(response.data) == 10
+    assert small == large
+
+
+def _create_workspaces(organization, user, count, start=0):
+    for i in range(start, start + count):
+        workspace_type = WorkspaceType.objects.create(
+            organization=organization, key=f'TIPO_{i}', label=f'Tipo {i}', created_by=user
+        )
+        workspace = Workspace.objects.create(
+            name=f'Workspace {i}', organization=organization,
+            workspace_type=workspace_type, created_by=user,
+        )
+        _create_documents(workspace, organization, 1, start=100 + i)
+
+
+@pytest.mark.django_db
+def test_workspace_list_queries_do_not_depend_on_rows(query_count, organization, user):
+    _create_workspaces(organization, user, 2)
+    small, response = query_count(WORKSPACES_URL)
+    assert response.data['count'] == 2
+
+    _create_workspaces(organization, user, 8, start=2)
+    large, response = query_count(WORKSPACES_URL)
+    assert response.data['count'] == 10
+    assert small == large
+
+
+@pytest.mark.django_db
+def test_workspace_type_list_queries_do_not_depend_on_rows(query_count, organization, user):
+    _create_workspaces(organization, user, 2)
+    small, response = query_count(WORKSPACE_TYPES_URL)
+    small_count = response.data['count']
+
+    _create_workspaces(organization, user, 8, start=2)
+    large, response = query_count(WORKSPACE_TYPES_URL)
+    assert response.data['count'] == small_count + 8
+    assert small == large
@@ -3,7 +3,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     WorkspaceTypeViewSet, WorkspaceViewSet, DocumentViewSet, DocumentVersionViewSet, DocumentCommentViewSet,
-    DocumentAttachmentViewSet, DocumentHistoryViewSet, DocumentReferenceViewSet
+    DocumentAttachmentViewSet, DocumentHistoryViewSet, DocumentReferenceViewSet, AttachmentUploadViewSet
 )
 
 router = DefaultRouter()
@@ -13,9 +13,12 @@ router.register(r'documents', DocumentViewSet, basename='document')
 router.register(r'versions', DocumentVersionViewSet, basename='version')
 router.register(r'comments', DocumentCommentViewSet, basename='comment')
 router.register(r'attachments', DocumentAttachmentViewSet, basename='attachment')
+router.register(r'attachment-uploads', AttachmentUploadViewSet, basename='attachment-upload')
 router.register(r'history', DocumentHistoryViewSet, basename='history')
 router.register(r'references', DocumentReferenceViewSet, basename='reference')
 
 urlpatterns = [
+    # Feed incremental de cambios; también disponible como documents/changes/
+    path('changes/', DocumentViewSet.as_view({'get': 'changes'}), name='document-changes'),
     path('', include(router.urls)),
 ]
@@ -1,18 +1,54 @@
 """Documents views."""
-from rest_framework import viewsets, filters, status
+from rest_framework import mixins, viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Max, Q
+from django.db.models.functions import Substr
+from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from .models import (
     WorkspaceType, Workspace, Document, DocumentVersion, DocumentComment,
-    DocumentAttachment, DocumentHistory, DocumentReference
+    DocumentAttachment, DocumentHistory, DocumentReference, AttachmentUpload, AttachmentText
 )
 from .serializers import (
     WorkspaceTypeSerializer, WorkspaceSerializer, DocumentSerializer, DocumentVersionSerializer, DocumentCommentSerializer,
-    DocumentAttachmentSerializer, DocumentHistorySerializer, DocumentReferenceSerializer
+    DocumentAttachmentSerializer, DocumentHistorySerializer, DocumentReferenceSerializer,
+    DocumentListSerializer, DocumentSearchResultSerializer, DocumentImportSerializer,
+    AttachmentUploadSerializer, DocumentChangeSerializer, DocumentLockSerializer
 )
+from .filters import DocumentSearchFilter, search_documents
+from .services.attachments import (
+    UploadOffsetError, abort_upload, add_attachment, complete_upload, delete_attachment,
+    start_upload, store_blob, upload_chunk_size, write_chunk
+)
+from .services.changes import START_CURSOR, changes_since, decode_cursor, head_cursor
+from .services.diffing import DIFF_GRANULARITIES, get_version_diff, previous_version_id
+from .services.export import EXPORT_FORMATS, export_response
+from .services.history import record_history
+from .services.importer import DocumentImporter, detect_format, iter_ndjson_rows, iter_zip_rows
+from .services.locks import (
+    DocumentLocked, acquire_lock, check_not_locked, get_active_lock, lock_ttl, release_lock, renew_lock
+)
+from .services.purge import purge_documents
+from apps.audit.services import record_audit
+from apps.core.concurrency import VersionConflict, if_match_tags
+from apps.core.conditional import ConditionalGetMixin, content_tag, set_validators
+from apps.core.pagination import DocumentCursorPagination, DocumentHistoryCursorPagination
+from apps.core.parsers import OctetStreamParser
+
+
+# Longitud del extracto de contenido que se devuelve en los listados de documentos
+LIST_EXCERPT_LENGTH = 200
+
+# Tamaño por defecto y máximo de cada respuesta del feed de cambios
+CHANGES_PAGE_SIZE = 100
+CHANGES_MAX_PAGE_SIZE = 1000
 
 
 class WorkspaceTypeViewSet(viewsets.ModelViewSet):
@@ -47,7 +83,7 @@ class WorkspaceTypeViewSet(viewsets.ModelViewSet):
         else:
             # Si el usuario no tiene organización, solo mostrar tipos globales
             queryset = queryset.filter(organization__isnull=True)
-        return queryset.filter(is_active=True)
+        return queryset.filter(is_active=True).select_related('created_by')
 
     def perform_create(self, serializer):
         """Assign organization and created_by when creating type."""
@@ -101,7 +137,7 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         if self.request.user.organization:
             queryset = queryset.filter(organization=self.request.user.organization)
-        return queryset
+        return queryset.select_related('created_by', 'workspace_type')
 
     def perform_create(self, serializer):
         """Assign organization and created_by when creating workspace."""
@@ -151,24 +187,82 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
             created_by=self.request.user
         )
 
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Exportar todos los documentos del workspace en streaming.
+
+        GET /api/v1/documents/workspaces/{id}/export/?export_format=zip|ndjson
+        - zip (por defecto): un archivo Markdown por documento
+        - ndjson: una línea JSON por documento con todas sus versiones
+        """
+        export_format = request.query_params.get('export_format', 'zip')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format debe ser uno de: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        workspace = self.get_object()
+        return export_response(workspace.documents.all(), export_format, workspace.name)
+
 
-class DocumentViewSet(viewsets.ModelViewSet):
-    queryset = Document.objects.filter(is_deleted=False)  # Excluir documentos eliminados
+class DocumentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = Document.objects.filter(is_deleted=False).defer('search_vector')  # Excluir documentos eliminados
     serializer_class = DocumentSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = DocumentCursorPagination
+    filter_backends = [DjangoFilterBackend, DocumentSearchFilter, filters.OrderingFilter]
     filterset_fields = ['workspace', 'project', 'status', 'user_story', 'task', 'documentation_standard']
     search_fields = ['title', 'content']
     ordering_fields = ['created_at', 'updated_at']
+    ordering = ['-updated_at', '-id']
 
     def get_queryset(self):
         """Filter documents by user's organization."""
+        queryset = self._scoped_queryset()
+        if self.action in ('list', 'retrieve', 'trash'):
+            queryset = queryset.with_list_data()
+        if self.action == 'list':
+            queryset = self._compact(queryset)
+        return queryset
+
+    def _scoped_queryset(self):
         queryset = super().get_queryset()
         if self.request.user.organization:
             # Filtrar documentos cuyo workspace pertenece a la organización del usuario
             queryset = queryset.filter(workspace__organization=self.request.user.organization)
         return queryset
 
+    def get_conditional_queryset(self):
+        """Validadores ETag sobre el queryset filtrado, sin joins ni anotaciones de listado."""
+        return self.filter_queryset(self._scoped_queryset())
+
+    def get_conditional_aggregates(self):
+        return {'version': Max('version')}
+
+    def get_conditional_state_aggregates(self):
+        # El bloqueo vigente forma parte de la representación (campo lock): tomarlo,
+        # renovarlo, soltarlo o que venza el lease cambia el ETag de GET, pero no
+        # su parte de contenido, así un PUT con If-Match no falla por el propio lease
+        active_lock = Q(lock__expires_at__gt=timezone.now())
+        return {
+            'lock_user': Max('lock__user_id', filter=active_lock),
+            'lock_acquired_at': Max('lock__acquired_at', filter=active_lock),
+            'lock_expires_at': Max('lock__expires_at', filter=active_lock),
+        }
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'trash'):
+            return DocumentListSerializer
+        return DocumentSerializer
+
+    def _compact(self, queryset):
+        """Evita leer content/content_html completos en listados; solo un extracto."""
+        return queryset.defer('content', 'content_html').annotate(
+            excerpt=Substr('content', 1, LIST_EXCERPT_LENGTH)
+        )
+
     def perform_create(self, serializer):
         """Al crear un documento, asignar created_by y versión inicial."""
         document = serializer.save(
@@ -183,9 +277,71 @@ class DocumentViewSet(viewsets.ModelViewSet):
             changes_description='Versión inicial del documento'
         )
 
+        self._record_activity(document, 'CREATE', 'CREATE', 'Documento creado')
+
+    def update(self, request, *args, **kwargs):
+        """
+        PUT/PATCH con control de concurrencia optimista.
+
+        La edición se aplica solo si el documento sigue en la versión sobre la
+        que se hizo, indicada con:
+        - If-Match: ETag obtenido en GET de esta misma URL, o la versión entre comillas ("1.003")
+        - base_version en el cuerpo ("1.003")
+        Sin ninguno de los dos se usa la versión leída en esta petición.
+        Si otro usuario guardó antes responde 412 con current_version.
+        """
+        partial = kwargs.pop('partial', False)
+        document = self.get_object()
+        try:
+            check_not_locked(document.pk, request.user)
+        except DocumentLocked as exc:
+            return self._locked_response(exc.lock)
+        if not self._preconditions_met(request, document):
+            return self._precondition_failed(document.pk)
+
+        serializer = self.get_serializer(document, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+
+        # UPDATE ... WHERE version = <leída>: falla si alguien escribió después de get_object()
+        document.expect_version(document.version)
+        try:
+            with transaction.atomic():
+                self.perform_update(serializer)
+        except VersionConflict:
+            return self._precondition_failed(document.pk)
+
+        if getattr(document, '_prefetched_objects_cache', None):
+            document._prefetched_objects_cache = {}
+
+        response = Response(serializer.data)
+        _, etag, last_modified = self.get_conditional_validators(self.get_conditional_object_queryset())
+        return set_validators(response, etag, last_modified)
+
+    def _preconditions_met(self, request, document):
+        base_version = request.data.get('base_version')
+        if base_version is not None and str(base_version) != document.version:
+            return False
+
+        tags = if_match_tags(request)
+        if not tags or '*' in tags or f'"{document.version}"' in tags:
+            return True
+        _, etag, _ = self.get_conditional_validators(self.get_conditional_object_queryset())
+        return content_tag(etag) in {content_tag(tag) for tag in tags}
+
+    def _precondition_failed(self, pk):
+        current = Document.objects.filter(pk=pk).values_list('version', flat=True).first()
+        return Response(
+            {
+                'error': 'El documento fue modificado por otro usuario; recarga antes de guardar',
+                'current_version': current,
+            },
+            status=status.HTTP_412_PRECONDITION_FAILED
+        )
+
     def perform_update(self, serializer):
         """Al actualizar, incrementar versión y crear snapshot."""
-        document = self.get_object()
+        document = serializer.instance
+        old_status = document.status
 
         # Permitir que el usuario defina la versión manualmente
         custom_version = self.request.data.get('custom_version')
@@ -218,14 +374,196 @@ class DocumentViewSet(viewsets.ModelViewSet):
             changes_description=changes_description
         )
 
+        self._record_activity(document, 'EDIT', 'UPDATE', changes_description, new_value=document.version)
+        if document.status != old_status:
+            record_history(
+                document, 'STATUS_CHANGE', 'Cambio de estado', self.request.user,
+                old_value=old_status, new_value=document.status
+            )
+
+    def destroy(self, request, *args, **kwargs):
+        document = self.get_object()
+        try:
+            check_not_locked(document.pk, request.user)
+        except DocumentLocked as exc:
+            return self._locked_response(exc.lock)
+        self.perform_destroy(document)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     def perform_destroy(self, instance):
         """Soft delete: mover a papelera en lugar de eliminar."""
         instance.soft_delete(user=self.request.user)
+        self._record_activity(instance, 'DELETE', 'DELETE', 'Documento movido a la papelera')
+
+    def _record_activity(self, document, history_action, audit_action, description, old_value='', new_value=''):
+        """Historial del documento + AuditLog; se escriben por lotes fuera de la petición."""
+        record_history(document, history_action, description, self.request.user, old_value, new_value)
+        record_audit(
+            self.request, self.request.user.organization_id, audit_action, 'document', document.pk,
+            description, resource_name=document.title
+        )
+
+    def _locked_response(self, lock):
+        return Response(
+            {
+                'error': f'El documento está siendo editado por {lock.user.get_full_name() or lock.user.email}',
+                'lock': DocumentLockSerializer(lock).data,
+            },
+            status=status.HTTP_423_LOCKED
+        )
+
+    def _lock_target(self, pk):
+        """(id, organización) del documento visible para el usuario, sin cargar su contenido."""
+        target = self._scoped_queryset().filter(pk=pk).values_list('pk', 'workspace__organization_id').first()
+        if target is None:
+            raise Http404
+        return target
+
+    @action(detail=True, methods=['get', 'post', 'delete'])
+    def lock(self, request, pk=None):
+        """
+        Bloqueo de edición con lease.
+
+        GET    /api/v1/documents/documents/{id}/lock/ - bloqueo vigente (lock: null si no hay)
+        POST   /api/v1/documents/documents/{id}/lock/ - tomar (o renovar el propio); 423 si lo tiene otro
+        DELETE /api/v1/documents/documents/{id}/lock/ - soltar el propio
+
+        El lease vence tras ttl segundos: renovarlo con POST .../heartbeat/ mientras se edita.
+        """
+        document_id, organization_id = self._lock_target(pk)
+
+        if request.method == 'GET':
+            lock = get_active_lock(document_id)
+            return Response({'lock': DocumentLockSerializer(lock).data if lock else None, 'ttl': lock_ttl()})
+
+        if request.method == 'DELETE':
+            if not release_lock(document_id, request.user, organization_id):
+                return Response(
+                    {'error': 'No tienes el bloqueo de este documento'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        try:
+            lock = acquire_lock(document_id, request.user, organization_id)
+        except DocumentLocked as exc:
+            return self._locked_response(exc.lock)
+        return Response({'lock': DocumentLockSerializer(lock).data, 'ttl': lock_ttl()})
+
+    @action(detail=True, methods=['post'])
+    def heartbeat(self, request, pk=None):
+        """Renueva el lease propio; 409 si ya venció o lo tomó otro usuario."""
+        document_id, _ = self._lock_target(pk)
+        lock = renew_lock(document_id, request.user)
+        if lock is None:
+            return Response(
+                {'error': 'El bloqueo venció o lo tomó otro usuario; vuelve a tomarlo'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response({'lock': DocumentLockSerializer(lock).data, 'ttl': lock_ttl()})
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Búsqueda de texto completo ordenada por relevancia.
+
+        GET /api/v1/documents/documents/search/?q=<términos>
+        Acepta los mismos filtros que el listado (workspace, project, status...).
+        """
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response(
+                {'error': 'El parámetro q es requerido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        queryset = search_documents(
+            queryset.select_related('workspace', 'project', 'last_modified_by'),
+            text
+        )
+
+        # Los resultados se ordenan por relevancia, no por tiempo: paginación por número de página
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        if page is not None:
+            serializer = DocumentSearchResultSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = DocumentSearchResultSerializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Feed incremental de cambios en documentos, comentarios y adjuntos.
+
+        GET /api/v1/documents/changes/?since=<cursor>&limit=<n>
+        (también en /api/v1/documents/documents/changes/)
+        - since: cursor `next` de la respuesta anterior; omitido, desde el principio;
+          `now`, solo retorna el cursor actual (para seguir el feed tras un listado completo)
+        - limit: cambios por respuesta (por defecto 100, máximo 1000)
+
+        Acciones: created, updated, deleted (papelera), restored, purged.
+        Si has_more es true, pedir de nuevo con since=next.
+        """
+        since = request.query_params.get('since')
+        if since == 'now':
+            return Response({'results': [], 'next': head_cursor(), 'has_more': False})
+
+        try:
+            cursor = decode_cursor(since) if since else START_CURSOR
+            limit = min(int(request.query_params.get('limit', CHANGES_PAGE_SIZE)), CHANGES_MAX_PAGE_SIZE)
+        except ValueError:
+            return Response(
+                {'error': 'since debe ser un cursor válido y limit un entero'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limit < 1:
+            return Response({'error': 'limit debe ser mayor que 0'}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes, next_cursor, has_more = changes_since(cursor, request.user.organization, limit)
+        return Response({
+            'results': DocumentChangeSerializer(changes, many=True).data,
+            'next': next_cursor,
+            'has_more': has_more,
+        })
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_documents(self, request):
+        """
+        Importación masiva desde NDJSON o ZIP de archivos Markdown.
+
+        POST /api/v1/documents/documents/import/ (multipart)
+        - file: archivo .ndjson o .zip
+        - workspace / project: destino de todas las filas (si se omite, se usa el de cada fila)
+        - batch_size: filas por lote (por defecto 500)
+        - start_batch: lote desde el que reanudar (last_completed_batch + 1)
+
+        Responde con un reporte por lote y los errores de cada fila rechazada.
+        """
+        serializer = DocumentImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        uploaded = data['file']
+        rows = iter_zip_rows(uploaded) if detect_format(uploaded) == 'zip' else iter_ndjson_rows(uploaded)
+
+        importer = DocumentImporter(request.user, workspace_id=data.get('workspace'), project_id=data.get('project'))
+        report = importer.run(rows, batch_size=data['batch_size'], start_batch=data['start_batch'])
+
+        if report['interrupted']:
+            return Response(report, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if not report['created'] and report['failed']:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['get'])
     def trash(self, request):
         """Listar documentos en la papelera."""
-        trashed_docs = Document.objects.filter(is_deleted=True)
+        trashed_docs = self._compact(
+            Document.objects.filter(is_deleted=True).defer('search_vector').with_list_data()
+        ).order_by('-updated_at')
         serializer = self.get_serializer(trashed_docs, many=True)
         return Response(serializer.data)
 
@@ -258,7 +596,8 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        document.delete()  # Hard delete
+        # Hard delete por lotes: sin cargar versiones/historial en memoria, borra archivos adjuntos
+        purge_documents(Document.objects.filter(pk=document.pk))
 
         return Response(
             {'message': 'Documento eliminado permanentemente'},
@@ -268,10 +607,72 @@ class DocumentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def versions(self, request, pk=None):
         """Obtener todas las versiones de un documento."""
+        def render():
+            document = self.get_object()
+            versions = document.versions.select_related('created_by').order_by('-created_at')
+            serializer = DocumentVersionSerializer(versions, many=True)
+            return Response(serializer.data)
+
+        # Cada nueva versión actualiza updated_at/version del documento
+        return self.conditional_response(self.get_conditional_object_queryset(), render, detail=True)
+
+    @action(detail=True, methods=['get'])
+    def diff(self, request, pk=None):
+        """
+        Diff entre dos versiones del documento.
+
+        GET /api/v1/documents/documents/{id}/diff/?from=<version_id>&to=<version_id>&granularity=line|word
+        - to: por defecto la última versión
+        - from: por defecto la versión anterior a `to`
+        Retorna el diff (unificado por líneas o segmentos por palabra) y estadísticas.
+        """
+        granularity = request.query_params.get('granularity', 'line')
+        if granularity not in DIFF_GRANULARITIES:
+            return Response(
+                {'error': f"granularity debe ser uno de: {', '.join(DIFF_GRANULARITIES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         document = self.get_object()
-        versions = document.versions.all().order_by('-created_at')
-        serializer = DocumentVersionSerializer(versions, many=True)
-        return Response(serializer.data)
+        versions = DocumentVersion.objects.filter(document=document).only(
+            'id', 'document_id', 'version_number', 'created_at'
+        )
+
+        try:
+            to_id = request.query_params.get('to')
+            to_version = versions.get(pk=int(to_id)) if to_id else versions.order_by('-id').first()
+            from_id = request.query_params.get('from')
+            if from_id:
+                from_version = versions.get(pk=int(from_id))
+            else:
+                previous_id = previous_version_id(to_version) if to_version else None
+                from_version = versions.get(pk=previous_id) if previous_id else None
+        except (ValueError, DocumentVersion.DoesNotExist):
+            return Response(
+                {'error': 'Versión no encontrada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if from_version is None or to_version is None:
+            return Response(
+                {'error': 'El documento no tiene dos versiones para comparar'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        memo, cached = get_version_diff(from_version.id, to_version.id, granularity)
+        response = Response({
+            'document': document.id,
+            'from': {'id': from_version.id, 'version_number': from_version.version_number, 'created_at': from_version.created_at},
+            'to': {'id': to_version.id, 'version_number': to_version.version_number, 'created_at': to_version.created_at},
+            'granularity': granularity,
+            'stats': memo.stats,
+            'diff': memo.diff,
+            'cached': cached,
+        })
+        if request.query_params.get('to'):
+            # Par de versiones explícito: el resultado no cambia nunca
+            patch_cache_control(response, private=True, max_age=86400)
+        return response
 
     @action(detail=True, methods=['post'])
     def revert_to_version(self, request, pk=None):
@@ -318,7 +719,7 @@ class DocumentViewSet(viewsets.ModelViewSet):
 
 
 class DocumentVersionViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = DocumentVersion.objects.all()
+    queryset = DocumentVersion.objects.select_related('created_by')
     serializer_class = DocumentVersionSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -326,7 +727,7 @@ class DocumentVersionViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class DocumentCommentViewSet(viewsets.ModelViewSet):
-    queryset = DocumentComment.objects.all()
+    queryset = DocumentComment.objects.select_related('created_by')
     serializer_class = DocumentCommentSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -334,17 +735,139 @@ class DocumentCommentViewSet(viewsets.ModelViewSet):
 
 
 class DocumentAttachmentViewSet(viewsets.ModelViewSet):
-    queryset = DocumentAttachment.objects.all()
+    queryset = DocumentAttachment.objects.select_related('uploaded_by')
     serializer_class = DocumentAttachmentSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['document']
 
+    def perform_create(self, serializer):
+        """El archivo se guarda una sola vez por contenido (SHA-256) y se comparte entre adjuntos."""
+        data = serializer.validated_data
+        blob = store_blob(data['file'])
+        try:
+            serializer.instance = add_attachment(
+                data['document'], blob, self.request.user,
+                data['file_name'], data.get('file_type', ''), data.get('description', '')
+            )
+        except ValueError as exc:
+            # El blob se eliminó entre store_blob y add_attachment: mismo 400 que las subidas por partes
+            raise ValidationError({'error': str(exc)})
+
+    def perform_destroy(self, instance):
+        delete_attachment(instance)
+
+    @action(detail=True, methods=['get'])
+    def text(self, request, pk=None):
+        """Texto extraído del archivo (para búsqueda y contexto de IA); status PENDING si aún no existe."""
+        attachment = self.get_object()
+        extracted = AttachmentText.objects.filter(blob_id=attachment.blob_id).first() if attachment.blob_id else None
+        if extracted is None:
+            return Response({'status': 'PENDING', 'kind': '', 'text': '', 'truncated': False})
+        return Response({
+            'status': extracted.status,
+            'kind': extracted.kind,
+            'text': extracted.text,
+            'truncated': extracted.truncated,
+            'error': extracted.error,
+        })
+
+
+def _chunk_offset(request):
+    """Offset de la parte: cabecera Content-Range (bytes inicio-fin/total) o parámetro offset."""
+    content_range = request.headers.get('Content-Range', '')
+    if content_range.startswith('bytes '):
+        start = content_range[6:].split('-', 1)[0]
+    else:
+        start = request.query_params.get('offset', '')
+    try:
+        return int(start)
+    except ValueError:
+        return None
+
+
+class AttachmentUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                              mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Subidas de adjuntos por partes, reanudables y deduplicadas por SHA-256.
+
+    Endpoints:
+    - POST /api/v1/documents/attachment-uploads/ - Iniciar (nace COMPLETED si el contenido ya existe)
+    - GET /api/v1/documents/attachment-uploads/{id}/ - Estado y received_bytes para reanudar
+    - PUT /api/v1/documents/attachment-uploads/{id}/chunk/ - Enviar una parte (octet-stream + Content-Range)
+    - POST /api/v1/documents/attachment-uploads/{id}/complete/ - Verificar el hash y crear el adjunto
+    - DELETE /api/v1/documents/attachment-uploads/{id}/ - Cancelar la subida
+    """
+    serializer_class = AttachmentUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return AttachmentUpload.objects.filter(created_by=self.request.user).select_related(
+            'attachment__uploaded_by'
+        )
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = start_upload(user=request.user, **serializer.validated_data)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(upload).data, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        abort_upload(instance)
+
+    @action(detail=True, methods=['put'], parser_classes=[OctetStreamParser])
+    def chunk(self, request, pk=None):
+        """Escribe una parte; si no continúa donde terminó la anterior responde 409 con received_bytes."""
+        upload = self.get_object()
+        offset = _chunk_offset(request)
+        if offset is None:
+            return Response(
+                {'error': 'Indica el offset con Content-Range: bytes inicio-fin/total o ?offset='},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        data = request.data if isinstance(request.data, bytes) else b''
+        if not data:
+            return Response({'error': 'La parte está vacía'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(data) > upload_chunk_size():
+            return Response(
+                {'error': f'Cada parte admite como máximo {upload_chunk_size()} bytes'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        try:
+            upload = write_chunk(upload, offset, data)
+        except UploadOffsetError as exc:
+            return Response(
+                {'error': str(exc), 'received_bytes': exc.expected},
+                status=status.HTTP_409_CONFLICT
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """Verifica el SHA-256 del archivo recibido y crea el adjunto (idempotente)."""
+        upload = self.get_object()
+        try:
+            upload = complete_upload(upload)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = self.get_serializer(upload).data
+        if upload.status == 'FAILED':
+            return Response(data, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
 
 class DocumentHistoryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = DocumentHistory.objects.all()
+    queryset = DocumentHistory.objects.select_related('performed_by')
     serializer_class = DocumentHistorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DocumentHistoryCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['document', 'action']
 
@@ -1,22 +1,23 @@
 """Projects serializers."""
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import Client, Methodology, Project, ProjectMember, ProjectPhase, ProjectStatus
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Client
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
 
 
-class MethodologySerializer(serializers.ModelSerializer):
+class MethodologySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Methodology
         fields = '__all__'
 
 
-class ProjectMemberSerializer(serializers.ModelSerializer):
+class ProjectMemberSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
 
@@ -25,14 +26,14 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         fields = ['id', 'project', 'user', 'user_name', 'user_email', 'role', 'is_active', 'joined_at']
 
 
-class ProjectPhaseSerializer(serializers.ModelSerializer):
+class ProjectPhaseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ProjectPhase
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     client_name = serializers.CharField(source='client.name', read_only=True)
     methodology_name = serializers.CharField(source='methodology.name', read_only=True)
@@ -53,7 +54,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ProjectStatusSerializer(serializers.ModelSerializer):
+class ProjectStatusSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     changed_by_name = serializers.CharField(source='changed_by.get_full_name', read_only=True)
 
     class Meta:
@@ -1,12 +1,15 @@
 """Projects views."""
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Client, Methodology, Project, ProjectMember, ProjectPhase, ProjectStatus
 from .serializers import (
     ClientSerializer, MethodologySerializer, ProjectSerializer,
     ProjectMemberSerializer, ProjectPhaseSerializer, ProjectStatusSerializer
 )
+from apps.documents.services.export import EXPORT_FORMATS, export_response
 
 
 class ClientViewSet(viewsets.ModelViewSet):
@@ -36,6 +39,29 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Exportar todos los documentos del proyecto en streaming.
+
+        GET /api/v1/projects/projects/{id}/export/?export_format=zip|ndjson
+        """
+        export_format = request.query_params.get('export_format', 'zip')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format debe ser uno de: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        project = self.get_object()
+        if project.organization_id != request.user.organization_id:
+            return Response(
+                {'error': 'No tienes permisos para exportar este proyecto'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        return export_response(project.documents.all(), export_format, project.code)
+
 
 class ProjectMemberViewSet(viewsets.ModelViewSet):
     queryset = ProjectMember.objects.all()
@@ -55,7 +55,7 @@ class DocumentationStandardAdmin(admin.ModelAdmin):
     requires_diagram_badge.short_description = 'Genera Diagramas'
 
     def examples_count(self, obj):
-        count = obj.examples.filter(is_active=True).count()
+        count = obj.active_examples_count
         if count > 0:
             return format_html(
                 '<span style="background-color: #2196F3; color: white; padding: 3px 10px; border-radius: 3px;">{} ejemplos</span>',
@@ -0,0 +1,36 @@
+"""
+Management command to inspect or clear the LLM response cache.
+
+Usage:
+    python manage.py llm_cache
+    python manage.py llm_cache --clear
+
+Prints hits, misses, hit rate and stored entries of the configured backend
+(LLM_CACHE_BACKEND). With the local backend the numbers belong to the
+process running the command, so they are only meaningful with Redis.
+"""
+from django.core.management.base import BaseCommand
+from apps.standards.services.llm_cache import get_llm_cache, llm_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Muestra los contadores de la caché de respuestas del LLM o la vacía'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Elimina todas las respuestas guardadas y reinicia los contadores'
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            get_llm_cache().clear()
+            self.stdout.write(self.style.SUCCESS('✓ Caché del LLM vaciada.'))
+            return
+
+        stats = llm_cache_stats()
+        self.stdout.write(
+            f"Aciertos: {stats['hits']}  Fallos: {stats['misses']}  "
+            f"Tasa de aciertos: {stats['hit_rate']:.1%}  Entradas: {stats['entries']}"
+        )
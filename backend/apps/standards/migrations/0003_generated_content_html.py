@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0002_make_organization_nullable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aigenerationtest',
+            name='generated_content_html',
+            field=models.TextField(blank=True, editable=False, help_text='HTML sanitizado de generated_content (renderizado en el servidor)'),
+        ),
+        migrations.AddField(
+            model_name='documentationexample',
+            name='generated_content_html',
+            field=models.TextField(blank=True, editable=False, help_text='HTML sanitizado de generated_content (renderizado en el servidor)'),
+        ),
+    ]
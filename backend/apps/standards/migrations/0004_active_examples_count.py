@@ -0,0 +1,107 @@
+# Generated by Django 5.0.1 on 2026-10-17 10:45
+
+from django.db import migrations, models
+
+# SQL generado con apps.core.counters al crear esta migración, congelado aquí para
+# que cambios posteriores en esos helpers no alteren lo que ejecuta en una base nueva.
+# Contador: documentation_standards.active_examples_count (ejemplos activos).
+CREATE_TRIGGER_SQL = {
+    'postgresql': [
+        """
+CREATE OR REPLACE FUNCTION documentation_examples_active_examples_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.standard_id IS NOT DISTINCT FROM NEW.standard_id AND (OLD.is_active) = (NEW.is_active) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.standard_id IS NOT NULL AND (OLD.is_active) THEN
+            UPDATE documentation_standards SET active_examples_count = GREATEST(active_examples_count - 1, 0) WHERE id = OLD.standard_id;
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.standard_id IS NOT NULL AND (NEW.is_active) THEN
+            UPDATE documentation_standards SET active_examples_count = active_examples_count + 1 WHERE id = NEW.standard_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_trigger ON documentation_examples',
+        """
+CREATE TRIGGER documentation_examples_active_examples_count_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF standard_id, is_active ON documentation_examples
+    FOR EACH ROW EXECUTE FUNCTION documentation_examples_active_examples_count_update()""",
+        'UPDATE documentation_standards SET active_examples_count = (SELECT COUNT(*) FROM documentation_examples WHERE documentation_examples.standard_id = documentation_standards.id AND documentation_examples.is_active)',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_insert',
+        """
+CREATE TRIGGER documentation_examples_active_examples_count_insert AFTER INSERT ON documentation_examples
+FOR EACH ROW WHEN NEW.standard_id IS NOT NULL AND (NEW.is_active)
+BEGIN
+    UPDATE documentation_standards SET active_examples_count = active_examples_count + 1 WHERE id = NEW.standard_id;
+END""",
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_delete',
+        """
+CREATE TRIGGER documentation_examples_active_examples_count_delete AFTER DELETE ON documentation_examples
+FOR EACH ROW WHEN OLD.standard_id IS NOT NULL AND (OLD.is_active)
+BEGIN
+    UPDATE documentation_standards SET active_examples_count = MAX(active_examples_count - 1, 0) WHERE id = OLD.standard_id;
+END""",
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_change',
+        """
+CREATE TRIGGER documentation_examples_active_examples_count_change AFTER UPDATE OF standard_id, is_active ON documentation_examples
+FOR EACH ROW WHEN NOT (OLD.standard_id IS NEW.standard_id AND (OLD.is_active) = (NEW.is_active))
+BEGIN
+    UPDATE documentation_standards SET active_examples_count = MAX(active_examples_count - 1, 0) WHERE id = OLD.standard_id AND (OLD.is_active);
+    UPDATE documentation_standards SET active_examples_count = active_examples_count + 1 WHERE id = NEW.standard_id AND (NEW.is_active);
+END""",
+        'UPDATE documentation_standards SET active_examples_count = (SELECT COUNT(*) FROM documentation_examples WHERE documentation_examples.standard_id = documentation_standards.id AND documentation_examples.is_active)',
+    ],
+}
+
+
+DROP_TRIGGER_SQL = {
+    'postgresql': [
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_trigger ON documentation_examples',
+        'DROP FUNCTION IF EXISTS documentation_examples_active_examples_count_update()',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_insert',
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_delete',
+        'DROP TRIGGER IF EXISTS documentation_examples_active_examples_count_change',
+    ],
+}
+
+
+def _execute(schema_editor, statements):
+    vendor = schema_editor.connection.vendor
+    for statement in statements['postgresql' if vendor == 'postgresql' else 'sqlite']:
+        schema_editor.execute(statement)
+
+
+def create_counter_trigger(apps, schema_editor):
+    """Crea el trigger del contador de ejemplos activos y calcula su valor inicial."""
+    _execute(schema_editor, CREATE_TRIGGER_SQL)
+
+
+def drop_counter_trigger(apps, schema_editor):
+    _execute(schema_editor, DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0003_generated_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentationstandard',
+            name='active_examples_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(create_counter_trigger, reverse_code=drop_counter_trigger),
+    ]
@@ -2,9 +2,11 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from apps.users.models import Organization, User
+from apps.core.counters import CounterFieldsMixin
+from apps.core.markdown import MarkdownRenderMixin
 
 
-class DocumentationStandard(models.Model):
+class DocumentationStandard(CounterFieldsMixin, models.Model):
     """
     Estándar de documentación - Define una categoría de documentación.
     Ejemplos: Casos de Uso, Diagramas UML, APIs REST, Base de Datos, etc.
@@ -68,6 +70,10 @@ class DocumentationStandard(models.Model):
         null=True,
         related_name='created_standards'
     )
+    # Contador mantenido por trigger (ver apps.core.counters)
+    active_examples_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = {'active_examples_count': ('examples', {'is_active': True})}
 
     class Meta:
         db_table = 'documentation_standards'
@@ -81,7 +87,7 @@ class DocumentationStandard(models.Model):
         return f"{self.name} (Global)"
 
 
-class DocumentationExample(models.Model):
+class DocumentationExample(MarkdownRenderMixin, models.Model):
     """
     Ejemplo de documentación - Muestra cómo debe verse el output final.
     Cada ejemplo incluye un 'enunciado' (input) y el 'documento generado' (output).
@@ -106,6 +112,11 @@ class DocumentationExample(models.Model):
     generated_content = models.TextField(
         help_text="Contenido del documento generado (texto, markdown, etc.)"
     )
+    generated_content_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="HTML sanitizado de generated_content (renderizado en el servidor)"
+    )
     diagram_code = models.TextField(
         blank=True,
         help_text="Código del diagrama (Mermaid, PlantUML, etc.) si aplica"
@@ -150,6 +161,8 @@ class DocumentationExample(models.Model):
         related_name='created_examples'
     )
 
+    markdown_fields = {'generated_content': 'generated_content_html'}
+
     class Meta:
         db_table = 'documentation_examples'
         ordering = ['order', '-created_at']
@@ -160,7 +173,7 @@ class DocumentationExample(models.Model):
         return f"{self.title} - {self.standard.name}"
 
 
-class AIGenerationTest(models.Model):
+class AIGenerationTest(MarkdownRenderMixin, models.Model):
     """
     Prueba de generación con IA - Testing de cómo la IA genera docs.
     El usuario escribe solo el enunciado y la IA genera el documento basándose en los ejemplos.
@@ -189,6 +202,11 @@ class AIGenerationTest(models.Model):
         blank=True,
         help_text="Contenido generado por la IA"
     )
+    generated_content_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="HTML sanitizado de generated_content (renderizado en el servidor)"
+    )
     generated_diagram_code = models.TextField(
         blank=True,
         help_text="Código del diagrama generado (si aplica)"
@@ -234,6 +252,8 @@ class AIGenerationTest(models.Model):
         related_name='ai_tests'
     )
 
+    markdown_fields = {'generated_content': 'generated_content_html'}
+
     class Meta:
         db_table = 'ai_generation_tests'
         ordering = ['-created_at']
@@ -1,5 +1,7 @@
 """Standards serializers - AI-powered documentation generation."""
 from rest_framework import serializers
+from apps.ai_engine.models import AIGenerationLog
+from apps.core.serializers import SparseFieldsetMixin
 from .models import (
     DocumentationStandard,
     DocumentationExample,
@@ -7,7 +9,7 @@ from .models import (
 )
 
 
-class DocumentationExampleSerializer(serializers.ModelSerializer):
+class DocumentationExampleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Documentation example serializer."""
     standard_name = serializers.CharField(source='standard.name', read_only=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -16,17 +18,17 @@ class DocumentationExampleSerializer(serializers.ModelSerializer):
         model = DocumentationExample
         fields = [
             'id', 'standard', 'standard_name', 'title', 'input_prompt',
-            'generated_content', 'diagram_code', 'diagram_image',
+            'generated_content', 'generated_content_html', 'diagram_code', 'diagram_image',
             'tags', 'complexity_level', 'order', 'is_featured', 'is_active',
             'created_at', 'updated_at', 'created_by', 'created_by_name'
         ]
         read_only_fields = ['created_at', 'updated_at', 'created_by']
 
 
-class DocumentationStandardListSerializer(serializers.ModelSerializer):
+class DocumentationStandardListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Documentation standard list serializer - simplified for list views."""
     organization_name = serializers.CharField(source='organization.name', read_only=True)
-    examples_count = serializers.SerializerMethodField()
+    examples_count = serializers.IntegerField(source='active_examples_count', read_only=True)
     category_display = serializers.CharField(source='get_category_display', read_only=True)
 
     class Meta:
@@ -39,16 +41,13 @@ class DocumentationStandardListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'organization']
 
-    def get_examples_count(self, obj):
-        return obj.examples.filter(is_active=True).count()
 
-
-class DocumentationStandardDetailSerializer(serializers.ModelSerializer):
+class DocumentationStandardDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Documentation standard detail serializer - includes examples."""
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     examples = DocumentationExampleSerializer(many=True, read_only=True)
-    examples_count = serializers.SerializerMethodField()
+    examples_count = serializers.IntegerField(source='active_examples_count', read_only=True)
     category_display = serializers.CharField(source='get_category_display', read_only=True)
 
     class Meta:
@@ -62,11 +61,8 @@ class DocumentationStandardDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'organization']
 
-    def get_examples_count(self, obj):
-        return obj.examples.filter(is_active=True).count()
-
 
-class AIGenerationTestSerializer(serializers.ModelSerializer):
+class AIGenerationTestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """AI generation test serializer."""
     standard_name = serializers.CharField(source='standard.name', read_only=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -76,7 +72,8 @@ class AIGenerationTestSerializer(serializers.ModelSerializer):
         model = AIGenerationTest
         fields = [
             'id', 'standard', 'standard_name', 'user_prompt',
-            'generated_content', 'generated_diagram_code', 'generated_diagram_image',
+            'generated_content', 'generated_content_html',
+            'generated_diagram_code', 'generated_diagram_image',
             'status', 'status_display', 'ai_model_used', 'generation_time_seconds',
             'error_message', 'user_rating', 'user_feedback',
             'created_at', 'updated_at', 'created_by', 'created_by_name'
@@ -88,6 +85,20 @@ class AIGenerationTestSerializer(serializers.ModelSerializer):
         ]
 
 
+class AIGenerationJobSerializer(serializers.ModelSerializer):
+    """Estado de un trabajo de generación encolado (AIGenerationLog)."""
+    job_id = serializers.IntegerField(source='id', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = AIGenerationLog
+        fields = [
+            'job_id', 'job_type', 'status', 'status_display', 'result', 'error_message',
+            'model_used', 'execution_time', 'created_at', 'completed_at'
+        ]
+        read_only_fields = fields
+
+
 class GenerateDocumentationInputSerializer(serializers.Serializer):
     """Input serializer for generating documentation."""
     standard_id = serializers.IntegerField(required=True)
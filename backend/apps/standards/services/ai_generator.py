@@ -5,10 +5,17 @@ Este servicio genera documentación automáticamente usando IA,
 basándose en ejemplos proporcionados en los estándares.
 """
 
+import logging
 import time
-import os
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from django.conf import settings
+from apps.documents.services.rendering import get_rendered_html
+from .llm_cache import cached_completion, cached_stream
+from .llm_gateway import LLMError, LLMGateway, OpenAIBackend, get_llm_gateway
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "Eres un experto en documentación técnica de software. Generas documentación clara, profesional y detallada."
 
 
 class AIDocumentationGenerator:
@@ -19,19 +26,22 @@ class AIDocumentationGenerator:
     1. Recibe un estándar y un prompt del usuario
     2. Obtiene ejemplos relevantes del estándar
     3. Construye un prompt completo con few-shot learning
-    4. Llama a la API de IA (OpenAI, Claude, etc.)
+    4. Llama a la API de IA a través del gateway (llm_gateway)
     5. Retorna el documento generado
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4", gateway: Optional[LLMGateway] = None):
         """
         Inicializa el generador.
 
         Args:
-            api_key: API key para el servicio de IA (OpenAI, Anthropic, etc.)
+            api_key: API key de OpenAI distinta de OPENAI_API_KEY (usa un cliente propio)
             model: Modelo a usar (gpt-4, claude-3-opus, etc.)
+            gateway: Gateway a usar; por defecto el del proceso (get_llm_gateway)
         """
-        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        if gateway is None:
+            gateway = LLMGateway(OpenAIBackend(api_key)) if api_key else get_llm_gateway()
+        self.gateway = gateway
         self.model = model
         self.max_examples = 5  # Máximo de ejemplos a incluir en el prompt
 
@@ -39,7 +49,9 @@ class AIDocumentationGenerator:
         self,
         standard,
         user_prompt: str,
-        examples: Optional[List] = None
+        examples: Optional[List] = None,
+        organization=None,
+        use_cache: bool = True
     ) -> Dict:
         """
         Genera documentación basándose en un estándar y prompt del usuario.
@@ -48,36 +60,92 @@ class AIDocumentationGenerator:
             standard: Instancia de DocumentationStandard
             user_prompt: Texto del usuario describiendo lo que necesita
             examples: Lista opcional de ejemplos (si no se provee, se obtienen del standard)
+            organization: Organización que pide la generación (por defecto la del estándar);
+                delimita la caché de respuestas
+            use_cache: False para ignorar una respuesta guardada y llamar a la API
 
         Returns:
             Dict con:
                 - content: Contenido generado
+                - content_html: HTML sanitizado del contenido (caché por hash)
                 - diagram_code: Código del diagrama (si aplica)
                 - model_used: Modelo de IA usado
                 - generation_time: Tiempo de generación en segundos
+                - cached: True si la respuesta salió de la caché
         """
         start_time = time.time()
 
-        # Obtener ejemplos si no se proporcionaron
-        if examples is None:
-            examples = list(
-                standard.examples.filter(is_active=True)
-                .order_by('-is_featured', 'order')[:self.max_examples]
-            )
-
         # Construir el prompt completo
-        full_prompt = self._build_prompt(standard, user_prompt, examples)
+        full_prompt = self._build_prompt(standard, user_prompt, self._resolve_examples(standard, examples))
 
         # Generar con IA
-        result = self._call_ai_api(full_prompt, standard)
+        if organization is None:
+            organization = standard.organization_id
+        result = self._call_ai_api(full_prompt, standard, organization=organization, use_cache=use_cache)
+
+        return self._build_result(result, start_time)
+
+    def generate_stream(
+        self,
+        standard,
+        user_prompt: str,
+        examples: Optional[List] = None,
+        organization=None,
+        use_cache: bool = True
+    ) -> Iterator[Tuple[str, object]]:
+        """
+        Como generate(), pero entrega el texto a medida que lo produce el modelo.
+
+        Genera tuplas (evento, datos):
+            - ('token', fragmento) por cada fragmento de texto recibido
+            - ('result', dict) al terminar, con el mismo dict que generate()
+              (contenido y diagrama ya separados)
+
+        Sin API key, o si la llamada no se puede abrir, el contenido mock se
+        envía como un único fragmento. Un error a mitad del stream se propaga.
+        """
+        start_time = time.time()
 
+        full_prompt = self._build_prompt(standard, user_prompt, self._resolve_examples(standard, examples))
+        if organization is None:
+            organization = standard.organization_id
+
+        chunks, cached = self._open_stream(full_prompt, organization=organization, use_cache=use_cache)
+        if chunks is None:
+            result = self._mock_generation(full_prompt, standard)
+            yield 'token', result['content']
+        else:
+            parts = []
+            for chunk in chunks:
+                parts.append(chunk)
+                yield 'token', chunk
+            content, diagram_code = self._parse_generated_text(''.join(parts), standard)
+            result = {'content': content, 'diagram_code': diagram_code, 'cached': cached}
+
+        yield 'result', self._build_result(result, start_time)
+
+    def _resolve_examples(self, standard, examples: Optional[List]) -> List:
+        """Los ejemplos recibidos o, si no se proporcionaron, los del estándar."""
+        if examples is not None:
+            return examples
+        return list(
+            standard.examples.filter(is_active=True)
+            .order_by('-is_featured', 'order')[:self.max_examples]
+        )
+
+    def _build_result(self, result: Dict, start_time: float) -> Dict:
+        """Respuesta de generate() a partir del resultado de la API (o del mock)."""
         generation_time = time.time() - start_time
 
+        content = result.get('content', '')
+
         return {
-            'content': result.get('content', ''),
+            'content': content,
+            'content_html': get_rendered_html(content),
             'diagram_code': result.get('diagram_code', ''),
             'model_used': self.model,
-            'generation_time': generation_time
+            'generation_time': generation_time,
+            'cached': result.get('cached', False)
         }
 
     def _build_prompt(self, standard, user_prompt: str, examples: List) -> str:
@@ -204,52 +272,77 @@ Comienza tu respuesta INMEDIATAMENTE con el título principal (ej: "# Understand
         return """Genera documentación técnica profesional y detallada.
 Sigue las mejores prácticas de la industria."""
 
-    def _call_ai_api(self, prompt: str, standard) -> Dict:
+    def _call_ai_api(self, prompt: str, standard, organization=None, use_cache: bool = True) -> Dict:
         """
-        Llama a la API de IA para generar el contenido.
+        Llama a la API de IA para generar el contenido (o usa la respuesta en caché).
 
         Args:
             prompt: Prompt completo construido
             standard: Estándar de documentación
+            organization: Organización para la caché de respuestas
+            use_cache: False para forzar una llamada nueva
 
         Returns:
-            Dict con 'content' y opcionalmente 'diagram_code'
+            Dict con 'content', 'cached' y opcionalmente 'diagram_code'
         """
-        if not self.api_key:
+        if not self.gateway.available:
             return self._mock_generation(prompt, standard)
 
+        messages = self._build_messages(prompt)
         try:
-            # Intentar usar OpenAI
-            from openai import OpenAI
-
-            client = OpenAI(api_key=self.api_key)
-
-            response = client.chat.completions.create(
+            generated_text, cached = cached_completion(
+                lambda: self.gateway.complete(messages, model=self.model, temperature=0.7, max_tokens=3000),
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "Eres un experto en documentación técnica de software. Generas documentación clara, profesional y detallada."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
                 temperature=0.7,
-                max_tokens=3000
+                max_tokens=3000,
+                organization=organization,
+                use_cache=use_cache
             )
+        except LLMError as e:
+            logger.warning('Error llamando al LLM (%s); se usa la generación mock', e)
+            return self._mock_generation(prompt, standard)
 
-            generated_text = response.choices[0].message.content
+        # Separar contenido y diagrama si es necesario
+        content, diagram_code = self._parse_generated_text(generated_text, standard)
 
-            # Separar contenido y diagrama si es necesario
-            content, diagram_code = self._parse_generated_text(generated_text, standard)
+        return {
+            'content': content,
+            'diagram_code': diagram_code,
+            'cached': cached
+        }
 
-            return {
-                'content': content,
-                'diagram_code': diagram_code
-            }
-        except ImportError:
-            print("Warning: openai package not installed. Using mock generation.")
-            return self._mock_generation(prompt, standard)
-        except Exception as e:
-            print(f"Error calling OpenAI API: {str(e)}")
-            print("Falling back to mock generation.")
-            return self._mock_generation(prompt, standard)
+    def _open_stream(self, prompt: str, organization=None, use_cache: bool = True):
+        """
+        Abre la llamada a la API en streaming (o usa la respuesta en caché).
+
+        Returns:
+            Tuple (fragmentos, cached); (None, False) si hay que usar la generación mock
+        """
+        if not self.gateway.available:
+            return None, False
+
+        messages = self._build_messages(prompt)
+        try:
+            return cached_stream(
+                lambda: self.gateway.stream(messages, model=self.model, temperature=0.7, max_tokens=3000),
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=3000,
+                organization=organization,
+                use_cache=use_cache
+            )
+        except LLMError as e:
+            logger.warning('Error llamando al LLM (%s); se usa la generación mock', e)
+            return None, False
+
+    def _build_messages(self, prompt: str) -> List[Dict]:
+        """Mensajes de la llamada: instrucciones de sistema + prompt completo."""
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
 
     def _mock_generation(self, prompt: str, standard) -> Dict:
         """
@@ -0,0 +1,304 @@
+"""
+Caché de respuestas del LLM por coincidencia exacta.
+
+Una misma petición (modelo, mensajes, temperatura, max_tokens) dentro de la
+misma organización devuelve la respuesta guardada en vez de volver a llamar a
+la API: pruebas de generación re-enviadas, regeneración de un proyecto sin
+cambios, el mismo diagrama pedido dos veces...
+
+    text = cached_completion(
+        lambda: client.chat.completions.create(...).choices[0].message.content,
+        model='gpt-4', messages=messages, temperature=0.7, max_tokens=1000,
+        organization=request.user.organization_id,
+    )
+
+La clave es el SHA-256 de la petición normalizada (espacios sobrantes y
+saltos de línea \\r\\n no cambian la clave) e incluye la organización: nunca
+se comparten respuestas entre organizaciones.
+
+    - TTL: RAGConfiguration.response_cache_ttl_seconds de la organización
+      (0 = sin caché para ella) o LLM_CACHE_TTL_SECONDS.
+    - Tamaño: como máximo LLM_CACHE_MAX_ENTRIES respuestas; al superarlo se
+      descartan las menos usadas recientemente (LRU).
+    - Backend (LLM_CACHE_BACKEND): LocalLLMCacheBackend (memoria del proceso)
+      o RedisLLMCacheBackend (compartida entre procesos, LLM_CACHE_REDIS_URL).
+    - Contadores de aciertos y fallos: llm_cache_stats() y el comando llm_cache.
+
+cached_stream() es la variante para respuestas en streaming: reenvía los
+fragmentos según llegan y guarda la respuesta cuando el stream termina.
+
+Las respuestas fallidas (excepciones de la API) no se guardan. Para forzar
+una llamada nueva se pasa use_cache=False (en las vistas: "use_cache": false
+en el cuerpo o la cabecera Cache-Control: no-cache); la respuesta nueva
+reemplaza a la guardada.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'llm_cache:'
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _normalize_text(text) -> str:
+    lines = str(text or '').replace('\r\n', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip()
+
+
+def cache_key(model: str, messages, temperature, max_tokens, organization=None) -> str:
+    """Clave de la petición normalizada (organización incluida)."""
+    payload = {
+        'organization': getattr(organization, 'pk', organization),
+        'model': model,
+        'messages': [
+            {'role': message.get('role', 'user'), 'content': _normalize_text(message.get('content'))}
+            for message in messages
+        ],
+        'temperature': round(float(temperature), 3),
+        'max_tokens': int(max_tokens),
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return KEY_PREFIX + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class LocalLLMCacheBackend:
+    """LRU en memoria del proceso (OrderedDict: el final es lo usado más recientemente)."""
+
+    def __init__(self):
+        self.max_entries = _setting('LLM_CACHE_MAX_ENTRIES', 1000)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # clave -> (expira, texto)
+        self._counters = {'hits': 0, 'misses': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, 'entries': len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters = {'hits': 0, 'misses': 0}
+
+
+class RedisLLMCacheBackend:
+    """
+    Caché compartida en Redis.
+
+    Cada respuesta es una clave con expiración (SET EX); un sorted set con la
+    hora del último uso hace de índice LRU para limitar el número de entradas.
+    """
+
+    INDEX_KEY = KEY_PREFIX + 'lru'
+    HITS_KEY = KEY_PREFIX + 'hits'
+    MISSES_KEY = KEY_PREFIX + 'misses'
+
+    def __init__(self):
+        import redis
+
+        self.max_entries = _setting('LLM_CACHE_MAX_ENTRIES', 1000)
+        self._client = redis.Redis.from_url(_setting('LLM_CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(key)
+        pipe = self._client.pipeline()
+        if value is None:
+            pipe.incr(self.MISSES_KEY)
+            pipe.zrem(self.INDEX_KEY, key)
+        else:
+            pipe.incr(self.HITS_KEY)
+            pipe.zadd(self.INDEX_KEY, {key: time.time()})
+        pipe.execute()
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        pipe = self._client.pipeline()
+        pipe.set(key, value, ex=ttl)
+        pipe.zadd(self.INDEX_KEY, {key: time.time()})
+        pipe.zcard(self.INDEX_KEY)
+        size = pipe.execute()[-1]
+        if size > self.max_entries:
+            evicted = [member for member, _ in self._client.zpopmin(self.INDEX_KEY, size - self.max_entries)]
+            if evicted:
+                self._client.delete(*evicted)
+
+    def stats(self) -> dict:
+        hits, misses, entries = self._client.pipeline().get(self.HITS_KEY).get(self.MISSES_KEY).zcard(
+            self.INDEX_KEY
+        ).execute()
+        return {'hits': int(hits or 0), 'misses': int(misses or 0), 'entries': entries}
+
+    def clear(self) -> None:
+        keys = self._client.zrange(self.INDEX_KEY, 0, -1)
+        self._client.delete(self.INDEX_KEY, self.HITS_KEY, self.MISSES_KEY, *keys)
+
+
+def get_llm_cache():
+    """Backend configurado en LLM_CACHE_BACKEND, creado en el primer uso."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = _setting('LLM_CACHE_BACKEND', 'apps.standards.services.llm_cache.LocalLLMCacheBackend')
+                _backend = import_string(path)()
+    return _backend
+
+
+def cache_ttl(organization=None) -> int:
+    """TTL en segundos para la organización (0 = no guardar)."""
+    if not _setting('LLM_CACHE_ENABLED', True):
+        return 0
+    organization_id = getattr(organization, 'pk', organization)
+    if organization_id is not None:
+        from apps.ai_engine.models import RAGConfiguration
+
+        ttl = RAGConfiguration.objects.filter(organization_id=organization_id).values_list(
+            'response_cache_ttl_seconds', flat=True
+        ).first()
+        if ttl is not None:
+            return ttl
+    return _setting('LLM_CACHE_TTL_SECONDS', 24 * 60 * 60)
+
+
+def _cache_get(cache, key: str) -> Optional[str]:
+    try:
+        return cache.get(key)
+    except Exception:
+        # La caché es una optimización: si el backend falla se llama a la API
+        logger.exception('No se pudo leer la caché del LLM')
+        return None
+
+
+def _cache_set(cache, key: str, text: str, ttl: int) -> None:
+    if not text:
+        return
+    try:
+        cache.set(key, text, ttl)
+    except Exception:
+        logger.exception('No se pudo guardar la respuesta en la caché del LLM')
+
+
+def cached_completion(
+    call: Callable[[], str],
+    *,
+    model: str,
+    messages,
+    temperature,
+    max_tokens,
+    organization=None,
+    use_cache: bool = True,
+):
+    """
+    Ejecuta call() (la llamada real, que retorna el texto) salvo que la caché ya tenga la respuesta.
+
+    Retorna (texto, cached). Con use_cache=False no se lee la caché, pero la
+    respuesta nueva se guarda.
+    """
+    ttl = cache_ttl(organization)
+    if ttl <= 0:
+        return call(), False
+
+    cache = get_llm_cache()
+    key = cache_key(model, messages, temperature, max_tokens, organization)
+    if use_cache:
+        cached = _cache_get(cache, key)
+        if cached is not None:
+            return cached, True
+
+    text = call()
+    _cache_set(cache, key, text, ttl)
+    return text, False
+
+
+def _store_when_complete(chunks: Iterable[str], cache, key: str, ttl: int) -> Iterator[str]:
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    # Solo se llega aquí si el stream terminó: una respuesta cortada no se guarda
+    _cache_set(cache, key, ''.join(parts), ttl)
+
+
+def cached_stream(
+    stream: Callable[[], Iterable[str]],
+    *,
+    model: str,
+    messages,
+    temperature,
+    max_tokens,
+    organization=None,
+    use_cache: bool = True,
+):
+    """
+    Versión en streaming de cached_completion: stream() abre la llamada real y
+    retorna los fragmentos de texto según llegan.
+
+    Retorna (fragmentos, cached). Un acierto es un único fragmento con la
+    respuesta guardada; si no, la respuesta completa se guarda al terminar el
+    stream. stream() se llama antes de retornar, así que un error al abrir la
+    llamada se lanza aquí y no a mitad de la iteración.
+    """
+    ttl = cache_ttl(organization)
+    if ttl <= 0:
+        return iter(stream()), False
+
+    cache = get_llm_cache()
+    key = cache_key(model, messages, temperature, max_tokens, organization)
+    if use_cache:
+        cached = _cache_get(cache, key)
+        if cached is not None:
+            return iter([cached]), True
+
+    return _store_when_complete(stream(), cache, key, ttl), False
+
+
+def cache_requested(request) -> bool:
+    """False si el cliente pidió una respuesta nueva ("use_cache": false o Cache-Control: no-cache)."""
+    if 'no-cache' in request.headers.get('Cache-Control', '').lower():
+        return False
+    use_cache = request.data.get('use_cache', True) if hasattr(request, 'data') else True
+    if isinstance(use_cache, str):
+        return use_cache.lower() not in ('false', '0', 'no')
+    return bool(use_cache)
+
+
+def llm_cache_stats() -> dict:
+    """Aciertos, fallos, proporción de aciertos y entradas guardadas."""
+    stats = get_llm_cache().stats()
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    return stats
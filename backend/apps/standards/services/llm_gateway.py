@@ -0,0 +1,425 @@
+"""
+Gateway de llamadas al LLM.
+
+Todas las llamadas al modelo pasan por aquí en vez de crear un cliente de
+OpenAI en cada petición:
+
+    gateway = get_llm_gateway()
+    if gateway.available:
+        text = gateway.complete(messages, model='gpt-4', temperature=0.7, max_tokens=1000)
+        for chunk in gateway.stream(messages, model='gpt-4', temperature=0.7, max_tokens=1000):
+            ...
+        text = await gateway.acomplete(messages, model='gpt-4', ...)   # API async
+        async for chunk in gateway.astream(messages, model='gpt-4', ...):
+            ...
+
+El gateway del proceso:
+    - Usa un único cliente por proceso (pool de conexiones HTTP con keep-alive:
+      las llamadas reutilizan conexión y sesión TLS). Tras un fork se crea uno
+      nuevo.
+    - Aplica LLM_TIMEOUT_SECONDS (lectura; para streams, entre fragmentos) y
+      LLM_CONNECT_TIMEOUT_SECONDS.
+    - Reintenta los 429 y 5xx, y los errores de conexión, hasta LLM_MAX_RETRIES
+      veces con backoff exponencial con jitter (LLM_BACKOFF_BASE_SECONDS,
+      como máximo LLM_BACKOFF_MAX_SECONDS; se respeta Retry-After). Un stream
+      solo se reintenta si falla al abrirse, nunca después del primer fragmento.
+    - Limita las llamadas simultáneas a LLM_MAX_CONCURRENCY (las síncronas en
+      todo el proceso, las async por event loop). La espera de un reintento
+      conserva el turno: con 429 el proceso baja el ritmo.
+
+Los errores de la API llegan como LLMError (LLMRetryableError si agotaron
+los reintentos); las vistas los capturan y usan la respuesta mock.
+
+Backend (LLM_BACKEND):
+    - OpenAIBackend: API de OpenAI con OPENAI_API_KEY (y LLM_BASE_URL si se
+      usa un proxy o un servidor compatible). Sin clave, available es False.
+    - LocalLLMBackend: respuestas deterministas sin red, para pruebas y
+      desarrollo sin clave.
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+import random
+import re
+import threading
+import time
+import weakref
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class LLMError(Exception):
+    """La llamada al LLM falló (la vista puede usar la respuesta mock)."""
+
+
+class LLMRetryableError(LLMError):
+    """Fallo transitorio (429, 5xx, conexión): se reintenta con backoff."""
+
+    def __init__(self, message, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(response) -> Optional[float]:
+    """Segundos de la cabecera Retry-After (solo el formato numérico)."""
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class OpenAIBackend:
+    """
+    API de OpenAI con un cliente síncrono por proceso y uno async por event loop.
+
+    El SDK no reintenta (max_retries=0): los reintentos los hace el gateway.
+    """
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or _setting('OPENAI_API_KEY', '') or os.getenv('OPENAI_API_KEY', '')
+        self.base_url = _setting('LLM_BASE_URL', '') or None
+        self.max_connections = _setting('LLM_MAX_CONCURRENCY', 8)
+        self.timeout = _setting('LLM_TIMEOUT_SECONDS', 60)
+        self.connect_timeout = _setting('LLM_CONNECT_TIMEOUT_SECONDS', 10)
+
+        self._lock = threading.Lock()
+        self._client = None
+        self._client_pid = None
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncOpenAI
+
+        self.available = bool(self.api_key)
+        if self.available and importlib.util.find_spec('openai') is None:
+            logger.warning('El paquete openai no está instalado: se usará la generación mock')
+            self.available = False
+
+    def _client_options(self, http_client_class):
+        import httpx
+
+        return {
+            'api_key': self.api_key,
+            'base_url': self.base_url,
+            'max_retries': 0,
+            'http_client': http_client_class(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            ),
+        }
+
+    def client(self):
+        """Cliente síncrono del proceso (se recrea tras un fork: el pool no se comparte)."""
+        if self._client is None or self._client_pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._client_pid != os.getpid():
+                    import httpx
+                    from openai import OpenAI
+
+                    self._client = OpenAI(**self._client_options(httpx.Client))
+                    self._client_pid = os.getpid()
+        return self._client
+
+    def async_client(self):
+        """Cliente async del event loop actual (las conexiones async no se comparten entre loops)."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            client = self._async_clients[loop] = AsyncOpenAI(**self._client_options(httpx.AsyncClient))
+        return client
+
+    def _error(self, exc) -> Exception:
+        """Traduce una excepción de la llamada a LLMError / LLMRetryableError."""
+        import openai
+
+        if isinstance(exc, openai.APIStatusError):
+            # Cuota agotada: es un 429, pero reintentar no sirve
+            if exc.status_code == 429 and getattr(exc, 'code', None) == 'insufficient_quota':
+                return LLMError(str(exc))
+            if exc.status_code == 429 or exc.status_code >= 500:
+                return LLMRetryableError(str(exc), retry_after=_retry_after(exc.response))
+            return LLMError(str(exc))
+        if isinstance(exc, openai.APIConnectionError):
+            return LLMRetryableError(str(exc))
+        return LLMError(str(exc))
+
+    def complete(self, request: Dict) -> str:
+        try:
+            response = self.client().chat.completions.create(**request)
+        except Exception as e:
+            raise self._error(e) from e
+        return response.choices[0].message.content or ''
+
+    def stream(self, request: Dict) -> Iterator[str]:
+        try:
+            response = self.client().chat.completions.create(stream=True, **request)
+        except Exception as e:
+            raise self._error(e) from e
+        return _OpenAIChunks(response, self._error)
+
+    async def acomplete(self, request: Dict) -> str:
+        try:
+            response = await self.async_client().chat.completions.create(**request)
+        except Exception as e:
+            raise self._error(e) from e
+        return response.choices[0].message.content or ''
+
+    async def astream(self, request: Dict) -> AsyncIterator[str]:
+        try:
+            response = await self.async_client().chat.completions.create(stream=True, **request)
+        except Exception as e:
+            raise self._error(e) from e
+        return self._achunks(response)
+
+    async def _achunks(self, response):
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise self._error(e) from e
+        finally:
+            await response.close()
+
+
+class _OpenAIChunks:
+    """Fragmentos de texto de un stream de OpenAI; close() libera la conexión."""
+
+    def __init__(self, response, translate):
+        self._response = response
+        self._chunks = iter(response)
+        self._translate = translate
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        while True:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                raise
+            except Exception as e:
+                raise self._translate(e) from e
+            if chunk.choices and chunk.choices[0].delta.content:
+                return chunk.choices[0].delta.content
+
+    def close(self):
+        self._response.close()
+
+
+class LocalLLMBackend:
+    """
+    Backend determinista sin red: responde con el último mensaje del usuario.
+
+    La misma petición produce siempre la misma respuesta; el stream la
+    entrega palabra a palabra.
+    """
+
+    available = True
+
+    def _response(self, request: Dict) -> str:
+        messages = request.get('messages') or []
+        prompt = next(
+            (message.get('content', '') for message in reversed(messages) if message.get('role') == 'user'),
+            ''
+        )
+        return f"Respuesta local ({request.get('model', '')}): {prompt.strip()[:500]}"
+
+    def complete(self, request: Dict) -> str:
+        return self._response(request)
+
+    def stream(self, request: Dict) -> Iterator[str]:
+        return iter(re.findall(r'\S+\s*', self._response(request)))
+
+    async def acomplete(self, request: Dict) -> str:
+        return self._response(request)
+
+    async def astream(self, request: Dict) -> AsyncIterator[str]:
+        async def chunks():
+            for chunk in self.stream(request):
+                yield chunk
+        return chunks()
+
+
+class _GatewayStream:
+    """
+    Iterador de un stream abierto que devuelve su turno de concurrencia al
+    terminar, al fallar o al cerrarse (también si nunca se itera).
+    """
+
+    def __init__(self, chunks, release):
+        self._chunks = chunks
+        self._release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if self._release is None:
+            raise StopIteration
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._release is not None:
+            release, self._release = self._release, None
+            try:
+                close = getattr(self._chunks, 'close', None)
+                if close is not None:
+                    close()
+            finally:
+                release()
+
+    def __del__(self):
+        self.close()
+
+
+class LLMGateway:
+    """Timeouts, reintentos con backoff y límite de concurrencia sobre un backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.max_retries = _setting('LLM_MAX_RETRIES', 3)
+        self.backoff_base = _setting('LLM_BACKOFF_BASE_SECONDS', 1)
+        self.backoff_max = _setting('LLM_BACKOFF_MAX_SECONDS', 30)
+        self.max_concurrency = _setting('LLM_MAX_CONCURRENCY', 8)
+        self.queue_timeout = _setting('LLM_TIMEOUT_SECONDS', 60)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._async_slots = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+
+    @property
+    def available(self) -> bool:
+        """False si el backend no puede llamar al modelo (p. ej. sin API key): usar el mock."""
+        return self.backend.available
+
+    @staticmethod
+    def _request(messages: List[Dict], model: str, temperature, max_tokens) -> Dict:
+        return {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens}
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes del reintento attempt (0, 1, ...): jitter completo sobre base * 2^attempt."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after:
+            delay = max(delay, retry_after)
+        return min(delay, self.backoff_max)
+
+    def _retrying(self, call):
+        attempt = 0
+        while True:
+            try:
+                return call()
+            except LLMRetryableError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt, e.retry_after)
+                attempt += 1
+                logger.warning('Error transitorio del LLM (%s); reintento %d/%d en %.1fs',
+                               e, attempt, self.max_retries, delay)
+                time.sleep(delay)
+
+    async def _aretrying(self, call):
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except LLMRetryableError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt, e.retry_after)
+                attempt += 1
+                logger.warning('Error transitorio del LLM (%s); reintento %d/%d en %.1fs',
+                               e, attempt, self.max_retries, delay)
+                await asyncio.sleep(delay)
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise LLMError(f'Límite de {self.max_concurrency} llamadas simultáneas al LLM')
+
+    def _async_slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._async_slots.get(loop)
+        if slot is None:
+            slot = self._async_slots[loop] = asyncio.Semaphore(self.max_concurrency)
+        return slot
+
+    def complete(self, messages: List[Dict], *, model: str, temperature=0.7, max_tokens=1000) -> str:
+        """Texto completo de la respuesta."""
+        request = self._request(messages, model, temperature, max_tokens)
+        self._acquire()
+        try:
+            return self._retrying(lambda: self.backend.complete(request))
+        finally:
+            self._slots.release()
+
+    def stream(self, messages: List[Dict], *, model: str, temperature=0.7, max_tokens=1000) -> Iterator[str]:
+        """
+        Fragmentos de texto según llegan.
+
+        La llamada se abre (con reintentos) antes de retornar; el turno de
+        concurrencia se devuelve cuando el iterador se agota, falla o se cierra.
+        """
+        request = self._request(messages, model, temperature, max_tokens)
+        self._acquire()
+        try:
+            chunks = self._retrying(lambda: self.backend.stream(request))
+        except BaseException:
+            self._slots.release()
+            raise
+        return _GatewayStream(chunks, self._slots.release)
+
+    async def acomplete(self, messages: List[Dict], *, model: str, temperature=0.7, max_tokens=1000) -> str:
+        """Versión async de complete()."""
+        request = self._request(messages, model, temperature, max_tokens)
+        async with self._async_slot():
+            return await self._aretrying(lambda: self.backend.acomplete(request))
+
+    async def astream(self, messages: List[Dict], *, model: str, temperature=0.7, max_tokens=1000):
+        """Versión async de stream() (la llamada se abre en la primera iteración)."""
+        request = self._request(messages, model, temperature, max_tokens)
+        async with self._async_slot():
+            chunks = await self._aretrying(lambda: self.backend.astream(request))
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                aclose = getattr(chunks, 'aclose', None)
+                if aclose is not None:
+                    await aclose()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Gateway del proceso con el backend de LLM_BACKEND, creado en el primer uso."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                path = _setting('LLM_BACKEND', 'apps.standards.services.llm_gateway.OpenAIBackend')
+                _gateway = LLMGateway(import_string(path)())
+    return _gateway
+
+
+def reset_llm_gateway() -> None:
+    """Descarta el gateway del proceso (p. ej. tras cambiar LLM_BACKEND en pruebas)."""
+    global _gateway
+    with _gateway_lock:
+        _gateway = None
@@ -3,15 +3,26 @@ Servicio para generar documentación automática de proyectos completos.
 
 Este servicio toma un proyecto con todas sus tareas y genera documentación
 comprensiva usando IA, incluyendo casos de uso, diagramas, arquitectura, etc.
+
+Los estándares se generan en paralelo (PROJECT_GENERATION_CONCURRENCY
+llamadas al LLM a la vez), cada uno con su propio límite de tiempo
+(PROJECT_GENERATION_STANDARD_TIMEOUT_SECONDS). Un estándar que falla o se
+pasa del límite queda con 'error' en el resultado sin afectar a los demás.
 """
 
+import logging
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, List
+from django.conf import settings
+from django.db import connections
 from apps.projects.models import Project
 from apps.agile.models import Task
 from apps.standards.models import DocumentationStandard
 from .ai_generator import AIDocumentationGenerator
 
+logger = logging.getLogger(__name__)
+
 
 class ProjectDocumentationGenerator:
     """
@@ -26,13 +37,16 @@ class ProjectDocumentationGenerator:
 
     def __init__(self):
         self.ai_generator = AIDocumentationGenerator()
+        self.concurrency = getattr(settings, 'PROJECT_GENERATION_CONCURRENCY', 4)
+        self.standard_timeout = getattr(settings, 'PROJECT_GENERATION_STANDARD_TIMEOUT_SECONDS', 180)
 
-    def generate_project_documentation(self, project: Project) -> Dict:
+    def generate_project_documentation(self, project: Project, use_cache: bool = True) -> Dict:
         """
         Genera documentación completa del proyecto.
 
         Args:
             project: Instancia de Project
+            use_cache: False para regenerar sin usar respuestas guardadas del LLM
 
         Returns:
             Dict con documentación generada por categoría
@@ -57,48 +71,118 @@ class ProjectDocumentationGenerator:
             is_active=True
         ).order_by('category')
 
-        # Generar documentación por cada estándar
-        documentation_by_standard = {}
+        # Generar documentación por cada estándar, en paralelo
+        prompts = [
+            (standard, self._build_standard_prompt(project_context, standard, tasks))
+            for standard in standards
+        ]
+        entries = self._generate_concurrently(prompts, project.organization_id, use_cache)
 
-        for standard in standards:
-            try:
-                # Construir prompt específico para el estándar
-                prompt = self._build_standard_prompt(
-                    project_context,
-                    standard,
-                    tasks
-                )
-
-                # Generar con IA
-                result = self.ai_generator.generate(
-                    standard=standard,
-                    user_prompt=prompt
-                )
-
-                documentation_by_standard[standard.category] = {
-                    'standard_name': standard.name,
-                    'standard_id': standard.id,
-                    'content': result['content'],
-                    'diagram_code': result.get('diagram_code', ''),
-                    'model_used': result.get('model_used'),
-                }
-            except Exception as e:
-                print(f"Error generating {standard.name}: {str(e)}")
-                documentation_by_standard[standard.category] = {
-                    'standard_name': standard.name,
-                    'error': str(e)
-                }
+        # Mismo orden que los estándares, sin importar cuál terminó antes
+        documentation_by_standard = {}
+        for (standard, _), entry in zip(prompts, entries):
+            documentation_by_standard[standard.category] = entry
 
         generation_time = time.time() - start_time
+        failed = [entry['standard_name'] for entry in entries if 'error' in entry]
 
-        return {
-            'success': True,
+        result = {
+            # Resultado parcial: basta con que un estándar se haya generado
+            'success': not entries or len(failed) < len(entries),
             'project_id': project.id,
             'project_name': project.name,
             'documentation': documentation_by_standard,
             'generation_time': generation_time,
+            # Suma de los tiempos por estándar (lo que tardaría generarlos uno tras otro)
+            'standards_generation_time': sum(entry['generation_time'] for entry in entries),
+            'failed_standards': failed,
             'tasks_count': tasks.count(),
         }
+        if not result['success']:
+            result['error'] = 'No se pudo generar la documentación de ningún estándar'
+        return result
+
+    def _generate_concurrently(self, prompts, organization_id, use_cache: bool) -> List[Dict]:
+        """
+        Genera cada (estándar, prompt) en un pool acotado; retorna las entradas en el mismo orden.
+
+        El límite de tiempo cuenta desde que el estándar empieza a generarse
+        (no desde que entra en la cola). Un hilo que se pasa del límite no se
+        puede interrumpir: su resultado se descarta cuando termine.
+        """
+        started_at = {}
+
+        def run(index, standard, prompt):
+            started_at[index] = time.monotonic()
+            try:
+                return self.ai_generator.generate(
+                    standard=standard,
+                    user_prompt=prompt,
+                    organization=organization_id,
+                    use_cache=use_cache
+                )
+            finally:
+                # Las conexiones son por hilo: no dejarlas abiertas al terminar
+                connections.close_all()
+
+        entries = [None] * len(prompts)
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.concurrency, len(prompts) or 1)),
+            thread_name_prefix='project-doc'
+        )
+        try:
+            pending = {
+                executor.submit(run, index, standard, prompt): index
+                for index, (standard, prompt) in enumerate(prompts)
+            }
+            while pending:
+                # Despertar al terminar alguno o al vencer el próximo límite
+                deadlines = [started_at[i] + self.standard_timeout for i in pending.values() if i in started_at]
+                timeout = min(deadlines) - time.monotonic() if deadlines else self.standard_timeout
+                done, _ = wait(pending, timeout=min(max(timeout, 0), 1), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    entries[index] = self._entry(prompts[index][0], future, started_at.get(index))
+
+                now = time.monotonic()
+                for future, index in list(pending.items()):
+                    started = started_at.get(index)
+                    if started is not None and now - started > self.standard_timeout:
+                        del pending[future]
+                        standard = prompts[index][0]
+                        logger.warning(
+                            'Tiempo agotado generando el estándar %s (%ss)', standard.name, self.standard_timeout
+                        )
+                        entries[index] = {
+                            'standard_name': standard.name,
+                            'standard_id': standard.id,
+                            'error': f'Tiempo de espera agotado ({self.standard_timeout}s)',
+                            'generation_time': now - started,
+                        }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return entries
+
+    def _entry(self, standard, future, started) -> Dict:
+        elapsed = time.monotonic() - started if started is not None else 0.0
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.exception('Error generando el estándar %s', standard.name)
+            return {
+                'standard_name': standard.name,
+                'standard_id': standard.id,
+                'error': str(e),
+                'generation_time': elapsed,
+            }
+        return {
+            'standard_name': standard.name,
+            'standard_id': standard.id,
+            'content': result['content'],
+            'diagram_code': result.get('diagram_code', ''),
+            'model_used': result.get('model_used'),
+            'generation_time': elapsed,
+        }
 
     def _build_project_context(self, project: Project, tasks) -> Dict:
         """Construye el contexto del proyecto con toda la información relevante."""
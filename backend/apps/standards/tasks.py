@@ -0,0 +1,148 @@
+"""
+Tareas Celery de generación con IA.
+
+Las vistas crean el registro del trabajo en estado pendiente, lo encolan al
+confirmar la transacción y responden 202 con su id:
+
+    - AIGenerationTest: PENDING -> PROCESSING -> COMPLETED | FAILED
+    - AIGenerationLog (job_type DOCUMENTATION o PROJECT):
+      PENDING -> IN_PROGRESS -> SUCCESS | FAILED, con el resultado en result
+
+Con "stream": true la vista de documentación genera en la propia petición
+(sin cola) y usa finish_job para cerrar el registro igual que el worker.
+
+El cliente consulta el estado por polling (GET /api/v1/standards/jobs/{id}/ o
+/api/v1/standards/ai-tests/{id}/) o espera el evento ai.job en /api/v1/events/.
+
+Con acks_late un mensaje puede entregarse otra vez si el worker cae; un
+registro ya terminado no vuelve a llamar al LLM.
+"""
+import time
+
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.events import publish_event
+
+
+def enqueue(task, *args):
+    """Encola la tarea cuando se confirme la transacción (el worker ya ve el registro)."""
+    transaction.on_commit(lambda: task.delay(*args))
+
+
+def _publish(job_type, job_id, status, user_id):
+    if user_id is None:
+        return
+    publish_event('ai.job', {'job_type': job_type, 'job_id': job_id, 'status': status}, user=user_id)
+
+
+@shared_task(acks_late=True, ignore_result=True)
+def run_ai_generation_test(test_id, organization_id=None, use_cache=True):
+    """Genera el contenido de una prueba de generación (AIGenerationTest)."""
+    from .models import AIGenerationTest
+    from .services import AIDocumentationGenerator
+
+    test = AIGenerationTest.objects.select_related('standard').filter(pk=test_id).first()
+    if test is None or test.status in ('COMPLETED', 'FAILED'):
+        return
+
+    test.status = 'PROCESSING'
+    test.save()
+    _publish('AI_TEST', test.pk, test.status, test.created_by_id)
+
+    try:
+        generator = AIDocumentationGenerator()
+        result = generator.generate(
+            standard=test.standard,
+            user_prompt=test.user_prompt,
+            organization=organization_id,
+            use_cache=use_cache
+        )
+
+        test.generated_content = result['content']
+        test.generated_diagram_code = result.get('diagram_code', '')
+        test.ai_model_used = result['model_used']
+        test.generation_time_seconds = result['generation_time']
+        test.status = 'COMPLETED'
+    except Exception as e:
+        test.status = 'FAILED'
+        test.error_message = str(e)
+    test.save()
+    _publish('AI_TEST', test.pk, test.status, test.created_by_id)
+
+
+def _start_job(log_id):
+    """Pasa el trabajo a IN_PROGRESS; None si no existe o ya terminó."""
+    from apps.ai_engine.models import AIGenerationLog
+
+    log = AIGenerationLog.objects.filter(pk=log_id).first()
+    if log is None or log.status in ('SUCCESS', 'FAILED'):
+        return None
+    log.status = 'IN_PROGRESS'
+    log.save(update_fields=['status'])
+    _publish(log.job_type, log.pk, log.status, log.user_id)
+    return log
+
+
+def finish_job(log, started, result=None, error=''):
+    """Guarda el resultado (o el error) del trabajo y publica su estado final."""
+    log.status = 'FAILED' if error else 'SUCCESS'
+    log.error_message = error
+    log.result = result or {}
+    log.execution_time = round(time.time() - started, 3)
+    log.completed_at = timezone.now()
+    log.save()
+    _publish(log.job_type, log.pk, log.status, log.user_id)
+
+
+@shared_task(acks_late=True, ignore_result=True)
+def run_documentation_generation(log_id):
+    """Genera documentación para un estándar (AIGenerationLog de tipo DOCUMENTATION)."""
+    from .models import DocumentationStandard
+    from .services import AIDocumentationGenerator
+
+    log = _start_job(log_id)
+    if log is None:
+        return
+    started = time.time()
+    try:
+        standard = DocumentationStandard.objects.get(pk=log.documentation_standard_id)
+        result = AIDocumentationGenerator().generate(
+            standard=standard,
+            user_prompt=log.prompt,
+            organization=log.context.get('organization_id'),
+            use_cache=log.context.get('use_cache', True)
+        )
+    except Exception as e:
+        finish_job(log, started, error=str(e))
+        return
+
+    log.generated_content = result['content']
+    log.model_used = result['model_used']
+    finish_job(log, started, result=result)
+
+
+@shared_task(acks_late=True, ignore_result=True)
+def run_project_generation(log_id):
+    """Genera la documentación completa de un proyecto (AIGenerationLog de tipo PROJECT)."""
+    from apps.projects.models import Project
+    from .services import ProjectDocumentationGenerator
+
+    log = _start_job(log_id)
+    if log is None:
+        return
+    started = time.time()
+    try:
+        project = Project.objects.get(pk=log.context['project_id'])
+        result = ProjectDocumentationGenerator().generate_project_documentation(
+            project, use_cache=log.context.get('use_cache', True)
+        )
+    except Exception as e:
+        finish_job(log, started, error=str(e))
+        return
+
+    if not result.get('success'):
+        finish_job(log, started, result=result, error=result.get('error', 'Error al generar la documentación'))
+        return
+    finish_job(log, started, result=result)
@@ -0,0 +1,58 @@
+"""
+Regresión N+1: el número de consultas de estándares no debe crecer con las filas.
+"""
+import pytest
+
+from apps.standards.models import DocumentationExample, DocumentationStandard
+from apps.users.models import User
+
+STANDARDS_URL = '/api/v1/standards/standards/'
+
+
+def _create_standards(organization, count, start=0):
+    """Crea estándares con autores distintos y dos ejemplos cada uno."""
+    standards = []
+    for i in range(start, start + count):
+        author = User.objects.create_user(
+            email=f'autor{i}@example.com', password='x', organization=organization
+        )
+        standard = DocumentationStandard.objects.create(
+            name=f'Estándar {i}', category='TECHNICAL_SPEC',
+            organization=organization, created_by=author,
+        )
+        _create_examples(standard, author, 2)
+        standards.append(standard)
+    return standards
+
+
+def _create_examples(standard, author, count, start=0):
+    for i in range(start, start + count):
+        DocumentationExample.objects.create(
+            standard=standard, title=f'Ejemplo {i}', input_prompt='Describe el módulo',
+            generated_content=f'# Ejemplo {i}', created_by=author,
+        )
+
+
+@pytest.mark.django_db
+def test_standard_list_queries_do_not_depend_on_rows(query_count, organization):
+    _create_standards(organization, 2)
+    small, response = query_count(STANDARDS_URL)
+    small_count = response.data['count']
+
+    _create_standards(organization, 8, start=2)
+    large, response = query_count(STANDARDS_URL)
+    assert response.data['count'] == small_count + 8
+    assert small == large
+
+
+@pytest.mark.django_db
+def test_standard_detail_queries_do_not_depend_on_examples(query_count, organization, user):
+    standard = _create_standards(organization, 1)[0]
+    url = f'{STANDARDS_URL}{standard.pk}/'
+    small, response = query_count(url)
+    assert len(response.data['examples']) == 2
+
+    _create_examples(standard, user, 8, start=2)
+    large, response = query_count(url)
+    assert len(response.data['examples']) == 10
+    assert small == large
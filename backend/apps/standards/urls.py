@@ -7,6 +7,7 @@ from .views import (
     AIGenerationTestViewSet,
     DocumentationGenerationView,
     ProjectDocumentationGenerationView,
+    AIGenerationJobView,
     DiagramGenerationView,
     AIChatView,
 )
@@ -22,4 +23,5 @@ urlpatterns = [
     path('generate-project/', ProjectDocumentationGenerationView.as_view(), name='generate-project-documentation'),
     path('generate-diagram/', DiagramGenerationView.as_view(), name='generate-diagram'),
     path('chat/', AIChatView.as_view(), name='ai-chat'),
+    path('jobs/<int:pk>/', AIGenerationJobView.as_view(), name='generation-job'),
 ]
@@ -1,11 +1,19 @@
 """Standards views - AI-powered documentation generation."""
+import json
+import logging
+import re
+import time
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import RetrieveAPIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Count, Max, Prefetch, Q
+from django.urls import reverse
 
 from .models import (
     DocumentationStandard,
@@ -17,13 +25,29 @@ from .serializers import (
     DocumentationStandardDetailSerializer,
     DocumentationExampleSerializer,
     AIGenerationTestSerializer,
+    AIGenerationJobSerializer,
     GenerateDocumentationInputSerializer,
     GenerateProjectDocumentationInputSerializer,
 )
-from .services import AIDocumentationGenerator, ProjectDocumentationGenerator
+from .services.ai_generator import AIDocumentationGenerator
+from .services.llm_cache import cache_requested, cached_completion, cached_stream
+from .services.llm_gateway import LLMError, get_llm_gateway
+from .tasks import (
+    enqueue,
+    finish_job,
+    run_ai_generation_test,
+    run_documentation_generation,
+    run_project_generation,
+)
+from apps.ai_engine.models import AIGenerationLog
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.events import event_stream_response, format_sse
+from apps.core.renderers import EventStreamRenderer
 
+logger = logging.getLogger(__name__)
 
-class DocumentationStandardViewSet(viewsets.ModelViewSet):
+
+class DocumentationStandardViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet para estándares de documentación.
 
@@ -48,17 +72,37 @@ class DocumentationStandardViewSet(viewsets.ModelViewSet):
         return DocumentationStandardDetailSerializer
 
     def get_queryset(self):
+        queryset = self._scoped_queryset().select_related('organization', 'created_by')
+        if self.action != 'list':
+            # El detalle anida todos los ejemplos con su estándar y autor
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'examples',
+                    queryset=DocumentationExample.objects.select_related('standard', 'created_by')
+                )
+            )
+        return queryset
+
+    def _scoped_queryset(self):
         queryset = super().get_queryset()
         # Incluir estándares globales (organization=null) + estándares de la organización del usuario
         if self.request.user.organization:
-            queryset = queryset.filter(
+            return queryset.filter(
                 Q(organization__isnull=True) |  # Estándares globales
                 Q(organization=self.request.user.organization)  # Estándares de la organización
             )
-        else:
-            # Si el usuario no tiene organización, solo mostrar estándares globales
-            queryset = queryset.filter(organization__isnull=True)
-        return queryset
+        # Si el usuario no tiene organización, solo mostrar estándares globales
+        return queryset.filter(organization__isnull=True)
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self._scoped_queryset())
+
+    def get_conditional_aggregates(self):
+        # Los ejemplos anidados (y su conteo) también forman parte de la respuesta
+        return {
+            'examples_count': Count('examples'),
+            'examples_updated_at': Max('examples__updated_at'),
+        }
 
     def perform_create(self, serializer):
         serializer.save(
@@ -93,7 +137,7 @@ class DocumentationExampleViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 standard__organization=self.request.user.organization
             )
-        return queryset
+        return queryset.select_related('standard', 'created_by')
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -106,7 +150,7 @@ class AIGenerationTestViewSet(viewsets.ModelViewSet):
     Endpoints:
     - GET /api/v1/ai-tests/ - Lista de pruebas
     - GET /api/v1/ai-tests/{id}/ - Detalle
-    - POST /api/v1/ai-tests/ - Crear nueva prueba (genera automáticamente)
+    - POST /api/v1/ai-tests/ - Crear nueva prueba (encola la generación, responde 202)
     - PATCH /api/v1/ai-tests/{id}/ - Actualizar (ej: rating, feedback)
     """
     queryset = AIGenerationTest.objects.all()
@@ -125,42 +169,34 @@ class AIGenerationTestViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 standard__organization=self.request.user.organization
             )
-        return queryset
+        return queryset.select_related('standard', 'created_by')
+
+    def create(self, request, *args, **kwargs):
+        """
+        Crea la prueba y encola su generación.
+
+        Responde 202 con la prueba en PENDING; el resultado se consulta en
+        GET /api/v1/standards/ai-tests/{id}/ hasta que status sea COMPLETED o FAILED.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        # En modo eager la generación ya terminó al confirmar
+        serializer.instance.refresh_from_db()
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
     def perform_create(self, serializer):
         """
-        Al crear una prueba, genera automáticamente la documentación.
+        Guarda la prueba como PENDING y encola la generación de la documentación.
         """
-        # Guardar el test como PENDING
         test = serializer.save(
             created_by=self.request.user,
             status='PENDING'
         )
-
-        # Generar la documentación
-        try:
-            test.status = 'PROCESSING'
-            test.save()
-
-            # Usar el servicio de generación
-            generator = AIDocumentationGenerator()
-            result = generator.generate(
-                standard=test.standard,
-                user_prompt=test.user_prompt
-            )
-
-            # Actualizar el test con los resultados
-            test.generated_content = result['content']
-            test.generated_diagram_code = result.get('diagram_code', '')
-            test.ai_model_used = result['model_used']
-            test.generation_time_seconds = result['generation_time']
-            test.status = 'COMPLETED'
-            test.save()
-
-        except Exception as e:
-            test.status = 'FAILED'
-            test.error_message = str(e)
-            test.save()
+        enqueue(
+            run_ai_generation_test, test.pk,
+            self.request.user.organization_id, cache_requested(self.request)
+        )
 
 
 class DocumentationGenerationView(APIView):
@@ -177,19 +213,35 @@ class DocumentationGenerationView(APIView):
         "task_id": 123  // Opcional, si se genera desde una task
     }
 
-    Output:
+    Output (202): el trabajo encolado; el resultado se consulta en status_url
+    {
+        "success": true,
+        "job_id": 42,
+        "status": "PENDING",
+        "status_url": "/api/v1/standards/jobs/42/"
+    }
+
+    Resultado del trabajo (result en GET /api/v1/standards/jobs/{id}/):
     {
         "content": "# Documentación generada...",
         "diagram_code": "graph TD...",
         "model_used": "gpt-4",
         "generation_time": 3.5
     }
+
+    Streaming ("stream": true o Accept: text/event-stream): se genera en la
+    propia petición y se responde text/event-stream con
+        - event: token   {"text": "..."} por cada fragmento del modelo
+        - event: result  el trabajo terminado (como GET /jobs/{id}/), con result
+                         ya separado en content y diagram_code
+        - event: error   {"success": false, "error": "...", "job_id": 42}
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
 
     def post(self, request):
         """
-        Genera documentación basándose en un estándar y prompt del usuario.
+        Encola la generación de documentación para un estándar y prompt del usuario.
         """
         # Validar input
         serializer = GenerateDocumentationInputSerializer(data=request.data)
@@ -207,13 +259,6 @@ class DocumentationGenerationView(APIView):
                 (Q(organization__isnull=True) | Q(organization=request.user.organization))
             )
 
-            # Generar la documentación
-            generator = AIDocumentationGenerator()
-            result = generator.generate(
-                standard=standard,
-                user_prompt=user_prompt
-            )
-
             # Si se proporcionó task_id, asociar el documento generado
             if task_id:
                 # TODO: Crear el documento y asociarlo a la task
@@ -221,10 +266,22 @@ class DocumentationGenerationView(APIView):
                 # Document.objects.create(...)
                 pass
 
-            return Response({
-                'success': True,
-                'data': result
-            }, status=status.HTTP_200_OK)
+            if _stream_requested(request):
+                return self._stream(request, standard, user_prompt, task_id)
+
+            log = AIGenerationLog.objects.create(
+                job_type='DOCUMENTATION',
+                user=request.user,
+                documentation_standard=standard,
+                prompt=user_prompt,
+                context={
+                    'organization_id': request.user.organization_id,
+                    'use_cache': cache_requested(request),
+                    'task_id': task_id,
+                },
+            )
+            enqueue(run_documentation_generation, log.pk)
+            return _job_accepted(request, log)
 
         except DocumentationStandard.DoesNotExist:
             return Response({
@@ -238,6 +295,56 @@ class DocumentationGenerationView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def _stream(self, request, standard, user_prompt, task_id):
+        """
+        Genera sin pasar por la cola y reenvía los fragmentos por SSE.
+
+        El registro (AIGenerationLog) se crea IN_PROGRESS y se cierra al
+        terminar el stream, igual que lo haría el worker; si el cliente corta
+        la conexión queda FAILED.
+        """
+        use_cache = cache_requested(request)
+        organization_id = request.user.organization_id
+        log = AIGenerationLog.objects.create(
+            job_type='DOCUMENTATION',
+            status='IN_PROGRESS',
+            user=request.user,
+            documentation_standard=standard,
+            prompt=user_prompt,
+            context={
+                'organization_id': organization_id,
+                'use_cache': use_cache,
+                'task_id': task_id,
+                'stream': True,
+            },
+        )
+
+        def frames():
+            started = time.time()
+            result = None
+            try:
+                for event, data in AIDocumentationGenerator().generate_stream(
+                    standard, user_prompt, organization=organization_id, use_cache=use_cache
+                ):
+                    if event == 'token':
+                        yield _sse('token', {'text': data})
+                    else:
+                        result = data
+            except GeneratorExit:
+                finish_job(log, started, error='El cliente cerró la conexión')
+                raise
+            except Exception as e:
+                finish_job(log, started, error=str(e))
+                yield _sse('error', {'success': False, 'error': str(e), 'job_id': log.pk})
+                return
+
+            log.generated_content = result['content']
+            log.model_used = result['model_used']
+            finish_job(log, started, result=result)
+            yield _sse('result', {'success': True, **AIGenerationJobSerializer(log).data})
+
+        return event_stream_response(frames())
+
 
 
 class ProjectDocumentationGenerationView(APIView):
@@ -246,12 +353,15 @@ class ProjectDocumentationGenerationView(APIView):
 
     Endpoint:
     - POST /api/v1/standards/generate-project/
+
+    Responde 202 con el trabajo encolado (como /generate/); al terminar, result
+    contiene la documentación por estándar.
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
         """
-        Genera documentación completa de un proyecto con todas sus tareas.
+        Encola la generación de la documentación completa de un proyecto con todas sus tareas.
         """
         # Validar input
         serializer = GenerateProjectDocumentationInputSerializer(data=request.data)
@@ -272,14 +382,14 @@ class ProjectDocumentationGenerationView(APIView):
                     'error': 'No tienes permisos para documentar este proyecto'
                 }, status=status.HTTP_403_FORBIDDEN)
 
-            # Generar la documentación
-            generator = ProjectDocumentationGenerator()
-            result = generator.generate_project_documentation(project)
-
-            if not result.get('success'):
-                return Response(result, status=status.HTTP_400_BAD_REQUEST)
-
-            return Response(result, status=status.HTTP_200_OK)
+            log = AIGenerationLog.objects.create(
+                job_type='PROJECT',
+                user=request.user,
+                prompt=f'Documentación del proyecto {project.name}',
+                context={'project_id': project.pk, 'use_cache': cache_requested(request)},
+            )
+            enqueue(run_project_generation, log.pk)
+            return _job_accepted(request, log)
 
         except Project.DoesNotExist:
             return Response({
@@ -294,6 +404,69 @@ class ProjectDocumentationGenerationView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _job_accepted(request, log):
+    """Respuesta 202 de un trabajo encolado (en modo eager ya puede estar terminado)."""
+    log.refresh_from_db(fields=['status'])
+    status_url = request.build_absolute_uri(reverse('generation-job', args=[log.pk]))
+    response = Response({
+        'success': True,
+        'job_id': log.pk,
+        'status': log.status,
+        'status_url': status_url,
+    }, status=status.HTTP_202_ACCEPTED)
+    response['Location'] = status_url
+    return response
+
+
+def _stream_requested(request) -> bool:
+    """True si el cliente pidió la respuesta en streaming ("stream": true o Accept: text/event-stream)."""
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        return True
+    stream = request.data.get('stream', False)
+    if isinstance(stream, str):
+        return stream.lower() in ('true', '1', 'yes')
+    return bool(stream)
+
+
+def _sse(event_type: str, data: dict) -> str:
+    return format_sse(event_type, json.dumps(data, default=str))
+
+
+def _stream_completion(chunks, finish):
+    """
+    Tramas SSE de una respuesta del modelo: token por fragmento y, al terminar,
+    result con finish(texto completo). Un error a mitad del stream se envía
+    como evento error.
+    """
+    parts = []
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            yield _sse('token', {'text': chunk})
+        final = finish(''.join(parts))
+    except Exception as e:
+        yield _sse('error', {'success': False, 'error': str(e)})
+        return
+    yield _sse('result', final)
+
+
+class AIGenerationJobView(RetrieveAPIView):
+    """
+    Estado de un trabajo de generación encolado.
+
+    Endpoint:
+    - GET /api/v1/standards/jobs/{id}/
+
+    status: PENDING -> IN_PROGRESS -> SUCCESS | FAILED; con SUCCESS, result
+    contiene la respuesta que antes devolvía la generación síncrona.
+    """
+    serializer_class = AIGenerationJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return AIGenerationLog.objects.filter(user=self.request.user).exclude(job_type='')
+
+
 class AIChatView(APIView):
     """
     API View para chat conversacional con IA.
@@ -316,8 +489,12 @@ class AIChatView(APIView):
         "response": "Para crear documentación de API REST...",
         "suggestions": ["Ver ejemplos", "Generar documentación"]
     }
+
+    Streaming ("stream": true o Accept: text/event-stream): event: token
+    {"text": "..."} por fragmento y event: result con el Output completo.
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
 
     def post(self, request):
         """
@@ -333,70 +510,56 @@ class AIChatView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            import os
-            api_key = os.getenv('OPENAI_API_KEY')
+            gateway = get_llm_gateway()
 
-            if api_key:
+            if gateway.available:
                 try:
-                    from openai import OpenAI
-                    client = OpenAI(api_key=api_key)
-
-                    # Construir mensajes incluyendo el historial
-                    messages = [
-                        {
-                            "role": "system",
-                            "content": """Eres un asistente experto en documentación técnica y gestión documental.
-Ayudas a los usuarios a:
-- Crear documentación técnica profesional
-- Generar diagramas Mermaid para visualizar procesos
-- Organizar y estructurar contenido
-- Responder preguntas sobre mejores prácticas de documentación
-
-Características:
-- Responde de forma clara y concisa
-- Ofrece sugerencias prácticas
-- Puedes generar diagramas cuando sea útil
-- Sugiere tipos de documentación relevantes"""
-                        }
-                    ]
-
-                    # Agregar historial de conversación
-                    for msg in conversation_history[-10:]:  # Últimos 10 mensajes
-                        messages.append({
-                            "role": msg.get('role', 'user'),
-                            "content": msg.get('content', '')
-                        })
-
-                    # Agregar mensaje actual
-                    messages.append({
-                        "role": "user",
-                        "content": message
-                    })
-
-                    response = client.chat.completions.create(
+                    messages = self._build_messages(message, conversation_history)
+                    use_cache = cache_requested(request)
+
+                    if _stream_requested(request):
+                        chunks, cached = cached_stream(
+                            lambda: gateway.stream(messages, model="gpt-4", temperature=0.7, max_tokens=1000),
+                            model="gpt-4",
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=1000,
+                            organization=request.user.organization_id,
+                            use_cache=use_cache
+                        )
+                        return event_stream_response(_stream_completion(chunks, lambda text: {
+                            'success': True,
+                            'response': text,
+                            'suggestions': self._generate_suggestions(message, text),
+                            'cached': cached
+                        }))
+
+                    ai_response, cached = cached_completion(
+                        lambda: gateway.complete(messages, model="gpt-4", temperature=0.7, max_tokens=1000),
                         model="gpt-4",
                         messages=messages,
                         temperature=0.7,
-                        max_tokens=1000
+                        max_tokens=1000,
+                        organization=request.user.organization_id,
+                        use_cache=use_cache
                     )
 
-                    ai_response = response.choices[0].message.content
-
                     # Generar sugerencias inteligentes basadas en el contexto
                     suggestions = self._generate_suggestions(message, ai_response)
 
                     return Response({
                         'success': True,
                         'response': ai_response,
-                        'suggestions': suggestions
+                        'suggestions': suggestions,
+                        'cached': cached
                     }, status=status.HTTP_200_OK)
 
-                except Exception as e:
-                    print(f"Error usando OpenAI: {e}")
+                except LLMError as e:
+                    logger.warning('Error llamando al LLM (%s); se usa la respuesta mock', e)
                     # Fallback a respuesta mock
-                    return self._mock_chat_response(message)
+                    return self._mock_chat_response(message, _stream_requested(request))
             else:
-                return self._mock_chat_response(message)
+                return self._mock_chat_response(message, _stream_requested(request))
 
         except Exception as e:
             return Response({
@@ -404,6 +567,42 @@ Características:
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def _build_messages(self, message: str, conversation_history: list) -> list:
+        """Mensajes de la llamada: instrucciones de sistema, últimos 10 del historial y el mensaje actual."""
+        # Construir mensajes incluyendo el historial
+        messages = [
+            {
+                "role": "system",
+                "content": """Eres un asistente experto en documentación técnica y gestión documental.
+Ayudas a los usuarios a:
+- Crear documentación técnica profesional
+- Generar diagramas Mermaid para visualizar procesos
+- Organizar y estructurar contenido
+- Responder preguntas sobre mejores prácticas de documentación
+
+Características:
+- Responde de forma clara y concisa
+- Ofrece sugerencias prácticas
+- Puedes generar diagramas cuando sea útil
+- Sugiere tipos de documentación relevantes"""
+            }
+        ]
+
+        # Agregar historial de conversación
+        for msg in conversation_history[-10:]:  # Últimos 10 mensajes
+            messages.append({
+                "role": msg.get('role', 'user'),
+                "content": msg.get('content', '')
+            })
+
+        # Agregar mensaje actual
+        messages.append({
+            "role": "user",
+            "content": message
+        })
+
+        return messages
+
     def _generate_suggestions(self, user_message: str, ai_response: str) -> list:
         """Genera sugerencias contextuales para el usuario."""
         suggestions = []
@@ -433,8 +632,8 @@ Características:
 
         return suggestions[:3]  # Máximo 3 sugerencias
 
-    def _mock_chat_response(self, message: str) -> Response:
-        """Respuesta mock cuando no hay API key."""
+    def _mock_chat_response(self, message: str, stream: bool = False):
+        """Respuesta mock cuando no hay API key (en streaming, un único fragmento)."""
         lower_message = message.lower()
 
         # Respuestas predefinidas según palabras clave
@@ -475,12 +674,15 @@ Características:
 Nota: Para respuestas más precisas y personalizadas, configura una API key de OpenAI en las variables de entorno."""
             suggestions = ['Ver plantillas', 'Generar con IA', 'Ejemplos']
 
-        return Response({
+        data = {
             'success': True,
             'response': response,
             'suggestions': suggestions,
             'is_mock': True
-        }, status=status.HTTP_200_OK)
+        }
+        if stream:
+            return event_stream_response(_stream_completion(iter([response]), lambda text: data))
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class DiagramGenerationView(APIView):
@@ -502,8 +704,13 @@ class DiagramGenerationView(APIView):
         "diagram_code": "graph TD\n    A[Usuario] --> B[Login]...",
         "diagram_type": "mermaid"
     }
+
+    Streaming ("stream": true o Accept: text/event-stream): event: token
+    {"text": "..."} por fragmento del código sin limpiar y event: result con
+    el Output (diagram_code ya sin bloque markdown).
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
 
     def post(self, request):
         """
@@ -520,48 +727,61 @@ class DiagramGenerationView(APIView):
 
         try:
             # Generar el diagrama usando IA
-            from .services.ai_generator import AIDocumentationGenerator
-            import os
-
-            api_key = os.getenv('OPENAI_API_KEY')
+            gateway = get_llm_gateway()
 
             # Construir prompt específico para generar diagrama
             prompt = self._build_diagram_prompt(text, diagram_type)
 
-            if api_key:
+            if gateway.available:
                 try:
-                    from openai import OpenAI
-                    client = OpenAI(api_key=api_key)
+                    messages = [
+                        {"role": "system", "content": "Eres un experto en crear diagramas Mermaid. Generas código Mermaid válido y bien estructurado basándote en descripciones de texto."},
+                        {"role": "user", "content": prompt}
+                    ]
 
-                    response = client.chat.completions.create(
+                    if _stream_requested(request):
+                        chunks, _ = cached_stream(
+                            lambda: gateway.stream(messages, model="gpt-4", temperature=0.7, max_tokens=1000),
+                            model="gpt-4",
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=1000,
+                            organization=request.user.organization_id,
+                            use_cache=cache_requested(request)
+                        )
+                        return event_stream_response(_stream_completion(chunks, lambda text: {
+                            'success': True,
+                            'diagram_code': self._clean_diagram_code(text),
+                            'diagram_type': 'mermaid'
+                        }))
+
+                    diagram_code, _ = cached_completion(
+                        lambda: gateway.complete(messages, model="gpt-4", temperature=0.7, max_tokens=1000),
                         model="gpt-4",
-                        messages=[
-                            {"role": "system", "content": "Eres un experto en crear diagramas Mermaid. Generas código Mermaid válido y bien estructurado basándote en descripciones de texto."},
-                            {"role": "user", "content": prompt}
-                        ],
+                        messages=messages,
                         temperature=0.7,
-                        max_tokens=1000
+                        max_tokens=1000,
+                        organization=request.user.organization_id,
+                        use_cache=cache_requested(request)
                     )
 
-                    diagram_code = response.choices[0].message.content
+                    diagram_code = self._clean_diagram_code(diagram_code)
 
-                    # Limpiar el código si viene con bloques de código markdown
-                    import re
-                    match = re.search(r'```(?:mermaid)?\n?(.*?)\n?```', diagram_code, re.DOTALL)
-                    if match:
-                        diagram_code = match.group(1).strip()
-
-                except Exception as e:
-                    print(f"Error usando OpenAI: {e}")
+                except LLMError as e:
+                    logger.warning('Error llamando al LLM (%s); se usa el diagrama mock', e)
                     diagram_code = self._generate_mock_diagram(text, diagram_type)
             else:
                 diagram_code = self._generate_mock_diagram(text, diagram_type)
 
-            return Response({
+            data = {
                 'success': True,
                 'diagram_code': diagram_code,
                 'diagram_type': 'mermaid'
-            }, status=status.HTTP_200_OK)
+            }
+            if _stream_requested(request):
+                # Diagrama mock: un único fragmento
+                return event_stream_response(_stream_completion(iter([diagram_code]), lambda text: data))
+            return Response(data, status=status.HTTP_200_OK)
 
         except Exception as e:
             return Response({
@@ -569,6 +789,13 @@ class DiagramGenerationView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def _clean_diagram_code(self, diagram_code: str) -> str:
+        """Quita el bloque de código markdown si el modelo lo incluyó."""
+        match = re.search(r'```(?:mermaid)?\n?(.*?)\n?```', diagram_code, re.DOTALL)
+        if match:
+            return match.group(1).strip()
+        return diagram_code
+
     def _build_diagram_prompt(self, text: str, diagram_type: str) -> str:
         """Construye el prompt para generar el diagrama."""
         type_instructions = {
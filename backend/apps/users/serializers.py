@@ -2,10 +2,11 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from apps.core.serializers import SparseFieldsetMixin
 from .models import User, Organization, UserProfile
 
 
-class OrganizationSerializer(serializers.ModelSerializer):
+class OrganizationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Organization serializer."""
 
     class Meta:
@@ -14,7 +15,7 @@ class OrganizationSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """User profile serializer."""
 
     class Meta:
@@ -22,7 +23,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         fields = ['bio', 'timezone', 'language', 'notifications_enabled', 'email_notifications']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """User serializer."""
 
     organization_name = serializers.CharField(source='organization.name', read_only=True)
@@ -39,7 +40,7 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class UserCreateSerializer(serializers.ModelSerializer):
+class UserCreateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """User creation serializer."""
 
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
@@ -100,7 +101,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class UserUpdateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """User update serializer."""
 
     class Meta:
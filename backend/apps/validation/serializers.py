@@ -1,21 +1,22 @@
 """Validation serializers."""
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import ValidationRule, ValidationResult, QAReview, ValidationCheckpoint, DocumentIssue
 
 
-class ValidationRuleSerializer(serializers.ModelSerializer):
+class ValidationRuleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ValidationRule
         fields = '__all__'
 
 
-class ValidationResultSerializer(serializers.ModelSerializer):
+class ValidationResultSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ValidationResult
         fields = '__all__'
 
 
-class QAReviewSerializer(serializers.ModelSerializer):
+class QAReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     reviewer_name = serializers.CharField(source='reviewer.get_full_name', read_only=True)
     document_title = serializers.CharField(source='document.title', read_only=True)
 
@@ -24,13 +25,13 @@ class QAReviewSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ValidationCheckpointSerializer(serializers.ModelSerializer):
+class ValidationCheckpointSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ValidationCheckpoint
         fields = '__all__'
 
 
-class DocumentIssueSerializer(serializers.ModelSerializer):
+class DocumentIssueSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
 
     class Meta:
@@ -0,0 +1,19 @@
+"""
+Celery app - trabajos largos fuera del ciclo de la petición (generación con IA).
+
+Worker:
+    celery -A config worker -l info
+
+La concurrencia del worker se configura con CELERY_WORKER_CONCURRENCY. Con
+CELERY_TASK_ALWAYS_EAGER = True (settings locales) las tareas se ejecutan en
+línea, sin broker ni worker.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
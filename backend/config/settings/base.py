@@ -31,6 +31,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -190,12 +191,82 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Generación con IA encolada (apps.standards.tasks): un trabajo puede durar minutos
+CELERY_WORKER_CONCURRENCY = int(os.getenv('CELERY_WORKER_CONCURRENCY', 4))
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_SOFT_TIME_LIMIT = int(os.getenv('CELERY_TASK_SOFT_TIME_LIMIT', 15 * 60))
+CELERY_TASK_TIME_LIMIT = int(os.getenv('CELERY_TASK_TIME_LIMIT', 20 * 60))
+
+
+# Document versioning
+# Cada cuántas versiones se guarda una copia completa (keyframe); las intermedias se guardan como delta
+DOCUMENT_VERSION_KEYFRAME_INTERVAL = int(os.getenv('DOCUMENT_VERSION_KEYFRAME_INTERVAL', 10))
+
+# Diff por líneas con la versión anterior calculado en segundo plano al crear cada versión
+DOCUMENT_DIFF_PRECOMPUTE = os.getenv('DOCUMENT_DIFF_PRECOMPUTE', 'True') == 'True'
+
+# Renderizado Markdown -> HTML en servidor; si es False, el comando render_markdown lo completa en segundo plano
+MARKDOWN_RENDER_ON_SAVE = os.getenv('MARKDOWN_RENDER_ON_SAVE', 'True') == 'True'
+
+# Bloqueo de edición: el lease vence si el editor deja de renovarlo (heartbeat) durante este tiempo
+DOCUMENT_LOCK_TTL_SECONDS = int(os.getenv('DOCUMENT_LOCK_TTL_SECONDS', 120))
+
+# Adjuntos: subidas reanudables por partes; los archivos parciales quedan fuera de MEDIA_ROOT
+ATTACHMENT_UPLOAD_CHUNK_SIZE = int(os.getenv('ATTACHMENT_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024))
+ATTACHMENT_UPLOAD_TEMP_DIR = os.getenv('ATTACHMENT_UPLOAD_TEMP_DIR', os.path.join(BASE_DIR, 'tmp', 'uploads'))
+# Extracción de texto de adjuntos (PDF, DOCX, Markdown) en segundo plano para la búsqueda
+ATTACHMENT_TEXT_EXTRACTION = os.getenv('ATTACHMENT_TEXT_EXTRACTION', 'True') == 'True'
+ATTACHMENT_TEXT_MAX_CHARS = int(os.getenv('ATTACHMENT_TEXT_MAX_CHARS', 200000))
+# Importación de documentos desde ZIP: tamaño descomprimido máximo por archivo y del total
+IMPORT_ZIP_MAX_FILE_SIZE = int(os.getenv('IMPORT_ZIP_MAX_FILE_SIZE', 5 * 1024 * 1024))
+IMPORT_ZIP_MAX_TOTAL_SIZE = int(os.getenv('IMPORT_ZIP_MAX_TOTAL_SIZE', 200 * 1024 * 1024))
+
+
+# Background tasks (pool de hilos por proceso para trabajos cortos)
+BACKGROUND_TASK_WORKERS = int(os.getenv('BACKGROUND_TASK_WORKERS', 2))
+BACKGROUND_PROCESS_WORKERS = int(os.getenv('BACKGROUND_PROCESS_WORKERS', 2))
+BACKGROUND_TASKS_EAGER = os.getenv('BACKGROUND_TASKS_EAGER', 'False') == 'True'
+
+
+# Eventos en tiempo real (SSE en /api/v1/events/)
+# InProcessBackend solo reparte dentro de un proceso; con varios procesos usar apps.core.events.RedisBackend
+EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'apps.core.events.InProcessBackend')
+EVENTS_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+EVENTS_KEEPALIVE_SECONDS = int(os.getenv('EVENTS_KEEPALIVE_SECONDS', 15))
+EVENTS_STREAM_MAX_SECONDS = int(os.getenv('EVENTS_STREAM_MAX_SECONDS', 300))
+
+# Event log: DocumentHistory y AuditLog se insertan por lotes fuera de la petición
+# Los eventos pasan por un archivo de spool del proceso (sobrevive a caídas) hasta insertarse
+EVENT_LOG_SPOOL_DIR = os.getenv('EVENT_LOG_SPOOL_DIR', os.path.join(BASE_DIR, 'tmp', 'event_log'))
+EVENT_LOG_BATCH_SIZE = int(os.getenv('EVENT_LOG_BATCH_SIZE', 200))
+EVENT_LOG_FLUSH_SECONDS = float(os.getenv('EVENT_LOG_FLUSH_SECONDS', 2))
 
 
 # AI Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 PINECONE_API_KEY = os.getenv('PINECONE_API_KEY', '')
 PINECONE_ENVIRONMENT = os.getenv('PINECONE_ENVIRONMENT', '')
+# Caché de respuestas del LLM por coincidencia exacta (apps.standards.services.llm_cache)
+# El TTL por organización se configura en RAGConfiguration.response_cache_ttl_seconds
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'True') == 'True'
+LLM_CACHE_BACKEND = os.getenv('LLM_CACHE_BACKEND', 'apps.standards.services.llm_cache.LocalLLMCacheBackend')
+LLM_CACHE_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', 24 * 60 * 60))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 1000))
+# Gateway del LLM (apps.standards.services.llm_gateway): cliente con pool por proceso, timeouts,
+# reintentos con backoff en 429/5xx y límite de llamadas simultáneas
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'apps.standards.services.llm_gateway.OpenAIBackend')
+LLM_BASE_URL = os.getenv('OPENAI_BASE_URL', '')
+LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 60))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv('LLM_CONNECT_TIMEOUT_SECONDS', 10))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 3))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv('LLM_BACKOFF_BASE_SECONDS', 1))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv('LLM_BACKOFF_MAX_SECONDS', 30))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+# Documentación de proyecto: estándares generados en paralelo, cada uno con su límite de tiempo
+PROJECT_GENERATION_CONCURRENCY = int(os.getenv('PROJECT_GENERATION_CONCURRENCY', 4))
+PROJECT_GENERATION_STANDARD_TIMEOUT_SECONDS = int(os.getenv('PROJECT_GENERATION_STANDARD_TIMEOUT_SECONDS', 180))
 
 
 # Swagger/OpenAPI Configuration
@@ -17,6 +17,7 @@ CORS_ALLOW_ALL_ORIGINS = True
 # Disable Celery for local development
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+BACKGROUND_TASKS_EAGER = True
 
 # Simple cache backend
 CACHES = {
@@ -15,3 +15,9 @@ X_FRAME_OPTIONS = 'DENY'
 SECURE_HSTS_SECONDS = 31536000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
+
+# Eventos en tiempo real repartidos entre procesos por Redis
+EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'apps.core.events.RedisBackend')
+
+# Caché de respuestas del LLM compartida entre procesos
+LLM_CACHE_BACKEND = os.getenv('LLM_CACHE_BACKEND', 'apps.standards.services.llm_cache.RedisLLMCacheBackend')
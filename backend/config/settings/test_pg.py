@@ -0,0 +1,21 @@
+"""
+Test settings on PostgreSQL.
+
+Same as local (eager tasks, local memory cache) but on the PostgreSQL
+database configured with DB_* environment variables, so the tests that need
+PostgreSQL features (partial indexes in query plans, full text search) run:
+
+    pytest backend/ --ds=config.settings.test_pg
+"""
+from .local import *
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('DB_NAME', 'doc_platform'),
+        'USER': os.getenv('DB_USER', 'postgres'),
+        'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+    }
+}
@@ -6,6 +6,7 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from apps.core.views import EventStreamView
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -38,6 +39,7 @@ urlpatterns = [
     path('api/v1/validation/', include('apps.validation.urls')),
     path('api/v1/checklist/', include('apps.checklist.urls')),
     path('api/v1/audit/', include('apps.audit.urls')),
+    path('api/v1/events/', EventStreamView.as_view(), name='event-stream'),
 ]
 
 if settings.DEBUG:
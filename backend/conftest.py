@@ -0,0 +1,39 @@
+"""Fixtures compartidas de las pruebas (pytest-django)."""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def organization(db):
+    from apps.users.models import Organization
+
+    return Organization.objects.create(name='Organización', slug='organizacion')
+
+
+@pytest.fixture
+def user(organization):
+    from apps.users.models import User
+
+    return User.objects.create_user(email='autor@example.com', password='x', organization=organization)
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def query_count(api_client):
+    """GET autenticado que retorna (número de consultas SQL, respuesta)."""
+
+    def get(url):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        assert response.status_code == 200, response.content
+        return len(queries), response
+
+    return get
@@ -47,7 +47,7 @@ import {
 import mermaid from 'mermaid';
 import ReactMarkdown from 'react-markdown';
 import {
-  sendChatMessage,
+  sendChatMessageStream,
   generateDiagram,
 } from '../../services/aiService';
 
@@ -89,6 +89,7 @@ const AIAssistant = () => {
     lastTopic: null,
   });
   const [isLoading, setIsLoading] = useState(false);
+  const [streamingMessageId, setStreamingMessageId] = useState(null);
 
   // Estados para generación de diagramas
   const [diagramText, setDiagramText] = useState('');
@@ -492,13 +493,26 @@ const AIAssistant = () => {
     setMessage('');
     setIsLoading(true);
 
+    // La respuesta se va mostrando en este mensaje mientras el modelo la escribe
+    const assistantId = Date.now() + 1;
+
     try {
       const history = messages.map((msg) => ({
         role: msg.type === 'user' ? 'user' : 'assistant',
         content: msg.content,
       }));
 
-      const response = await sendChatMessage(message, history);
+      const response = await sendChatMessageStream(message, history, (text) => {
+        setStreamingMessageId(assistantId);
+        setMessages((prev) => {
+          if (!prev.some((msg) => msg.id === assistantId)) {
+            return [...prev, { id: assistantId, type: 'assistant', content: text, timestamp: '' }];
+          }
+          return prev.map((msg) =>
+            msg.id === assistantId ? { ...msg, content: msg.content + text } : msg
+          );
+        });
+      });
 
       // Extraer diagrama si existe
       const diagramCode = extractMermaidCode(response.response);
@@ -513,7 +527,7 @@ const AIAssistant = () => {
       const docSuggestions = extractDocSuggestions(response.response);
 
       const assistantMessage = {
-        id: Date.now() + 1,
+        id: assistantId,
         type: 'assistant',
         content: cleanContent,
         diagram: diagramCode,
@@ -524,7 +538,8 @@ const AIAssistant = () => {
         }),
       };
 
-      setMessages((prev) => [...prev, assistantMessage]);
+      // Reemplaza el texto parcial por la respuesta procesada (diagrama y sugerencias)
+      setMessages((prev) => [...prev.filter((msg) => msg.id !== assistantId), assistantMessage]);
 
       // Generar sugerencias contextuales evolutivas
       const { suggestions: newSuggestions, newContext } = generateContextualSuggestions(
@@ -554,9 +569,10 @@ const AIAssistant = () => {
           minute: '2-digit',
         }),
       };
-      setMessages((prev) => [...prev, errorMessage]);
+      setMessages((prev) => [...prev.filter((msg) => msg.id !== assistantId), errorMessage]);
     } finally {
       setIsLoading(false);
+      setStreamingMessageId(null);
     }
   };
 
@@ -887,7 +903,7 @@ const AIAssistant = () => {
           </Box>
         ))}
 
-        {isLoading && (
+        {isLoading && !streamingMessageId && (
           <Box sx={{ display: 'flex', gap: 2, mb: 3 }}>
             <Avatar
               sx={{
@@ -185,9 +185,12 @@ const AIGenerate = () => {
     setGeneratedContent(null);
 
     try {
-      const result = await standardsService.generate({
+      // El texto se muestra a medida que el modelo lo escribe; al final llega el resultado completo
+      const result = await standardsService.streamDocumentation({
         standard_id: selectedStandard,
         user_prompt: userPrompt,
+      }, (text) => {
+        setGeneratedContent((prev) => ({ ...prev, content: (prev?.content || '') + text }));
       });
 
       if (result.success) {
@@ -204,6 +207,7 @@ const AIGenerate = () => {
       }
     } catch (err) {
       console.error('Error al generar:', err);
+      setGeneratedContent(null);
       setError(err.response?.data?.error || 'No se pudo generar el documento');
     } finally {
       setGenerating(false);
@@ -452,7 +456,7 @@ const AIGenerate = () => {
               {generating ? 'Generando...' : 'Generar Documento con IA'}
             </Button>
 
-            {generatedContent && (
+            {generatedContent && !generating && (
               <Button
                 fullWidth
                 variant="outlined"
@@ -480,9 +484,9 @@ const AIGenerate = () => {
                   Documento Generado
                 </Typography>
                 <Chip
-                  icon={<CheckCircle />}
-                  label="Generado con IA"
-                  color="success"
+                  icon={generating ? <CircularProgress size={14} color="inherit" /> : <CheckCircle />}
+                  label={generating ? 'Generando...' : 'Generado con IA'}
+                  color={generating ? 'default' : 'success'}
                   size="small"
                 />
               </Box>
@@ -10,6 +10,7 @@ import htmlToDraft from 'html-to-draftjs';
 import 'react-draft-wysiwyg/dist/react-draft-wysiwyg.css';
 import { processMermaidMarkers, getMermaidTemplate, createMermaidMarker } from '../../utils/mermaidHelper.js';
 import documentService from '../../services/documentService';
+import eventService from '../../services/eventService';
 import standardsService from '../../services/standardsService';
 import {
   Box,
@@ -28,6 +29,7 @@ import {
   DialogContent,
   DialogActions,
   Grid,
+  Alert,
   Card,
   CardContent,
   CardActionArea,
@@ -115,6 +117,8 @@ const DocumentEditor = () => {
   const [editedStatus, setEditedStatus] = useState(document.status || 'EN_REVISION');
   const [isFavorite, setIsFavorite] = useState(document.is_favorite || false);
   const [editorState, setEditorState] = useState(() => EditorState.createEmpty());
+  const [reloadKey, setReloadKey] = useState(0);
+  const [remoteVersion, setRemoteVersion] = useState(null);
 
   // Cargar documento desde la API o localStorage como fallback
   useEffect(() => {
@@ -191,7 +195,48 @@ const DocumentEditor = () => {
     };
 
     fetchDocument();
-  }, [id]);
+  }, [id, reloadKey]);
+
+  // Bloqueo de edición: se toma al entrar en modo edición y se renueva mientras dure
+  useEffect(() => {
+    if (!isEditing || id === 'new') return undefined;
+    let heartbeat = null;
+    let released = false;
+
+    documentService.acquireLock(id)
+      .then(({ ttl }) => {
+        if (released) return;
+        heartbeat = setInterval(() => {
+          documentService.heartbeatLock(id).catch(() => documentService.acquireLock(id).catch(() => {}));
+        }, (ttl * 1000) / 3);
+      })
+      .catch((error) => {
+        if (error.response?.status === 423) {
+          alert(error.response.data?.error || 'El documento está siendo editado por otro usuario');
+          setIsEditing(false);
+        }
+      });
+
+    return () => {
+      released = true;
+      if (heartbeat) clearInterval(heartbeat);
+      documentService.releaseLock(id).catch(() => {});
+    };
+  }, [id, isEditing]);
+
+  // Cambios de otros usuarios llegan por eventos del servidor: recargar en lectura, avisar al editar
+  useEffect(() => {
+    if (id === 'new') return undefined;
+    return eventService.subscribe((type, data) => {
+      if (type !== 'document.changed' || data.object_type !== 'document' || String(data.document_id) !== String(id)) return;
+      if (data.version === document.version) return;
+      if (isEditing) {
+        setRemoteVersion(data.version);
+      } else {
+        setReloadKey((key) => key + 1);
+      }
+    });
+  }, [id, isEditing, document.version]);
 
   // Renderizar diagramas Mermaid cuando cambia el contenido
   useEffect(() => {
@@ -454,6 +499,8 @@ const DocumentEditor = () => {
           title: editedTitle,
           content: htmlContent,
           status: editedStatus,
+          // Versión sobre la que se editó: si otro usuario guardó antes, el servidor responde 412
+          base_version: document.version,
         };
 
         // Solo incluir project si existe y es un número (ID)
@@ -471,6 +518,7 @@ const DocumentEditor = () => {
 
         setDocument({
           ...updatedDoc,
+          version: updated.version,
           lastModified: new Date(updated.updated_at).toLocaleString('es-ES'),
         });
         setEditedContent(htmlContent);
@@ -481,6 +529,14 @@ const DocumentEditor = () => {
 
       setIsEditing(false);
     } catch (error) {
+      if (error.response?.status === 412) {
+        // Conflicto de edición: no sobrescribir ni guardar localmente una copia divergente
+        alert(
+          `Otro usuario guardó una versión más reciente (${error.response.data?.current_version || 'desconocida'}). ` +
+          'Copia tus cambios y recarga el documento antes de guardar.'
+        );
+        return;
+      }
       console.error('Error al guardar documento en la API:', error);
       console.error('Error response:', error.response?.data);
       console.error('Error status:', error.response?.status);
@@ -519,9 +575,9 @@ const DocumentEditor = () => {
 
     try {
       const newFavoriteStatus = !isFavorite;
-      await documentService.patch(id, { is_favorite: newFavoriteStatus });
+      const updated = await documentService.patch(id, { is_favorite: newFavoriteStatus });
       setIsFavorite(newFavoriteStatus);
-      setDocument(prev => ({ ...prev, is_favorite: newFavoriteStatus }));
+      setDocument(prev => ({ ...prev, is_favorite: newFavoriteStatus, version: updated.version }));
     } catch (error) {
       console.error('Error actualizando favorito:', error);
     }
@@ -532,8 +588,8 @@ const DocumentEditor = () => {
 
     try {
       setEditedStatus(newStatus);
-      await documentService.patch(id, { status: newStatus });
-      setDocument(prev => ({ ...prev, status: newStatus }));
+      const updated = await documentService.patch(id, { status: newStatus });
+      setDocument(prev => ({ ...prev, status: newStatus, version: updated.version }));
     } catch (error) {
       console.error('Error actualizando estado:', error);
       // Revertir en caso de error
@@ -898,6 +954,7 @@ const DocumentEditor = () => {
         ...document,
         title: revertedDoc.title,
         content: revertedDoc.content,
+        version: revertedDoc.version,
       });
       setEditedTitle(revertedDoc.title);
       setEditedContent(revertedDoc.content);
@@ -1182,6 +1239,12 @@ const DocumentEditor = () => {
         </Typography>
       </Breadcrumbs>
 
+      {remoteVersion && (
+        <Alert severity="warning" sx={{ mb: 2 }} onClose={() => setRemoteVersion(null)}>
+          Otro usuario guardó la versión {remoteVersion} mientras editabas. Recarga antes de guardar para no perder sus cambios.
+        </Alert>
+      )}
+
       {/* Title and Status */}
       <Box sx={{ display: 'flex', alignItems: 'center', gap: 2, mb: 3 }}>
         {isEditing ? (
@@ -31,25 +31,14 @@ const Search = () => {
       setLoading(true);
       setError(null);
       try {
-        // Obtener todos los documentos
-        const allDocs = await documentService.getAll();
+        // Sin query se listan los documentos; con query se usa la búsqueda de texto completo del servidor
+        const response = searchQuery.trim()
+          ? await documentService.search(searchQuery.trim())
+          : await documentService.getAll();
 
         // La API puede retornar un objeto con 'results' o directamente un array
-        const documents = Array.isArray(allDocs) ? allDocs : (allDocs?.results || []);
-
-        // Si no hay query, mostrar todos los documentos
-        if (!searchQuery.trim()) {
-          setResults(documents);
-        } else {
-          // Filtrar por título o contenido que contenga el query
-          const filtered = documents.filter(doc => {
-            const searchLower = searchQuery.toLowerCase();
-            const titleMatch = doc.title?.toLowerCase().includes(searchLower);
-            const contentMatch = doc.content?.toLowerCase().includes(searchLower);
-            return titleMatch || contentMatch;
-          });
-          setResults(filtered);
-        }
+        const documents = Array.isArray(response) ? response : (response?.results || []);
+        setResults(documents);
       } catch (error) {
         console.error('Error buscando documentos:', error);
         setError(error.message || 'Error al cargar documentos');
@@ -233,7 +222,7 @@ const Search = () => {
                         secondary={
                           <Box>
                             <Typography variant="body2" component="div" color="textSecondary" sx={{ mb: 0.5 }}>
-                              {getExcerpt(result.content)}
+                              {getExcerpt(result.headline || result.excerpt)}
                             </Typography>
                             <Typography variant="caption" component="div" color="textSecondary">
                               Modificado: {new Date(result.updated_at).toLocaleDateString('es-ES', {
@@ -1,4 +1,5 @@
 import api from './api';
+import standardsService from './standardsService';
 
 /**
  * Servicio para interactuar con el Asistente de IA
@@ -23,6 +24,25 @@ export const sendChatMessage = async (message, conversationHistory = []) => {
   }
 };
 
+/**
+ * Enviar mensaje al chat de IA recibiendo la respuesta a medida que se genera
+ * @param {string} message - Mensaje del usuario
+ * @param {Array} conversationHistory - Historial de conversación
+ * @param {Function} onToken - Recibe cada fragmento de texto
+ * @returns {Promise} Respuesta completa del chat (igual que sendChatMessage)
+ */
+export const sendChatMessageStream = async (message, conversationHistory = [], onToken) => {
+  try {
+    return await standardsService.streamChat({
+      message,
+      conversation_history: conversationHistory,
+    }, onToken);
+  } catch (error) {
+    console.error('Error sending chat message:', error);
+    throw error;
+  }
+};
+
 /**
  * Generar diagrama Mermaid desde texto
  * @param {string} text - Descripción del diagrama
@@ -43,18 +63,17 @@ export const generateDiagram = async (text, diagramType = 'flowchart') => {
 };
 
 /**
- * Generar documentación técnica con IA
+ * Generar documentación técnica con IA (trabajo en cola: espera a que termine)
  * @param {number} standardId - ID del estándar de documentación
  * @param {string} userPrompt - Descripción de lo que se necesita documentar
- * @returns {Promise} Documentación generada
+ * @returns {Promise} { success, data } con la documentación generada
  */
 export const generateDocumentation = async (standardId, userPrompt) => {
   try {
-    const response = await api.post('/standards/generate/', {
+    return await standardsService.generateDocumentation({
       standard_id: standardId,
       user_prompt: userPrompt,
     });
-    return response.data;
   } catch (error) {
     console.error('Error generating documentation:', error);
     throw error;
@@ -106,6 +125,7 @@ export const getWorkspaces = async () => {
 
 export default {
   sendChatMessage,
+  sendChatMessageStream,
   generateDiagram,
   generateDocumentation,
   getDocumentationStandards,
@@ -31,12 +31,38 @@ const documentService = {
     return response.data;
   },
 
+  // Full-text search ranked by relevance
+  search: async (query, filters = {}) => {
+    const response = await api.get('/documents/documents/search/', { params: { ...filters, q: query } });
+    return response.data;
+  },
+
+  // Bulk import from NDJSON or a ZIP of Markdown files (resumable with startBatch)
+  importDocuments: async (file, { workspace, project, batchSize, startBatch } = {}) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    if (workspace) formData.append('workspace', workspace);
+    if (project) formData.append('project', project);
+    if (batchSize) formData.append('batch_size', batchSize);
+    if (startBatch) formData.append('start_batch', startBatch);
+    const response = await api.post('/documents/documents/import/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' }
+    });
+    return response.data;
+  },
+
   // Version management
   getVersions: async (id) => {
     const response = await api.get(`/documents/documents/${id}/versions/`);
     return response.data;
   },
 
+  // Diff between two versions (defaults: latest vs. previous); granularity 'line' or 'word'
+  getDiff: async (id, { from, to, granularity = 'line' } = {}) => {
+    const response = await api.get(`/documents/documents/${id}/diff/`, { params: { from, to, granularity } });
+    return response.data;
+  },
+
   revertToVersion: async (id, versionId, changesDescription = '') => {
     const response = await api.post(`/documents/documents/${id}/revert_to_version/`, {
       version_id: versionId,
@@ -45,6 +71,27 @@ const documentService = {
     return response.data;
   },
 
+  // Edit lock (lease): acquire when editing starts, heartbeat while editing, release when done
+  acquireLock: async (id) => {
+    const response = await api.post(`/documents/documents/${id}/lock/`);
+    return response.data;
+  },
+
+  heartbeatLock: async (id) => {
+    const response = await api.post(`/documents/documents/${id}/heartbeat/`);
+    return response.data;
+  },
+
+  releaseLock: async (id) => {
+    await api.delete(`/documents/documents/${id}/lock/`);
+  },
+
+  // Change feed: pass the `next` cursor of the previous call ('now' to start from the current head)
+  getChanges: async (since, limit) => {
+    const response = await api.get('/documents/changes/', { params: { since, limit } });
+    return response.data;
+  },
+
   // Trash management
   getTrash: async () => {
     const response = await api.get('/documents/documents/trash/');
@@ -84,6 +131,43 @@ const documentService = {
     });
     return response.data;
   },
+
+  // Subida por partes reanudable; si el servidor ya tiene el contenido termina sin enviar bytes
+  uploadAttachmentResumable: async (documentId, file, { description = '', uploadId, onProgress } = {}) => {
+    const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+    const sha256 = Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+
+    let upload;
+    if (uploadId) {
+      upload = (await api.get(`/documents/attachment-uploads/${uploadId}/`)).data;
+    } else {
+      upload = (await api.post('/documents/attachment-uploads/', {
+        document: documentId,
+        file_name: file.name,
+        file_size: file.size,
+        file_type: file.type.slice(0, 50),
+        description,
+        sha256,
+      })).data;
+    }
+
+    while (upload.status === 'PENDING' && upload.received_bytes < file.size) {
+      const start = upload.received_bytes;
+      const end = Math.min(start + upload.chunk_size, file.size);
+      upload = (await api.put(`/documents/attachment-uploads/${upload.id}/chunk/`, file.slice(start, end), {
+        headers: {
+          'Content-Type': 'application/octet-stream',
+          'Content-Range': `bytes ${start}-${end - 1}/${file.size}`,
+        },
+      })).data;
+      if (onProgress) onProgress(upload.received_bytes / file.size, upload.id);
+    }
+
+    if (upload.status === 'PENDING') {
+      upload = (await api.post(`/documents/attachment-uploads/${upload.id}/complete/`)).data;
+    }
+    return upload.attachment;
+  },
 };
 
 export default documentService;
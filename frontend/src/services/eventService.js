@@ -0,0 +1,83 @@
+/**
+ * Event Service
+ * Real-time server events (SSE) from /events/ instead of polling the API.
+ * Uses fetch streaming so the JWT travels in the Authorization header (EventSource cannot send headers).
+ */
+
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
+const RECONNECT_DELAY_MS = 3000;
+
+const listeners = new Set();
+let controller = null;
+
+const dispatch = (block) => {
+  let type = 'message';
+  const data = [];
+  block.split('\n').forEach((line) => {
+    if (line.startsWith('event:')) type = line.slice(6).trim();
+    else if (line.startsWith('data:')) data.push(line.slice(5).trim());
+  });
+  if (!data.length) return;
+  try {
+    const payload = JSON.parse(data.join('\n'));
+    listeners.forEach((listener) => listener(type, payload.data ?? payload));
+  } catch (error) {
+    console.error('Evento del servidor no válido:', error);
+  }
+};
+
+const connect = async () => {
+  controller = new AbortController();
+  const { signal } = controller;
+
+  while (!signal.aborted) {
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch(`${API_URL}/events/`, {
+        headers: { Accept: 'text/event-stream', Authorization: `Bearer ${token}` },
+        signal,
+      });
+      if (response.status === 401) {
+        if (controller?.signal === signal) controller = null;
+        return;
+      }
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        const blocks = buffer.split('\n\n');
+        buffer = blocks.pop();
+        blocks.forEach(dispatch);
+      }
+    } catch (error) {
+      if (signal.aborted) return;
+    }
+    // The server closes the stream periodically: reconnect
+    await new Promise((resolve) => setTimeout(resolve, RECONNECT_DELAY_MS));
+  }
+};
+
+const eventService = {
+  /**
+   * Listen to server events; the first listener opens the connection and the last one closes it.
+   * @param {Function} listener - called with (type, data), e.g. ('document.changed', {...})
+   * @returns {Function} unsubscribe
+   */
+  subscribe: (listener) => {
+    listeners.add(listener);
+    if (!controller) connect();
+    return () => {
+      listeners.delete(listener);
+      if (!listeners.size && controller) {
+        controller.abort();
+        controller = null;
+      }
+    };
+  },
+};
+
+export default eventService;
@@ -26,6 +26,15 @@ const projectService = {
     return response.data;
   },
 
+  // Streamed export of all project documents: 'zip' (Markdown) or 'ndjson' (with versions)
+  exportDocuments: async (id, exportFormat = 'zip') => {
+    const response = await api.get(`/projects/projects/${id}/export/`, {
+      params: { export_format: exportFormat },
+      responseType: 'blob'
+    });
+    return response.data;
+  },
+
   getClients: async () => {
     const response = await api.get('/projects/clients/');
     return response.data;
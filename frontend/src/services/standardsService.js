@@ -1,4 +1,5 @@
 import api from './api';
+import eventService from './eventService';
 
 /**
  * Standards Service - AI-powered documentation generation
@@ -8,6 +9,128 @@ import api from './api';
  * - DocumentationExamples: Input → Output examples for AI learning
  * - AIGenerationTests: Testing system with user ratings
  */
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
+// The ai.job server event signals the end of a job; polling only covers a lost event stream
+const JOB_FALLBACK_POLL_INTERVAL_MS = 10000;
+const JOB_MAX_WAIT_MS = 5 * 60 * 1000;
+const FINISHED_JOB_STATUSES = ['SUCCESS', 'FAILED'];
+
+/**
+ * Wait for a queued AI generation job to finish (SUCCESS or FAILED)
+ * Listens to the ai.job server event and polls slowly as a fallback.
+ * @param {number} jobId - Job ID returned with 202 by the generation endpoints
+ * @param {Object} options - { signal?: AbortSignal, maxWaitMs?: number }
+ * @returns {Object} The finished job; rejects on timeout (error.jobId) or abort
+ */
+const waitForJob = (jobId, { signal, maxWaitMs = JOB_MAX_WAIT_MS } = {}) => new Promise((resolve, reject) => {
+  let done = false;
+  let pollTimer = null;
+  let deadlineTimer = null;
+  let unsubscribe = () => {};
+
+  const finish = (settle, value) => {
+    if (done) return;
+    done = true;
+    clearTimeout(pollTimer);
+    clearTimeout(deadlineTimer);
+    unsubscribe();
+    signal?.removeEventListener('abort', onAbort);
+    settle(value);
+  };
+
+  const check = async () => {
+    try {
+      const job = (await api.get(`/standards/jobs/${jobId}/`)).data;
+      if (FINISHED_JOB_STATUSES.includes(job.status)) finish(resolve, job);
+    } catch (error) {
+      finish(reject, error);
+    }
+  };
+
+  const poll = async () => {
+    await check();
+    if (!done) pollTimer = setTimeout(poll, JOB_FALLBACK_POLL_INTERVAL_MS);
+  };
+
+  const onAbort = () => finish(reject, new DOMException('Espera del trabajo cancelada', 'AbortError'));
+
+  deadlineTimer = setTimeout(() => {
+    const error = new Error('La generación está tardando demasiado; consulta el trabajo más tarde');
+    error.jobId = jobId;
+    finish(reject, error);
+  }, maxWaitMs);
+
+  if (signal?.aborted) {
+    onAbort();
+    return;
+  }
+  signal?.addEventListener('abort', onAbort);
+  unsubscribe = eventService.subscribe((type, data) => {
+    if (
+      type === 'ai.job' && data.job_type !== 'AI_TEST' && data.job_id === jobId
+      && FINISHED_JOB_STATUSES.includes(data.status)
+    ) {
+      check();
+    }
+  });
+  // The job may already be finished (eager mode, or before the subscription opened)
+  poll();
+});
+
+/**
+ * POST with "stream": true and read the Server-Sent Events response as it arrives.
+ * Uses fetch streaming so the JWT travels in the Authorization header (EventSource cannot POST).
+ * @param {string} path - Endpoint path, e.g. '/standards/chat/'
+ * @param {Object} data - Request body
+ * @param {Function} onToken - Called with each text fragment
+ * @returns {Object} Payload of the final `result` event
+ */
+const streamGeneration = async (path, data, onToken) => {
+  const token = localStorage.getItem('token');
+  const response = await fetch(`${API_URL}${path}`, {
+    method: 'POST',
+    headers: {
+      Accept: 'text/event-stream',
+      'Content-Type': 'application/json',
+      Authorization: `Bearer ${token}`,
+    },
+    body: JSON.stringify({ ...data, stream: true }),
+  });
+  if (!response.ok) {
+    const error = new Error(`HTTP ${response.status}`);
+    error.response = { status: response.status, data: await response.json().catch(() => null) };
+    throw error;
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    const blocks = buffer.split('\n\n');
+    buffer = blocks.pop();
+    for (const block of blocks) {
+      let type = 'message';
+      let payload = '';
+      block.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) type = line.slice(6).trim();
+        else if (line.startsWith('data:')) payload += line.slice(5).trim();
+      });
+      if (!payload) continue;
+      const eventData = JSON.parse(payload);
+      if (type === 'token') {
+        if (onToken) onToken(eventData.text);
+      } else if (type === 'result') {
+        return eventData;
+      } else if (type === 'error') {
+        throw new Error(eventData.error);
+      }
+    }
+  }
+  throw new Error('La conexión se cerró antes de terminar la generación');
+};
+
 const standardsService = {
   // ==================== Documentation Standards ====================
 
@@ -108,23 +231,45 @@ const standardsService = {
   // ==================== AI Generation ====================
 
   /**
-   * Generate documentation using AI based on examples
-   * @param {Object} data - { standard_id, user_prompt, task_id? }
-   * @returns {Object} { content, diagram_code, model_used, generation_time }
+   * Get the state of a queued generation job
+   * @param {number} jobId - Job ID returned by generate / generate-project (202)
+   * @returns {Object} { job_id, job_type, status, result, error_message, ... }
    */
-  generateDocumentation: async (data) => {
-    const res = await api.post('/standards/generate/', data);
+  getJob: async (jobId) => {
+    const res = await api.get(`/standards/jobs/${jobId}/`);
     return res.data;
   },
 
   /**
-   * Alias for generateDocumentation (shorter name)
+   * Generate documentation using AI based on examples (queued job, waits until it finishes)
+   * @param {Object} data - { standard_id, user_prompt, task_id?, use_cache? }
+   * @param {Object} options - { signal?, maxWaitMs? } passed to the job wait
+   * @returns {Object} { success, data: { content, diagram_code, model_used, generation_time } }
    */
-  generate: async (data) => {
+  generateDocumentation: async (data, options = {}) => {
     const res = await api.post('/standards/generate/', data);
-    return res.data;
+    const job = await waitForJob(res.data.job_id, options);
+    return job.status === 'SUCCESS'
+      ? { success: true, data: job.result }
+      : { success: false, error: job.error_message };
   },
 
+  /**
+   * Generate documentation in the request, forwarding the text as the model writes it
+   * @param {Object} data - { standard_id, user_prompt, task_id?, use_cache? }
+   * @param {Function} onToken - Called with each text fragment
+   * @returns {Object} { success, data: { content, diagram_code, model_used, generation_time } }
+   */
+  streamDocumentation: async (data, onToken) => {
+    const job = await streamGeneration('/standards/generate/', data, onToken);
+    return { success: true, data: job.result };
+  },
+
+  /**
+   * Alias for generateDocumentation (shorter name)
+   */
+  generate: async (data, options = {}) => standardsService.generateDocumentation(data, options),
+
   /**
    * Get all standards (alias for getStandards)
    */
@@ -154,9 +299,9 @@ const standardsService = {
   },
 
   /**
-   * Create and run a new AI generation test
+   * Create a new AI generation test; generation is queued (poll getAITest until COMPLETED or FAILED)
    * @param {Object} data - { standard, user_prompt }
-   * @returns {Object} Test result with generated content
+   * @returns {Object} The test, usually still PENDING
    */
   createAITest: async (data) => {
     const res = await api.post('/standards/ai-tests/', data);
@@ -185,13 +330,15 @@ const standardsService = {
   // ==================== Project Documentation Generation ====================
 
   /**
-   * Generate complete documentation for a project with all its tasks
+   * Generate complete documentation for a project with all its tasks (queued job, waits until it finishes)
    * @param {number} projectId - Project ID
+   * @param {Object} options - { signal?, maxWaitMs? } passed to the job wait
    * @returns {Object} { success, project_id, project_name, documentation, generation_time, tasks_count }
    */
-  generateProjectDocumentation: async (projectId) => {
+  generateProjectDocumentation: async (projectId, options = {}) => {
     const res = await api.post('/standards/generate-project/', { project_id: projectId });
-    return res.data;
+    const job = await waitForJob(res.data.job_id, options);
+    return job.status === 'SUCCESS' ? job.result : { success: false, error: job.error_message };
   },
 
   // ==================== Diagram Generation ====================
@@ -207,6 +354,24 @@ const standardsService = {
     const res = await api.post('/standards/generate-diagram/', data);
     return res.data;
   },
+
+  /**
+   * Generate a Mermaid diagram, forwarding the raw code as the model writes it
+   * @param {Object} data - { text, diagram_type }
+   * @param {Function} onToken - Called with each text fragment
+   * @returns {Object} { success, diagram_code, diagram_type }
+   */
+  streamDiagram: async (data, onToken) => streamGeneration('/standards/generate-diagram/', data, onToken),
+
+  // ==================== AI Chat ====================
+
+  /**
+   * Send a chat message, forwarding the answer as the model writes it
+   * @param {Object} data - { message, conversation_history }
+   * @param {Function} onToken - Called with each text fragment
+   * @returns {Object} { success, response, suggestions, cached }
+   */
+  streamChat: async (data, onToken) => streamGeneration('/standards/chat/', data, onToken),
 };
 
 export default standardsService;
@@ -60,6 +60,20 @@ const workspaceService = {
     const response = await api.delete(`/documents/workspaces/${id}/`);
     return response.data;
   },
+
+  /**
+   * Export all documents of a workspace (streamed by the server)
+   * @param {number} id - Workspace ID
+   * @param {string} exportFormat - 'zip' (Markdown files) or 'ndjson' (with versions)
+   * @returns {Promise<Blob>} Export file
+   */
+  export: async (id, exportFormat = 'zip') => {
+    const response = await api.get(`/documents/workspaces/${id}/export/`, {
+      params: { export_format: exportFormat },
+      responseType: 'blob'
+    });
+    return response.data;
+  },
 };
 
 export default workspaceService;